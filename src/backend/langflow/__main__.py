@@ -136,7 +136,7 @@ def run(
     log_file: Path = typer.Option("logs/langflow.log", help="Path to the log file.", envvar="LANGFLOW_LOG_FILE"),
     cache: Optional[str] = typer.Option(
         envvar="LANGFLOW_LANGCHAIN_CACHE",
-        help="Type of cache to use. (InMemoryCache, SQLiteCache)",
+        help="Type of LLM cache to use. (InMemoryCache, SQLiteCache, RedisCache, RedisSemanticCache)",
         default=None,
     ),
     dev: bool = typer.Option(False, help="Run in development mode (may contain bugs)"),
@@ -8,6 +8,7 @@ from langflow.api.v1 import (
     endpoints_router,
     flows_router,
     login_router,
+    monitor_router,
     store_router,
     users_router,
     validate_router,
@@ -25,3 +26,4 @@ router.include_router(users_router)
 router.include_router(api_key_router)
 router.include_router(login_router)
 router.include_router(credentials_router)
+router.include_router(monitor_router)
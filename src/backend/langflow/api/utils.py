@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING, List
 from fastapi import HTTPException
 from platformdirs import user_cache_dir
 
+from langflow.services.session.utils import compute_dict_hash
 from langflow.services.store.schema import StoreComponentCreate
 from langflow.services.store.utils import get_lf_version_from_pypi
 
@@ -142,14 +143,31 @@ def validate_is_component(flows: List["Flow"]):
         if not flow.data or flow.is_component is not None:
             continue
 
-        is_component = get_is_component_from_data(flow.data)
-        if is_component is not None:
-            flow.is_component = is_component
-        else:
-            flow.is_component = len(flow.data.get("nodes", [])) == 1
+        flow.is_component = compute_is_component(flow.data)
     return flows
 
 
+def compute_is_component(data: dict) -> bool:
+    """A flow is a component if its data says so or, failing that, if it has a single node."""
+    is_component = get_is_component_from_data(data)
+    if is_component is not None:
+        return is_component
+    return len(data.get("nodes", [])) == 1
+
+
+def set_flow_metadata(flow: "Flow"):
+    """Computes the metadata of the flow stored along its data, when the flow is written."""
+    if not flow.data:
+        flow.node_count = 0
+        flow.data_hash = None
+        return flow
+    flow.node_count = len(flow.data.get("nodes", []))
+    flow.data_hash = compute_dict_hash(flow.data)
+    if flow.is_component is None:
+        flow.is_component = compute_is_component(flow.data)
+    return flow
+
+
 def get_is_component_from_data(data: dict):
     """Returns True if the data is a component."""
     return data.get("is_component")
@@ -4,6 +4,7 @@ from langflow.api.v1.credential import router as credentials_router
 from langflow.api.v1.endpoints import router as endpoints_router
 from langflow.api.v1.flows import router as flows_router
 from langflow.api.v1.login import router as login_router
+from langflow.api.v1.monitor import router as monitor_router
 from langflow.api.v1.store import router as store_router
 from langflow.api.v1.users import router as users_router
 from langflow.api.v1.validate import router as validate_router
@@ -18,4 +19,5 @@ __all__ = [
     "api_key_router",
     "login_router",
     "credentials_router",
+    "monitor_router",
 ]
@@ -19,6 +19,7 @@ from langflow.services.database.models.api_key.model import (
 )
 from langflow.services.database.models.user.model import User
 from langflow.services.deps import (
+    get_auth_service,
     get_session,
     get_settings_service,
 )
@@ -64,6 +65,7 @@ def delete_api_key_route(
 ):
     try:
         delete_api_key(db, api_key_id)
+        get_auth_service().principal_cache.invalidate_api_key(api_key_id)
         return {"detail": "API Key deleted"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
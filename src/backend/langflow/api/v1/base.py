@@ -1,5 +1,8 @@
-from typing import Optional
+import hashlib
+import re
+from typing import List, Optional, Tuple
 
+from cachetools import LRUCache
 from langchain.prompts import PromptTemplate
 from pydantic import BaseModel, field_validator, model_serializer
 
@@ -54,6 +57,19 @@ class PromptValidationResponse(BaseModel):
     frontend_node: Optional[FrontendNodeRequest] = None
 
 
+class ValidatePromptsRequest(BaseModel):
+    prompts: List[ValidatePromptRequest]
+
+
+class PromptValidationResult(PromptValidationResponse):
+    # Why the prompt is invalid, in which case input_variables is empty
+    error: Optional[str] = None
+
+
+class PromptsValidationResponse(BaseModel):
+    results: List[PromptValidationResult]
+
+
 INVALID_CHARACTERS = {
     " ",
     ",",
@@ -72,6 +88,8 @@ INVALID_CHARACTERS = {
     "}",
 }
 
+INVALID_CHARACTERS_PATTERN = re.compile(f"[{re.escape(''.join(sorted(INVALID_CHARACTERS)))}]")
+
 INVALID_NAMES = {
     "input_variables",
     "output_parser",
@@ -82,7 +100,29 @@ INVALID_NAMES = {
 }
 
 
+# Number of prompt templates whose validation result is kept
+PROMPT_VALIDATION_CACHE_SIZE = 1024
+
+# Validation results by template hash: the input variables, or the error message
+_prompt_validations: LRUCache = LRUCache(maxsize=PROMPT_VALIDATION_CACHE_SIZE)
+
+
 def validate_prompt(template: str):
+    """Returns the input variables of template, or raises a ValueError if it is invalid."""
+    key = hashlib.sha256(template.encode()).hexdigest()
+    if (validation := _prompt_validations.get(key)) is None:
+        try:
+            validation = (tuple(_validate_prompt(template)), None)
+        except ValueError as exc:
+            validation = ((), str(exc))
+        _prompt_validations[key] = validation
+    input_variables, error = validation
+    if error is not None:
+        raise ValueError(error)
+    return list(input_variables)
+
+
+def _validate_prompt(template: str) -> List[str]:
     input_variables = extract_input_variables_from_prompt(template)
 
     # Check if there are invalid characters in the input_variables
@@ -117,12 +157,10 @@ def check_input_variables(input_variables: list):
             invalid_chars.append(variable[0])
             new_var = new_var.replace(variable[0], "")
             wrong_variables.append(variable)
-        else:
-            for char in INVALID_CHARACTERS:
-                if char in variable:
-                    invalid_chars.append(char)
-                    new_var = new_var.replace(char, "")
-                    wrong_variables.append(variable)
+        elif chars := find_invalid_characters(variable):
+            invalid_chars.extend(chars)
+            new_var = INVALID_CHARACTERS_PATTERN.sub("", variable)
+            wrong_variables.extend([variable] * len(chars))
         fixed_variables.append(new_var)
     # If any of the input_variables is not in the fixed_variables, then it means that
     # there are invalid characters in the input_variables
@@ -139,6 +177,13 @@ def check_input_variables(input_variables: list):
     return input_variables
 
 
+def find_invalid_characters(variable: str) -> Tuple[str, ...]:
+    """Returns the invalid characters of variable, each once, in the order they appear."""
+    if INVALID_CHARACTERS_PATTERN.search(variable) is None:
+        return ()
+    return tuple(dict.fromkeys(INVALID_CHARACTERS_PATTERN.findall(variable)))
+
+
 def build_error_message(input_variables, invalid_chars, wrong_variables, fixed_variables, empty_variables):
     input_variables_str = ", ".join([f"'{var}'" for var in input_variables])
     error_string = f"Invalid input variables: {input_variables_str}. "
@@ -22,7 +22,7 @@ class AsyncStreamingLLMCallbackHandler(AsyncCallbackHandler):
 
     async def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
         resp = ChatResponse(message=token, type="stream", intermediate_steps="")
-        await self.websocket.send_json(resp.model_dump())
+        await self.chat_service.send_json(self.client_id, resp)
 
     async def on_tool_start(self, serialized: Dict[str, Any], input_str: str, **kwargs: Any) -> Any:
         """Run when tool starts running."""
@@ -31,7 +31,7 @@ class AsyncStreamingLLMCallbackHandler(AsyncCallbackHandler):
             type="stream",
             intermediate_steps=f"Tool input: {input_str}",
         )
-        await self.websocket.send_json(resp.model_dump())
+        await self.chat_service.send_json(self.client_id, resp)
 
     async def on_tool_end(self, output: str, **kwargs: Any) -> Any:
         """Run when tool ends running."""
@@ -62,7 +62,7 @@ class AsyncStreamingLLMCallbackHandler(AsyncCallbackHandler):
         try:
             # This is to emulate the stream of tokens
             for resp in resps:
-                await self.websocket.send_json(resp.model_dump())
+                await self.chat_service.send_json(self.client_id, resp)
         except Exception as exc:
             logger.error(f"Error sending response: {exc}")
 
@@ -88,7 +88,7 @@ class AsyncStreamingLLMCallbackHandler(AsyncCallbackHandler):
             resp = PromptResponse(
                 prompt=text,
             )
-            await self.websocket.send_json(resp.model_dump())
+            await self.chat_service.send_json(self.client_id, resp)
             self.chat_service.chat_history.add_message(self.client_id, resp)
 
     async def on_agent_action(self, action: AgentAction, **kwargs: Any):
@@ -99,10 +99,10 @@ class AsyncStreamingLLMCallbackHandler(AsyncCallbackHandler):
             logs = log.split("\n")
             for log in logs:
                 resp = ChatResponse(message="", type="stream", intermediate_steps=log)
-                await self.websocket.send_json(resp.model_dump())
+                await self.chat_service.send_json(self.client_id, resp)
         else:
             resp = ChatResponse(message="", type="stream", intermediate_steps=log)
-            await self.websocket.send_json(resp.model_dump())
+            await self.chat_service.send_json(self.client_id, resp)
 
     async def on_agent_finish(self, finish: AgentFinish, **kwargs: Any) -> Any:
         """Run on agent end."""
@@ -111,7 +111,7 @@ class AsyncStreamingLLMCallbackHandler(AsyncCallbackHandler):
             type="stream",
             intermediate_steps=finish.log,
         )
-        await self.websocket.send_json(resp.model_dump())
+        await self.chat_service.send_json(self.client_id, resp)
 
 
 class StreamingLLMCallbackHandler(BaseCallbackHandler):
@@ -128,3 +128,13 @@ class StreamingLLMCallbackHandler(BaseCallbackHandler):
         loop = asyncio.get_event_loop()
         coroutine = self.websocket.send_json(resp.model_dump())
         asyncio.run_coroutine_threadsafe(coroutine, loop)
+
+
+class AsyncQueueCallbackHandler(AsyncCallbackHandler):
+    """Callback handler that puts the LLM tokens in a queue so they can be streamed in a response."""
+
+    def __init__(self, queue: Optional[asyncio.Queue] = None):
+        self.queue: asyncio.Queue = queue or asyncio.Queue()
+
+    async def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        await self.queue.put(token)
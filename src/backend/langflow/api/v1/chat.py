@@ -1,17 +1,34 @@
 import time
+import uuid
+from typing import Optional
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketException, status
 from fastapi.responses import StreamingResponse
 from langflow.api.utils import build_input_keys_response, format_elapsed_time
-from langflow.api.v1.schemas import BuildStatus, BuiltResponse, InitResponse, StreamData
+from langflow.api.v1.schemas import BuildStatus, BuiltResponse, ChatHistoryResponse, InitResponse, StreamData
 from langflow.graph.graph.base import Graph
+from langflow.services.admission.service import AdmissionService
+from langflow.services.admission.utils import admitted_streaming_response
 from langflow.services.auth.utils import get_current_active_user, get_current_user_by_jwt
 from langflow.services.cache.service import BaseCacheService
 from langflow.services.cache.utils import update_build_status
 from langflow.services.chat.service import ChatService
-from langflow.services.deps import get_cache_service, get_chat_service, get_session
+from langflow.services.database.models.flow import Flow
+from langflow.services.deps import (
+    get_admission_service,
+    get_cache_service,
+    get_chat_service,
+    get_session,
+    get_settings_service,
+    get_task_service,
+)
+from langflow.services.task.distributed import DistributedGraphBuilder
+from langflow.services.task.scheduler import INTERACTIVE
+from langflow.services.task.service import TaskService
+from langflow.services.task.utils import scheduler_slot
 from loguru import logger
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 router = APIRouter(tags=["Chat"])
 
@@ -33,8 +50,8 @@ async def chat(
         if not user.is_active:
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Unauthorized")
 
-        if client_id in chat_service.cache_service:
-            await chat_service.handle_websocket(client_id, websocket)
+        if await chat_service.has_build_result(client_id):
+            await chat_service.handle_websocket(client_id, websocket, owner=str(user.id))
         else:
             # We accept the connection but close it immediately
             # if the flow is not built yet
@@ -52,6 +69,36 @@ async def chat(
             await websocket.close(code=status.WS_1011_INTERNAL_ERROR, reason=messsage)
 
 
+@router.get("/chat/{client_id}/history", response_model=ChatHistoryResponse)
+def get_chat_history(
+    client_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    current_user=Depends(get_current_active_user),
+    session: Session = Depends(get_session),
+    chat_service: "ChatService" = Depends(get_chat_service),
+):
+    """Get a page of the chat history, skipping the `offset` most recent messages."""
+    # The client id is the id of the flow, which must belong to the user
+    try:
+        flow_id = UUID(client_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail="Flow not found") from exc
+    if not session.exec(select(Flow.id).where(Flow.id == flow_id, Flow.user_id == current_user.id)).first():
+        raise HTTPException(status_code=404, detail="Flow not found")
+    try:
+        messages = chat_service.chat_history.get_history(client_id, offset=offset, limit=limit)
+        return ChatHistoryResponse(
+            total=chat_service.chat_history.count_messages(client_id),
+            offset=offset,
+            limit=limit,
+            messages=[message.model_dump() for message in messages],
+        )
+    except Exception as exc:
+        logger.error(f"Error getting chat history: {exc}")
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
 @router.post("/build/init/{flow_id}", response_model=InitResponse, status_code=201)
 async def init_build(
     graph_data: dict,
@@ -76,6 +123,7 @@ async def init_build(
         if flow_id in chat_service.cache_service:
             chat_service.cache_service.delete(flow_id)
             logger.debug(f"Deleted flow {flow_id} from cache")
+        await chat_service.broker.delete_build_async(flow_id)
         cache_service[flow_id] = {
             "graph_data": graph_data,
             "status": BuildStatus.STARTED,
@@ -108,6 +156,8 @@ async def stream_build(
     flow_id: str,
     chat_service: "ChatService" = Depends(get_chat_service),
     cache_service: "BaseCacheService" = Depends(get_cache_service),
+    admission_service: "AdmissionService" = Depends(get_admission_service),
+    task_service: "TaskService" = Depends(get_task_service),
 ):
     """Stream the build process based on stored flow data."""
 
@@ -147,6 +197,8 @@ async def stream_build(
             except KeyError:
                 logger.debug("No user_id found in cache_service")
                 user_id = None
+            distributed_builder = get_distributed_builder(graph_data, user_id)
+            remote_input_keys = None
             for i, vertex in enumerate(graph.generator_build(), 1):
                 start_time = time.perf_counter()
                 try:
@@ -154,12 +206,22 @@ async def stream_build(
                         "log": f"Building node {vertex.vertex_type}",
                     }
                     yield str(StreamData(event="log", data=log_dict))
-                    if vertex.is_task:
-                        vertex = await try_running_celery_task(vertex, user_id)
+                    if distributed_builder is not None:
+                        handle = await distributed_builder.build_vertex(
+                            vertex.id, timeout=get_settings_service().settings.DISTRIBUTED_BUILD_TIMEOUT
+                        )
+                        if not handle["valid"]:
+                            raise ValueError(handle["params"])
+                        vertex.artifacts = handle["artifacts"]
+                        remote_input_keys = handle["input_keys"] or remote_input_keys
+                        params = handle["params"]
                     else:
-                        await vertex.build(user_id=user_id)
+                        if vertex.is_task:
+                            vertex = await try_running_celery_task(vertex, user_id)
+                        else:
+                            await vertex.build(user_id=user_id)
+                        params = vertex._built_object_repr()
                     time_elapsed = format_elapsed_time(time.perf_counter() - start_time)
-                    params = vertex._built_object_repr()
                     valid = True
 
                     logger.debug(f"Building node {str(vertex.vertex_type)}")
@@ -188,18 +250,28 @@ async def stream_build(
 
                     yield str(StreamData(event="message", data=response))
 
-            langchain_object = await graph.build()
-            # Now we  need to check the input_keys to send them to the client
-            if hasattr(langchain_object, "input_keys"):
-                input_keys_response = build_input_keys_response(langchain_object, artifacts)
+            input_keys_response = {
+                "input_keys": None,
+                "memory_keys": [],
+                "handle_keys": [],
+            }
+            if distributed_builder is not None:
+                # The object stays in the worker, chat messages are sent to it
+                input_keys_response = remote_input_keys or input_keys_response
             else:
-                input_keys_response = {
-                    "input_keys": None,
-                    "memory_keys": [],
-                    "handle_keys": [],
-                }
+                langchain_object = await graph.build()
+                # Now we  need to check the input_keys to send them to the client
+                if hasattr(langchain_object, "input_keys"):
+                    input_keys_response = build_input_keys_response(langchain_object, artifacts)
+                chat_service.set_cache(flow_id, langchain_object)
             yield str(StreamData(event="message", data=input_keys_response))
-            chat_service.set_cache(flow_id, langchain_object)
+            # Let other servers find the build if the websocket lands on them
+            await chat_service.set_build(
+                flow_id,
+                graph_data,
+                user_id,
+                remote=distributed_builder.build_record() if distributed_builder is not None else None,
+            )
             # We need to reset the chat history
             chat_service.chat_history.empty_history(flow_id)
             update_build_status(cache_service, flow_id, BuildStatus.SUCCESS)
@@ -212,13 +284,36 @@ async def stream_build(
         finally:
             yield str(StreamData(event="message", data=final_response))
 
+    # The build is scheduled for the user who initialized it
+    flow_cache = cache_service[flow_id] if flow_id in cache_service else None
+    user_id = flow_cache.get("user_id") if isinstance(flow_cache, dict) else None
     try:
-        return StreamingResponse(event_stream(flow_id), media_type="text/event-stream")
+        # The permit and the scheduler slot are held until the stream ends
+        return await admitted_streaming_response(
+            admission_service,
+            event_stream(flow_id),
+            hold=scheduler_slot(task_service, str(user_id) if user_id else None, INTERACTIVE),
+            media_type="text/event-stream",
+        )
+    except HTTPException:
+        raise
     except Exception as exc:
         logger.error(f"Error streaming build: {exc}")
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+def get_distributed_builder(graph_data: dict, user_id) -> Optional[DistributedGraphBuilder]:
+    """Return a builder that runs the vertices in Celery workers if the distributed build is enabled."""
+    if not get_settings_service().settings.DISTRIBUTED_BUILD:
+        return None
+    if not get_task_service().use_celery:
+        logger.warning("DISTRIBUTED_BUILD is enabled but Celery is not available, building locally")
+        return None
+    from langflow.worker import build_graph_vertex
+
+    return DistributedGraphBuilder(build_graph_vertex, graph_data, build_id=uuid.uuid4().hex, user_id=user_id)
+
+
 async def try_running_celery_task(vertex, user_id):
     # Try running the task in celery
     # and set the task_id to the local vertex
@@ -1,27 +1,48 @@
 from http import HTTPStatus
-from typing import Annotated, Any, List, Optional, Union
+from typing import Annotated, Any, AsyncIterator, List, Literal, Optional, Union
 
+import orjson
 import sqlalchemy as sa
-from fastapi import APIRouter, Body, Depends, HTTPException, UploadFile, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, UploadFile, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from langflow.api.utils import update_frontend_node_with_template_values
 from langflow.api.v1.schemas import (
     CustomComponentCode,
     PreloadResponse,
     ProcessResponse,
+    StreamData,
     TaskResponse,
     TaskStatusResponse,
     UploadFileResponse,
 )
 from langflow.interface.custom.custom_component import CustomComponent
 from langflow.interface.custom.directory_reader import DirectoryReader
-from langflow.interface.custom.utils import build_custom_component_template
-from langflow.processing.process import build_graph_and_generate_result, process_graph_cached, process_tweaks
+from langflow.interface.custom.template_cache import SupersededError, custom_component_template_cache
+from langflow.processing.process import (
+    build_graph_and_generate_result,
+    process_graph_cached,
+    process_graph_cached_stream,
+    process_tweaks,
+)
+from langflow.services.admission.service import AdmissionService
+from langflow.services.admission.utils import admission_control, admitted_streaming_response
 from langflow.services.auth.utils import api_key_security, get_current_active_user
 from langflow.services.cache.utils import save_uploaded_file
 from langflow.services.database.models.flow import Flow
 from langflow.services.database.models.user.model import User
-from langflow.services.deps import get_session, get_session_service, get_settings_service, get_task_service
+from langflow.services.deps import (
+    get_admission_service,
+    get_result_cache_service,
+    get_session,
+    get_session_service,
+    get_settings_service,
+    get_task_service,
+)
 from langflow.services.session.service import SessionService
+from langflow.services.task.backends.base import TaskQueueFullError
+from langflow.services.task.scheduler import BATCH, INTERACTIVE
+from langflow.services.task.utils import scheduler_slot
 from loguru import logger
 from sqlmodel import select
 
@@ -39,6 +60,8 @@ from sqlmodel import Session
 # build router
 router = APIRouter(tags=["Base"])
 
+PriorityClass = Literal["interactive", "batch"]
+
 
 async def process_graph_data(
     graph_data: dict,
@@ -48,21 +71,43 @@ async def process_graph_data(
     session_id: Optional[str] = None,
     task_service: "TaskService" = Depends(get_task_service),
     sync: bool = True,
+    owner: Optional[str] = None,
+    priority: Optional[str] = None,
+    cache_results: bool = True,
+    data_hash: Optional[str] = None,
+    flow_id: Optional[str] = None,
 ):
     task_result: Any = None
     task_status = None
+    cache_key = None
+    result_cache_service = get_result_cache_service()
+    if sync and cache_results and result_cache_service.is_cacheable(graph_data, session_id):
+        # The key uses the flow before tweaks are applied, the tweaks are part of it
+        cache_key = result_cache_service.build_key(graph_data, inputs, tweaks, data_hash=data_hash, flow_id=flow_id)
+        # clear_cache runs the flow again and refreshes the cached result
+        if not clear_cache and (cached := result_cache_service.get(cache_key)) is not None:
+            # No session is built for a hit, and the session of the run that filled the cache is not shared
+            return ProcessResponse(
+                result=cached["result"],
+                session_id=None,
+                backend=task_service.backend_name,
+            )
     if tweaks:
         try:
             graph_data = process_tweaks(graph_data, tweaks)
         except Exception as exc:
             logger.error(f"Error processing tweaks: {exc}")
+        # The stored hash is the hash of the flow without the tweaks
+        data_hash = None
     if sync:
-        result = await process_graph_cached(
-            graph_data,
-            inputs,
-            clear_cache,
-            session_id,
-        )
+        async with scheduler_slot(task_service, owner, priority or INTERACTIVE):
+            result = await process_graph_cached(
+                graph_data,
+                inputs,
+                clear_cache,
+                session_id,
+                data_hash=data_hash,
+            )
         task_id = str(id(result))
         if isinstance(result, dict) and "result" in result:
             task_result = result["result"]
@@ -73,6 +118,8 @@ async def process_graph_data(
             session_id = result.session_id
         else:
             task_result = result
+        if cache_key is not None:
+            result_cache_service.set(cache_key, task_result)
     else:
         logger.warning(
             "This is an experimental feature and may not work as expected."
@@ -80,20 +127,26 @@ async def process_graph_data(
         )
         if session_id is None:
             # Generate a session ID
-            session_id = get_session_service().generate_key(session_id=session_id, data_graph=graph_data)
-        task_id, task = await task_service.launch_task(
-            process_graph_cached_task if task_service.use_celery else process_graph_cached,
-            graph_data,
-            inputs,
-            clear_cache,
-            session_id,
-        )
+            session_id = get_session_service().generate_key(
+                session_id=session_id, data_graph=graph_data, data_hash=data_hash
+            )
+        try:
+            task_id, task = await task_service.launch_task(
+                process_graph_cached_task if task_service.use_celery else process_graph_cached,
+                graph_data,
+                inputs,
+                clear_cache,
+                session_id,
+                owner=owner,
+                priority=priority or BATCH,
+            )
+        except TaskQueueFullError as exc:
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(exc)) from exc
+        # The task runs in the background, its result is polled through /task/{task_id}
         task_status = task.status
         if task.status == "FAILURE":
             logger.error(f"Task {task_id} failed: {task.traceback}")
-            task_result = str(task._exception)
-        else:
-            task_result = task.result
+            task_result = str(task.result)
 
     if task_id:
         task_response = TaskResponse(id=task_id, href=f"api/v1/task/{task_id}")
@@ -113,16 +166,21 @@ async def process_graph_data(
 def get_all(
     settings_service=Depends(get_settings_service),
 ):
+    from langflow.interface.listing import lazy_load_dict
     from langflow.interface.types import get_all_types_dict
 
     logger.debug("Building langchain types dict")
     try:
-        return get_all_types_dict(settings_service)
+        all_types_dict = get_all_types_dict(settings_service)
+        # The custom components were just reloaded, so the types vertices are resolved with are refreshed too.
+        # all_types_dict is what get_type_dict returns, refresh adds the entries of _build_dict to it
+        lazy_load_dict.refresh(all_types_dict)
+        return all_types_dict
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
-@router.post("/process/json", response_model=ProcessResponse)
+@router.post("/process/json", response_model=ProcessResponse, dependencies=[Depends(admission_control)])
 async def process_json(
     session: Annotated[Session, Depends(get_session)],
     data: dict,
@@ -132,6 +190,7 @@ async def process_json(
     session_id: Annotated[Union[None, str], Body(embed=True)] = None,  # noqa: F821
     task_service: "TaskService" = Depends(get_task_service),
     sync: Annotated[bool, Body(embed=True)] = True,  # noqa: F821
+    priority: Annotated[Optional[PriorityClass], Body(embed=True)] = None,  # noqa: F821
 ):
     try:
         return await process_graph_data(
@@ -142,7 +201,10 @@ async def process_json(
             session_id=session_id,
             task_service=task_service,
             sync=sync,
+            priority=priority,
         )
+    except HTTPException:
+        raise
     except Exception as exc:
         logger.exception(exc)
         raise HTTPException(status_code=500, detail=str(exc)) from exc
@@ -200,11 +262,12 @@ async def preload_flow(
 @router.post(
     "/predict/{flow_id}",
     response_model=ProcessResponse,
-    dependencies=[Depends(api_key_security)],
+    dependencies=[Depends(api_key_security), Depends(admission_control)],
 )
 @router.post(
     "/process/{flow_id}",
     response_model=ProcessResponse,
+    dependencies=[Depends(admission_control)],
 )
 async def process(
     session: Annotated[Session, Depends(get_session)],
@@ -217,9 +280,13 @@ async def process(
     api_key_user: User = Depends(api_key_security),
     sync: Annotated[bool, Body(embed=True)] = True,  # noqa: F821
     session_service: SessionService = Depends(get_session_service),
+    priority: Annotated[Optional[PriorityClass], Body(embed=True)] = None,  # noqa: F821
 ):
     """
     Endpoint to process an input with a given flow_id.
+
+    Executions are scheduled per user. Sync calls default to the interactive
+    priority class and async calls (sync=False) to the batch one.
     """
 
     try:
@@ -231,13 +298,15 @@ async def process(
             task_id = None
             if not graph:
                 raise ValueError("Graph not found in the session")
-            result = await build_graph_and_generate_result(
-                graph=graph,
-                inputs=inputs,
-                artifacts=artifacts,
-                session_id=session_id,
-                session_service=session_service,
-            )
+            owner = str(api_key_user.id) if api_key_user else None
+            async with scheduler_slot(task_service, owner, priority or INTERACTIVE):
+                result = await build_graph_and_generate_result(
+                    graph=graph,
+                    inputs=inputs,
+                    artifacts=artifacts,
+                    session_id=session_id,
+                    session_service=session_service,
+                )
             task_id = str(id(result))
             if isinstance(result, dict) and "result" in result:
                 task_result = result["result"]
@@ -284,7 +353,14 @@ async def process(
                 session_id=session_id,
                 task_service=task_service,
                 sync=sync,
+                owner=str(api_key_user.id),
+                priority=priority,
+                cache_results=flow.cache_results is not False,
+                data_hash=flow.data_hash,
+                flow_id=str(flow.id),
             )
+    except HTTPException:
+        raise
     except sa.exc.StatementError as exc:
         # StatementError('(builtins.ValueError) badly formed hexadecimal UUID string')
         if "badly formed hexadecimal UUID string" in str(exc):
@@ -301,6 +377,91 @@ async def process(
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+def format_stream_event(event: str, data: dict, stream_format: str) -> str:
+    """Format an event as a Server-Sent Event or as a line of newline-delimited JSON."""
+    data = jsonable_encoder(data)
+    if stream_format == "ndjson":
+        return orjson.dumps({"event": event, "data": data}).decode() + "\n"
+    return str(StreamData(event=event, data=data))
+
+
+async def stream_process_events(
+    graph_data: dict,
+    inputs: Optional[dict],
+    clear_cache: bool,
+    session_id: Optional[str],
+    stream_format: str,
+    data_hash: Optional[str] = None,
+) -> AsyncIterator[str]:
+    try:
+        async for event, value in process_graph_cached_stream(
+            graph_data, inputs, clear_cache, session_id, data_hash=data_hash
+        ):
+            if event == "token":
+                yield format_stream_event("token", {"chunk": value}, stream_format)
+            else:
+                yield format_stream_event(
+                    "end", {"result": value.result, "session_id": value.session_id}, stream_format
+                )
+    except Exception as exc:
+        # The response has already started, so errors are sent as an event
+        logger.exception(exc)
+        yield format_stream_event("error", {"error": str(exc)}, stream_format)
+
+
+@router.post("/process/{flow_id}/stream", response_class=StreamingResponse)
+async def process_stream(
+    session: Annotated[Session, Depends(get_session)],
+    flow_id: str,
+    inputs: Optional[dict] = None,
+    tweaks: Optional[dict] = None,
+    clear_cache: Annotated[bool, Body(embed=True)] = False,  # noqa: F821
+    session_id: Annotated[Union[None, str], Body(embed=True)] = None,  # noqa: F821
+    stream_format: Annotated[Literal["sse", "ndjson"], Query()] = "sse",
+    api_key_user: User = Depends(api_key_security),
+    admission_service: "AdmissionService" = Depends(get_admission_service),
+    task_service: "TaskService" = Depends(get_task_service),
+):
+    """
+    Endpoint to process an input with a given flow_id, streaming the tokens as they are generated.
+
+    Tokens are sent as Server-Sent Events by default or as newline-delimited JSON
+    when stream_format is "ndjson". The last event holds the result and the session id.
+    The execution is scheduled like a sync /process call.
+    """
+    if api_key_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid API Key",
+        )
+    try:
+        flow = session.exec(select(Flow).where(Flow.id == flow_id).where(Flow.user_id == api_key_user.id)).first()
+    except sa.exc.StatementError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    if flow is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Flow {flow_id} not found")
+    if flow.data is None:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Flow {flow_id} has no data")
+
+    graph_data = flow.data
+    data_hash = flow.data_hash
+    if tweaks:
+        try:
+            graph_data = process_tweaks(graph_data, tweaks)
+        except Exception as exc:
+            logger.error(f"Error processing tweaks: {exc}")
+        data_hash = None
+
+    media_type = "application/x-ndjson" if stream_format == "ndjson" else "text/event-stream"
+    # The permit and the scheduler slot are held until the stream ends
+    return await admitted_streaming_response(
+        admission_service,
+        stream_process_events(graph_data, inputs, clear_cache, session_id, stream_format, data_hash=data_hash),
+        hold=scheduler_slot(task_service, str(api_key_user.id), INTERACTIVE),
+        media_type=media_type,
+    )
+
+
 @router.get("/task/{task_id}", response_model=TaskStatusResponse)
 async def get_task_status(task_id: str):
     task_service = get_task_service()
@@ -326,6 +487,26 @@ async def get_task_status(task_id: str):
     return TaskStatusResponse(status=task.status, result=result)
 
 
+@router.delete("/task/{task_id}", response_model=TaskStatusResponse)
+async def cancel_task(task_id: str, api_key_user: User = Depends(api_key_security)):
+    """Cancel a task launched by the caller. Superusers can cancel any task."""
+    if api_key_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid API Key",
+        )
+    task_service = get_task_service()
+    task = task_service.get_task(task_id)
+    # Tasks of other users are reported as missing
+    if task is None or (
+        not api_key_user.is_superuser and task_service.get_task_owner(task_id) != str(api_key_user.id)
+    ):
+        raise HTTPException(status_code=404, detail="Task not found")
+    if not task_service.cancel_task(task_id):
+        raise HTTPException(status_code=409, detail="Task already finished")
+    return TaskStatusResponse(status=task.status)
+
+
 @router.post(
     "/upload/{flow_id}",
     response_model=UploadFileResponse,
@@ -358,9 +539,12 @@ async def custom_component(
     raw_code: CustomComponentCode,
     user: User = Depends(get_current_active_user),
 ):
-    component = CustomComponent(code=raw_code.code)
-
-    built_frontend_node = build_custom_component_template(component, user_id=user.id)
+    try:
+        built_frontend_node = await custom_component_template_cache.get_template(
+            raw_code.code, user_id=user.id, client_id=raw_code.client_id
+        )
+    except SupersededError as exc:
+        raise HTTPException(status_code=HTTPStatus.CONFLICT, detail=str(exc)) from exc
 
     built_frontend_node = update_frontend_node_with_template_values(built_frontend_node, raw_code.frontend_node)
     return built_frontend_node
@@ -387,8 +571,12 @@ async def custom_component_update(
     raw_code: CustomComponentCode,
     user: User = Depends(get_current_active_user),
 ):
-    component = CustomComponent(code=raw_code.code)
-
-    component_node = build_custom_component_template(component, user_id=user.id, update_field=raw_code.field)
+    # The field is updated to get its new options or values, so the cached template isn't used
+    try:
+        component_node = await custom_component_template_cache.get_template(
+            raw_code.code, user_id=user.id, field=raw_code.field, client_id=raw_code.client_id, cached=False
+        )
+    except SupersededError as exc:
+        raise HTTPException(status_code=HTTPStatus.CONFLICT, detail=str(exc)) from exc
     # Update the field
     return component_node
@@ -1,22 +1,59 @@
+import base64
 from datetime import datetime
-from typing import List
+from typing import Iterator, List, Literal, Optional, Tuple
 from uuid import UUID
 
 import orjson
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
 from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import and_, func, insert, or_
 from sqlmodel import Session, select
 
-from langflow.api.utils import remove_api_keys, validate_is_component
-from langflow.api.v1.schemas import FlowListCreate, FlowListRead
+from langflow.api.utils import remove_api_keys, set_flow_metadata, validate_is_component
+from langflow.api.v1.schemas import FlowImportResponse, FlowListCreate, FlowSummaryPage
 from langflow.services.auth.utils import get_current_active_user
-from langflow.services.database.models.flow import Flow, FlowCreate, FlowRead, FlowUpdate
+from langflow.services.database.models.flow import Flow, FlowCreate, FlowRead, FlowSummary, FlowUpdate
 from langflow.services.database.models.user.model import User
-from langflow.services.deps import get_session, get_settings_service
+from langflow.services.database.utils import session_getter
+from langflow.services.deps import get_db_service, get_session, get_settings_service
 
 # build router
 router = APIRouter(prefix="/flows", tags=["Flows"])
 
+# The columns of the flow summaries, everything but the data
+SUMMARY_COLUMNS = [
+    Flow.id,
+    Flow.name,
+    Flow.description,
+    Flow.is_component,
+    Flow.updated_at,
+    Flow.folder,
+    Flow.node_count,
+    Flow.user_id,
+]
+# Flows are listed from the most recently updated, flows never updated last
+SORT_UPDATED_AT = func.coalesce(Flow.updated_at, datetime.min)
+# Flows inserted per statement by /flows/import/
+IMPORT_BATCH_SIZE = 500
+# Flows loaded per round trip by /flows/download/
+EXPORT_BATCH_SIZE = 100
+
+
+def encode_cursor(updated_at: Optional[datetime], flow_id: UUID) -> str:
+    """Encodes the position after the given flow in the listing."""
+    position = [(updated_at or datetime.min).isoformat(), flow_id.hex]
+    return base64.urlsafe_b64encode(orjson.dumps(position)).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        updated_at, flow_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(updated_at), UUID(flow_id)
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
 
 @router.post("/", response_model=FlowRead, status_code=201)
 def create_flow(
@@ -31,6 +68,7 @@ def create_flow(
 
     db_flow = Flow.model_validate(flow, from_attributes=True)
     db_flow.updated_at = datetime.utcnow()
+    set_flow_metadata(db_flow)
 
     session.add(db_flow)
     session.commit()
@@ -52,6 +90,46 @@ def read_flows(
     return [jsonable_encoder(flow) for flow in flows]
 
 
+@router.get("/summary/", response_model=FlowSummaryPage, status_code=200)
+def read_flow_summaries(
+    *,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    folder: Optional[str] = None,
+    name: Optional[str] = None,
+    is_component: Optional[bool] = None,
+):
+    """Read a page of flows without their data, from the most recently updated.
+
+    Pass the next_cursor of a page as cursor to read the next one. The name filter
+    matches part of the name, ignoring case.
+    """
+    query = select(*SUMMARY_COLUMNS).where(Flow.user_id == current_user.id)
+    if folder is not None:
+        query = query.where(Flow.folder == folder)
+    if name:
+        query = query.where(Flow.name.ilike(f"%{name}%"))  # type: ignore
+    if is_component is not None:
+        query = query.where(Flow.is_component == is_component)
+    if cursor:
+        updated_at, flow_id = decode_cursor(cursor)
+        query = query.where(
+            or_(SORT_UPDATED_AT < updated_at, and_(SORT_UPDATED_AT == updated_at, Flow.id < flow_id))
+        )
+    # One more row than the page tells whether there is a next page
+    query = query.order_by(SORT_UPDATED_AT.desc(), Flow.id.desc()).limit(limit + 1)  # type: ignore
+    rows = session.exec(query).all()
+
+    flows = [FlowSummary.model_validate(row._asdict()) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = flows[-1]
+        next_cursor = encode_cursor(last.updated_at, last.id)
+    return FlowSummaryPage(flows=flows, next_cursor=next_cursor)
+
+
 @router.get("/{flow_id}", response_model=FlowRead, status_code=200)
 def read_flow(
     *,
@@ -87,6 +165,7 @@ def update_flow(
         if value is not None:
             setattr(db_flow, key, value)
     db_flow.updated_at = datetime.utcnow()
+    set_flow_metadata(db_flow)
     session.add(db_flow)
     session.commit()
     session.refresh(db_flow)
@@ -124,6 +203,7 @@ def create_flows(
     for flow in flow_list.flows:
         flow.user_id = current_user.id
         db_flow = Flow.model_validate(flow, from_attributes=True)
+        set_flow_metadata(db_flow)
         session.add(db_flow)
         db_flows.append(db_flow)
     session.commit()
@@ -153,12 +233,78 @@ async def upload_file(
     return create_flows(session=session, flow_list=flow_list, current_user=current_user)
 
 
-@router.get("/download/", response_model=FlowListRead, status_code=200)
-async def download_file(
+@router.post("/import/", response_model=FlowImportResponse, status_code=201)
+def import_flows(
     *,
     session: Session = Depends(get_session),
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Import flows from a file with one flow per line (NDJSON), like /flows/download/?file_format=ndjson writes.
+
+    The file is read line by line and the flows are inserted in batches, so
+    the memory used doesn't grow with the file. Nothing is imported if a line
+    is not a valid flow.
+    """
+    imported = 0
+    batch: List[dict] = []
+    for line_number, line in enumerate(file.file, start=1):
+        if not line.strip():
+            continue
+        try:
+            flow = FlowCreate.model_validate_json(line)
+        except ValidationError as exc:
+            session.rollback()
+            raise HTTPException(status_code=422, detail=f"Invalid flow on line {line_number}: {exc}") from exc
+        flow.user_id = current_user.id
+        db_flow = set_flow_metadata(Flow.model_validate(flow, from_attributes=True))
+        # Not model_dump, which serializes updated_at to a string
+        batch.append({field: getattr(db_flow, field) for field in Flow.model_fields})
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            session.execute(insert(Flow), batch)
+            imported += len(batch)
+            batch = []
+    if batch:
+        session.execute(insert(Flow), batch)
+        imported += len(batch)
+    session.commit()
+    return FlowImportResponse(imported=imported)
+
+
+def iter_flows(user_id: UUID) -> Iterator[Flow]:
+    # The response is streamed after the request's session is closed, so it uses its own
+    with session_getter(get_db_service()) as session:
+        query = select(Flow).where(Flow.user_id == user_id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        for flow in session.exec(query):
+            yield flow
+
+
+def stream_flows(user_id: UUID, file_format: str) -> Iterator[bytes]:
+    """Serializes the flows of a user one at a time, as a FlowListRead document or as NDJSON."""
+    if file_format == "json":
+        yield b'{"flows":['
+    for index, flow in enumerate(iter_flows(user_id)):
+        validate_is_component([flow])
+        flow_json = FlowRead.model_validate(flow, from_attributes=True).model_dump_json().encode()
+        if file_format == "ndjson":
+            yield flow_json + b"\n"
+        else:
+            yield flow_json if index == 0 else b"," + flow_json
+    if file_format == "json":
+        yield b"]}"
+
+
+@router.get("/download/", response_class=StreamingResponse, status_code=200)
+def download_file(
+    *,
     current_user: User = Depends(get_current_active_user),
+    file_format: Literal["json", "ndjson"] = Query("json"),
 ):
-    """Download all flows as a file."""
-    flows = read_flows(current_user=current_user)
-    return FlowListRead(flows=flows)
+    """Download all flows as a file.
+
+    The flows are streamed from the database. The json format is a FlowListRead
+    document, the ndjson format has one flow per line and can be imported with
+    /flows/import/.
+    """
+    media_type = "application/x-ndjson" if file_format == "ndjson" else "application/json"
+    return StreamingResponse(stream_flows(current_user.id, file_format), media_type=media_type)
@@ -0,0 +1,50 @@
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from langflow.services.auth.utils import get_current_active_superuser
+from langflow.services.deps import get_metrics_service
+from langflow.services.metrics.service import MetricsService
+
+router = APIRouter(tags=["Monitor"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def get_metrics(metrics_service: MetricsService = Depends(get_metrics_service)):
+    """
+    Metrics of this worker in the Prometheus text format.
+
+    Scrapers authenticate with the API key of a superuser, in the x-api-key header or query parameter.
+    """
+    if not metrics_service.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics_service.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get(
+    "/monitor/profiles",
+    response_model=List[Dict[str, Any]],
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def list_profiles(metrics_service: MetricsService = Depends(get_metrics_service)):
+    """List the request profiles kept by this worker, most recent first."""
+    return metrics_service.list_profiles()
+
+
+@router.get(
+    "/monitor/profiles/{profile_id}",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def get_profile(profile_id: str, metrics_service: MetricsService = Depends(get_metrics_service)):
+    """Get the report of a request profile."""
+    profile = metrics_service.get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(profile["report"])
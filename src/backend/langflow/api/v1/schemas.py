@@ -5,7 +5,7 @@ from uuid import UUID
 
 from langflow.services.database.models.api_key.model import ApiKeyRead
 from langflow.services.database.models.base import orjson_dumps
-from langflow.services.database.models.flow import FlowCreate, FlowRead
+from langflow.services.database.models.flow import FlowCreate, FlowRead, FlowSummary
 from langflow.services.database.models.user import UserRead
 from pydantic import BaseModel, Field, field_validator
 
@@ -131,6 +131,15 @@ class FileResponse(ChatMessage):
         return v
 
 
+class ChatHistoryResponse(BaseModel):
+    """Paginated chat history schema."""
+
+    total: int
+    offset: int
+    limit: Optional[int] = None
+    messages: List[Dict[str, Any]]
+
+
 class FlowListCreate(BaseModel):
     flows: List[FlowCreate]
 
@@ -139,6 +148,17 @@ class FlowListRead(BaseModel):
     flows: List[FlowRead]
 
 
+class FlowImportResponse(BaseModel):
+    imported: int
+
+
+class FlowSummaryPage(BaseModel):
+    """A page of flow summaries. next_cursor is None on the last page."""
+
+    flows: List[FlowSummary]
+    next_cursor: Optional[str] = None
+
+
 class InitResponse(BaseModel):
     flowId: str
 
@@ -166,6 +186,9 @@ class CustomComponentCode(BaseModel):
     code: str
     field: Optional[str] = None
     frontend_node: Optional[dict] = None
+    # Id of the editor sending the code, e.g. the id of the node. A newer request with
+    # the same client_id supersedes the ones still pending, which get a 409
+    client_id: Optional[str] = None
 
 
 class CustomComponentResponseError(BaseModel):
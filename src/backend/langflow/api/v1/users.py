@@ -15,7 +15,7 @@ from langflow.services.auth.utils import (
 )
 from langflow.services.database.models.user import User, UserCreate, UserRead, UserUpdate
 from langflow.services.database.models.user.crud import get_user_by_id, update_user
-from langflow.services.deps import get_session, get_settings_service
+from langflow.services.deps import get_auth_service, get_session, get_settings_service
 
 router = APIRouter(tags=["Users"], prefix="/users")
 
@@ -119,6 +119,7 @@ def reset_password(
     user.password = new_password
     session.commit()
     session.refresh(user)
+    get_auth_service().principal_cache.invalidate_user(user.id)
 
     return user
 
@@ -143,5 +144,6 @@ def delete_user(
 
     session.delete(user_db)
     session.commit()
+    get_auth_service().principal_cache.invalidate_user(user_id)
 
     return {"detail": "User deleted"}
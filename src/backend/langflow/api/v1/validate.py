@@ -2,8 +2,11 @@ from fastapi import APIRouter, HTTPException
 from langflow.api.v1.base import (
     Code,
     CodeValidationResponse,
+    PromptsValidationResponse,
     PromptValidationResponse,
+    PromptValidationResult,
     ValidatePromptRequest,
+    ValidatePromptsRequest,
     validate_prompt,
 )
 from langflow.template.field.base import TemplateField
@@ -30,20 +33,7 @@ def post_validate_code(code: Code):
 def post_validate_prompt(prompt_request: ValidatePromptRequest):
     try:
         input_variables = validate_prompt(prompt_request.template)
-        # Check if frontend_node is None before proceeding to avoid attempting to update a non-existent node.
-        if prompt_request.frontend_node is None:
-            return PromptValidationResponse(
-                input_variables=input_variables,
-                frontend_node=None,
-            )
-        old_custom_fields = get_old_custom_fields(prompt_request)
-
-        add_new_variables_to_template(input_variables, prompt_request)
-
-        remove_old_variables_from_template(old_custom_fields, input_variables, prompt_request)
-
-        update_input_variables_field(input_variables, prompt_request)
-
+        update_frontend_node(input_variables, prompt_request)
         return PromptValidationResponse(
             input_variables=input_variables,
             frontend_node=prompt_request.frontend_node,
@@ -53,6 +43,39 @@ def post_validate_prompt(prompt_request: ValidatePromptRequest):
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@router.post("/prompts", status_code=200, response_model=PromptsValidationResponse)
+def post_validate_prompts(prompts_request: ValidatePromptsRequest):
+    """Validates all the prompts of a flow at once. An invalid prompt doesn't fail the others."""
+    results = []
+    for prompt_request in prompts_request.prompts:
+        try:
+            input_variables = validate_prompt(prompt_request.template)
+            update_frontend_node(input_variables, prompt_request)
+            result = PromptValidationResult(
+                input_variables=input_variables,
+                frontend_node=prompt_request.frontend_node,
+            )
+        except HTTPException as exc:
+            result = PromptValidationResult(input_variables=[], error=str(exc.detail))
+        except Exception as exc:
+            result = PromptValidationResult(input_variables=[], error=str(exc))
+        results.append(result)
+    return PromptsValidationResponse(results=results)
+
+
+def update_frontend_node(input_variables, prompt_request):
+    # Check if frontend_node is None before proceeding to avoid attempting to update a non-existent node.
+    if prompt_request.frontend_node is None:
+        return
+    old_custom_fields = get_old_custom_fields(prompt_request)
+
+    add_new_variables_to_template(input_variables, prompt_request)
+
+    remove_old_variables_from_template(old_custom_fields, input_variables, prompt_request)
+
+    update_input_variables_field(input_variables, prompt_request)
+
+
 def get_old_custom_fields(prompt_request):
     try:
         if len(prompt_request.frontend_node.custom_fields) == 1 and prompt_request.name == "":
@@ -16,3 +16,5 @@ else:
     result_backend = os.environ.get("RESULT_BACKEND", "redis://localhost:6379/0")
 # tasks should be json or pickle
 accept_content = ["json", "pickle"]
+# every worker also consumes its own queue, distributed builds send all the tasks of a flow to one worker
+worker_direct = True
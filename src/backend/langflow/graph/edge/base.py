@@ -1,83 +1,141 @@
-from typing import TYPE_CHECKING, List, Optional
+import sys
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple, Optional, Tuple
 
 from loguru import logger
-from pydantic import BaseModel, Field
+
+from langflow.graph.utils import intern_types
 
 if TYPE_CHECKING:
     from langflow.graph.vertex.base import Vertex
 
+# Number of distinct pairs of types kept by the compatibility caches
+TYPE_CACHE_SIZE = 4096
+
+
+class SourceHandle(NamedTuple):
+    # Base classes of the source vertex
+    baseClasses: Tuple[str, ...]
+    # Data type of the source vertex
+    dataType: str
+    # Id of the source vertex
+    id: str
+
+    @classmethod
+    def from_dict(cls, handle: dict) -> "SourceHandle":
+        try:
+            return cls(intern_types(handle["baseClasses"]), sys.intern(handle["dataType"]), handle["id"])
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"Invalid source handle {handle}") from exc
+
+
+class TargetHandle(NamedTuple):
+    # Field of the target vertex the edge connects to
+    fieldName: str
+    # Id of the target vertex
+    id: str
+    # Input types the field accepts besides its type
+    inputTypes: Optional[Tuple[str, ...]]
+    # Type of the field
+    type: str
+
+    @classmethod
+    def from_dict(cls, handle: dict) -> "TargetHandle":
+        try:
+            input_types = handle.get("inputTypes")
+            return cls(
+                handle["fieldName"],
+                handle["id"],
+                intern_types(input_types) if input_types is not None else None,
+                sys.intern(handle["type"]),
+            )
+        except (KeyError, TypeError, AttributeError) as exc:
+            raise ValueError(f"Invalid target handle {handle}") from exc
 
-class SourceHandle(BaseModel):
-    baseClasses: List[str] = Field(..., description="List of base classes for the source handle.")
-    dataType: str = Field(..., description="Data type for the source handle.")
-    id: str = Field(..., description="Unique identifier for the source handle.")
 
+@lru_cache(maxsize=TYPE_CACHE_SIZE)
+def handles_are_compatible(
+    base_classes: Tuple[str, ...], target_type: str, input_types: Optional[Tuple[str, ...]]
+) -> bool:
+    """Returns whether a source with base_classes can connect to a field of target_type that accepts input_types."""
+    if target_type in base_classes:
+        return True
+    return input_types is not None and any(base_class in input_types for base_class in base_classes)
 
-class TargetHandle(BaseModel):
-    fieldName: str = Field(..., description="Field name for the target handle.")
-    id: str = Field(..., description="Unique identifier for the target handle.")
-    inputTypes: Optional[List[str]] = Field(None, description="List of input types for the target handle.")
-    type: str = Field(..., description="Type of the target handle.")
+
+@lru_cache(maxsize=TYPE_CACHE_SIZE)
+def match_types(source_types: Tuple[str, ...], target_reqs: Tuple[str, ...]) -> Tuple[bool, Optional[str]]:
+    """
+    Returns whether any source type is a substring of a type the target requires,
+    and the first source type the target requires exactly.
+    """
+    # Sometimes a string contains the value we are looking for
+    # e.g. source_types=["Chain"] and target_reqs=["LLMChain"]
+    valid = any(output in target_req for output in source_types for target_req in target_reqs)
+    target_reqs_set = set(target_reqs)
+    matched_type = next((output for output in source_types if output in target_reqs_set), None)
+    return valid, matched_type
 
 
 class Edge:
+    # Sessions keep their graphs alive, so edges only keep their parsed handles and types
+    __slots__ = (
+        "source_id",
+        "target_id",
+        "source_handle",
+        "target_handle",
+        "target_param",
+        "valid_handles",
+        "source_types",
+        "target_reqs",
+        "valid",
+        "matched_type",
+    )
+
     def __init__(self, source: "Vertex", target: "Vertex", edge: dict):
         self.source_id: str = source.id if source else ""
         self.target_id: str = target.id if target else ""
         if data := edge.get("data", {}):
-            self._source_handle = data.get("sourceHandle", {})
-            self._target_handle = data.get("targetHandle", {})
-            self.source_handle: SourceHandle = SourceHandle(**self._source_handle)
-            self.target_handle: TargetHandle = TargetHandle(**self._target_handle)
+            self.source_handle: SourceHandle = SourceHandle.from_dict(data.get("sourceHandle", {}))
+            self.target_handle: TargetHandle = TargetHandle.from_dict(data.get("targetHandle", {}))
             self.target_param = self.target_handle.fieldName
             # validate handles
             self.validate_handles(source, target)
         else:
             # Logging here because this is a breaking change
             logger.error("Edge data is empty")
-            self._source_handle = edge.get("sourceHandle", "")
-            self._target_handle = edge.get("targetHandle", "")
             # 'BaseLoader;BaseOutputParser|documents|PromptTemplate-zmTlD'
             # target_param is documents
-            self.target_param = self._target_handle.split("|")[1]
+            self.target_param = edge.get("targetHandle", "").split("|")[1]
         # Validate in __init__ to fail fast
         self.validate_edge(source, target)
 
     def validate_handles(self, source, target) -> None:
-        if self.target_handle.inputTypes is None:
-            self.valid_handles = self.target_handle.type in self.source_handle.baseClasses
-        else:
-            self.valid_handles = (
-                any(baseClass in self.target_handle.inputTypes for baseClass in self.source_handle.baseClasses)
-                or self.target_handle.type in self.source_handle.baseClasses
-            )
+        self.valid_handles = handles_are_compatible(
+            self.source_handle.baseClasses, self.target_handle.type, self.target_handle.inputTypes
+        )
         if not self.valid_handles:
             logger.debug(self.source_handle)
             logger.debug(self.target_handle)
             raise ValueError(f"Edge between {source.vertex_type} and {target.vertex_type} " f"has invalid handles")
 
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+
     def __setstate__(self, state):
         self.source_id = state["source_id"]
         self.target_id = state["target_id"]
         self.target_param = state["target_param"]
         self.source_handle = state.get("source_handle")
         self.target_handle = state.get("target_handle")
+        self.matched_type = state.get("matched_type")
 
     def validate_edge(self, source, target) -> None:
         # Validate that the outputs of the source node are valid inputs
         # for the target node
-        self.source_types = source.output
-        self.target_reqs = target.required_inputs + target.optional_inputs
-        # Both lists contain strings and sometimes a string contains the value we are
-        # looking for e.g. comgin_out=["Chain"] and target_reqs=["LLMChain"]
-        # so we need to check if any of the strings in source_types is in target_reqs
-        self.valid = any(output in target_req for output in self.source_types for target_req in self.target_reqs)
-        # Get what type of input the target node is expecting
-
-        self.matched_type = next(
-            (output for output in self.source_types if output in self.target_reqs),
-            None,
-        )
+        self.source_types = intern_types(source.output)
+        self.target_reqs = intern_types(target.required_inputs + target.optional_inputs)
+        self.valid, self.matched_type = match_types(self.source_types, self.target_reqs)
         no_matched_type = self.matched_type is None
         if no_matched_type:
             logger.debug(self.source_types)
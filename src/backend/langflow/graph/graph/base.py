@@ -1,4 +1,5 @@
-from typing import Dict, Generator, List, Type, Union
+import time
+from typing import Any, Dict, Generator, List, Type, Union
 
 from langchain.chains.base import Chain
 from loguru import logger
@@ -9,6 +10,7 @@ from langflow.graph.graph.utils import process_flow
 from langflow.graph.vertex.base import Vertex
 from langflow.graph.vertex.types import FileToolVertex, LLMVertex, ToolkitVertex
 from langflow.interface.tools.constants import FILE_TOOLS
+from langflow.services.deps import get_metrics_service
 from langflow.utils import payload
 
 
@@ -131,7 +133,20 @@ class Graph:
         root_vertex = payload.get_root_vertex(self)
         if root_vertex is None:
             raise ValueError("No root vertex found")
-        return await root_vertex.build()
+        start = time.perf_counter()
+        result = await root_vertex.build()
+        get_metrics_service().record_graph_build(time.perf_counter() - start)
+        return result
+
+    def record_reuse(self):
+        """Counts a reuse of each built vertex, when the graph is reused by a later build."""
+        for vertex in self.vertices:
+            if vertex._built:
+                vertex.record_reuse()
+
+    def get_build_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the build metrics of each built vertex, keyed by vertex id."""
+        return {vertex.id: vertex.build_metrics for vertex in self.vertices if vertex.build_metrics}
 
     def topological_sort(self) -> List[Vertex]:
         """
@@ -213,16 +228,7 @@ class Graph:
         """Returns the vertex class based on the vertex type."""
         if vertex_type in FILE_TOOLS:
             return FileToolVertex
-        if vertex_base_type == "CustomComponent":
-            return lazy_load_vertex_dict.get_custom_component_vertex_type()
-
-        if vertex_base_type in lazy_load_vertex_dict.VERTEX_TYPE_MAP:
-            return lazy_load_vertex_dict.VERTEX_TYPE_MAP[vertex_base_type]
-        return (
-            lazy_load_vertex_dict.VERTEX_TYPE_MAP[vertex_type]
-            if vertex_type in lazy_load_vertex_dict.VERTEX_TYPE_MAP
-            else Vertex
-        )
+        return lazy_load_vertex_dict.get_vertex_class(vertex_type, vertex_base_type)
 
     def _build_vertices(self) -> List[Vertex]:
         """Builds the vertices of the graph."""
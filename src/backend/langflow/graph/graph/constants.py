@@ -1,4 +1,7 @@
+from typing import Dict, Tuple, Type
+
 from langflow.graph.vertex import types
+from langflow.graph.vertex.base import Vertex
 from langflow.interface.agents.base import agent_creator
 from langflow.interface.chains.base import chain_creator
 from langflow.interface.custom.base import custom_component_creator
@@ -18,23 +21,36 @@ from langflow.utils.lazy_load import LazyLoadDictBase
 
 
 class VertexTypesDict(LazyLoadDictBase):
-    def __init__(self):
-        self._all_types_dict = None
-
     @property
     def VERTEX_TYPE_MAP(self):
         return self.all_types_dict
 
-    def _build_dict(self):
-        langchain_types_dict = self.get_type_dict()
+    def _build_dict(self, type_dict=None):
+        langchain_types_dict = self.get_type_dict() if type_dict is None else type_dict
         return {
             **langchain_types_dict,
             "Custom": ["Custom Tool", "Python Function"],
         }
 
+    def _build_type_index(self) -> Dict[Tuple[str, str], Type[Vertex]]:
+        # Filled by get_vertex_class, as the pairs of types are only known from the flows
+        return {}
+
     def get_custom_component_vertex_type(self):
         return types.CustomComponentVertex
 
+    def get_vertex_class(self, vertex_type: str, vertex_base_type: str) -> Type[Vertex]:
+        """Returns the vertex class of a type and the _type of its template."""
+        key = (vertex_type, vertex_base_type)
+        if (vertex_class := self.type_index.get(key)) is None:
+            if vertex_base_type == "CustomComponent":
+                vertex_class = self.get_custom_component_vertex_type()
+            else:
+                type_map = self.VERTEX_TYPE_MAP
+                vertex_class = type_map.get(vertex_base_type) or type_map.get(vertex_type, Vertex)
+            self.type_index[key] = vertex_class
+        return vertex_class
+
     def get_type_dict(self):
         return {
             **{t: types.PromptVertex for t in prompt_creator.to_list()},
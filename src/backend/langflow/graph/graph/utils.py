@@ -1,31 +1,52 @@
-import copy
-from collections import deque
-from typing import Dict, List
+from collections import defaultdict, deque
+from typing import Dict, List, Union
 
 
 def find_last_node(nodes, edges):
     """
     This function receives a flow and returns the last node.
     """
-    return next((n for n in nodes if all(e["source"] != n["id"] for e in edges)), None)
+    sources = {e["source"] for e in edges}
+    return next((n for n in nodes if n["id"] not in sources), None)
 
 
 def add_parent_node_id(nodes, parent_node_id):
     """
-    This function receives a list of nodes and adds a parent_node_id to each node.
+    This function receives a list of nodes and returns copies of them with a parent_node_id.
     """
-    for node in nodes:
-        node["parent_node_id"] = parent_node_id
+    return [{**node, "parent_node_id": parent_node_id} for node in nodes]
+
+
+def index_nodes(nodes: Union[List[Dict], Dict[str, Dict]]) -> Dict[str, Dict]:
+    """Returns the nodes by id, nodes being a list of nodes or already an index."""
+    if isinstance(nodes, dict):
+        return nodes
+    return {node["id"]: node for node in nodes}
+
+
+def copy_node_template(node):
+    """
+    Copies the dicts of a node down to its template, so a template field can be replaced
+    without changing the node it was copied from.
+    """
+    node_data = node["data"]
+    template = node_data["node"]["template"]
+    return {**node, "data": {**node_data, "node": {**node_data["node"], "template": {**template}}}}
 
 
 def ungroup_node(group_node_data, base_flow):
+    """
+    Replaces a group node of base_flow with the nodes and edges of its flow.
+
+    Only the nodes and edges that change are copied, the group node data and
+    the rest of base_flow are shared with the result.
+    """
     template, flow = (
         group_node_data["node"]["template"],
         group_node_data["node"]["flow"],
     )
     parent_node_id = group_node_data["id"]
-    g_nodes = flow["data"]["nodes"]
-    add_parent_node_id(g_nodes, parent_node_id)
+    g_nodes = add_parent_node_id(flow["data"]["nodes"], parent_node_id)
     g_edges = flow["data"]["edges"]
 
     # Redirect edges to the correct proxy node
@@ -44,7 +65,7 @@ def ungroup_node(group_node_data, base_flow):
     base_flow["nodes"] = nodes
     base_flow["edges"] = edges
 
-    return nodes
+    return g_nodes
 
 
 def raw_topological_sort(nodes, edges) -> List[Dict]:
@@ -56,6 +77,10 @@ def raw_topological_sort(nodes, edges) -> List[Dict]:
     # States: 0 = unvisited, 1 = visiting, 2 = visited
     state = {node["id"]: 0 for node in nodes}
     nodes_dict = {node["id"]: node for node in nodes}
+    # The targets of each node, in the order of the edges
+    targets = defaultdict(list)
+    for edge in edges:
+        targets[edge["source"]].append(edge["target"])
     sorted_vertices = []
 
     def dfs(node):
@@ -64,9 +89,8 @@ def raw_topological_sort(nodes, edges) -> List[Dict]:
             raise ValueError("Graph contains a cycle, cannot perform topological sort")
         if state[node] == 0:
             state[node] = 1
-            for edge in edges:
-                if edge["source"] == node:
-                    dfs(edge["target"])
+            for target in targets[node]:
+                dfs(target)
             state[node] = 2
             sorted_vertices.append(node)
 
@@ -80,7 +104,14 @@ def raw_topological_sort(nodes, edges) -> List[Dict]:
 
 
 def process_flow(flow_object):
-    cloned_flow = copy.deepcopy(flow_object)
+    """
+    Returns the flow with its group nodes replaced by the nodes they group.
+
+    flow_object is not modified. Groups nested at any depth are ungrouped in
+    the same pass, as the nodes of each group are queued after it. The nodes
+    and edges that don't change are shared with flow_object.
+    """
+    cloned_flow = {**flow_object}
     processed_nodes = set()  # To keep track of processed nodes
 
     def process_node(node):
@@ -91,7 +122,6 @@ def process_flow(flow_object):
             return
 
         if node.get("data") and node["data"].get("node") and node["data"]["node"].get("flow"):
-            process_flow(node["data"]["node"]["flow"]["data"])
             new_nodes = ungroup_node(node["data"], cloned_flow)
             # Add new nodes to the queue for future processing
             nodes_to_process.extend(new_nodes)
@@ -113,6 +143,8 @@ def update_template(template, g_nodes):
     """
     Updates the template of a node in a graph with the given template.
 
+    The updated nodes are replaced in g_nodes by updated copies.
+
     Args:
         template (dict): The new template to update the node with.
         g_nodes (list): The list of nodes in the graph.
@@ -120,25 +152,28 @@ def update_template(template, g_nodes):
     Returns:
         None
     """
+    node_indexes = {n["id"]: i for i, n in enumerate(g_nodes)}
+    copied = set()
     for _, value in template.items():
         if not value.get("proxy"):
             continue
         proxy_dict = value["proxy"]
         field, id_ = proxy_dict["field"], proxy_dict["id"]
-        node_index = next((i for i, n in enumerate(g_nodes) if n["id"] == id_), -1)
+        node_index = node_indexes.get(id_, -1)
         if node_index != -1:
+            if node_index not in copied:
+                g_nodes[node_index] = copy_node_template(g_nodes[node_index])
+                copied.add(node_index)
+            node_template = g_nodes[node_index]["data"]["node"]["template"]
             display_name = None
-            show = g_nodes[node_index]["data"]["node"]["template"][field]["show"]
-            advanced = g_nodes[node_index]["data"]["node"]["template"][field]["advanced"]
-            if "display_name" in g_nodes[node_index]["data"]["node"]["template"][field]:
-                display_name = g_nodes[node_index]["data"]["node"]["template"][field]["display_name"]
+            show = node_template[field]["show"]
+            advanced = node_template[field]["advanced"]
+            if "display_name" in node_template[field]:
+                display_name = node_template[field]["display_name"]
             else:
-                display_name = g_nodes[node_index]["data"]["node"]["template"][field]["name"]
+                display_name = node_template[field]["name"]
 
-            g_nodes[node_index]["data"]["node"]["template"][field] = value
-            g_nodes[node_index]["data"]["node"]["template"][field]["show"] = show
-            g_nodes[node_index]["data"]["node"]["template"][field]["advanced"] = advanced
-            g_nodes[node_index]["data"]["node"]["template"][field]["display_name"] = display_name
+            node_template[field] = {**value, "show": show, "advanced": advanced, "display_name": display_name}
 
 
 def update_target_handle(
@@ -151,7 +186,7 @@ def update_target_handle(
 
     Args:
         new_edge (dict): The edge to update.
-        g_nodes (list): The list of nodes in the graph.
+        g_nodes (list | dict): The nodes in the graph, or the nodes by id.
         group_node_id (str): The ID of the group node.
 
     Returns:
@@ -160,7 +195,7 @@ def update_target_handle(
     target_handle = new_edge["data"]["targetHandle"]
     if target_handle.get("proxy"):
         proxy_id = target_handle["proxy"]["id"]
-        if node := next((n for n in g_nodes if n["id"] == proxy_id), None):
+        if node := index_nodes(g_nodes).get(proxy_id):
             set_new_target_handle(proxy_id, new_edge, target_handle, node)
         else:
             raise ValueError(f"Group node {group_node_id} has an invalid target proxy node {proxy_id}")
@@ -212,11 +247,9 @@ def update_source_handle(new_edge, g_nodes, g_edges):
     Returns:
         dict: The updated edge with the new source handle.
     """
-    last_node = copy.deepcopy(find_last_node(g_nodes, g_edges))
+    last_node = find_last_node(g_nodes, g_edges)
     new_edge["source"] = last_node["id"]
-    new_source_handle = new_edge["data"]["sourceHandle"]
-    new_source_handle["id"] = last_node["id"]
-    new_edge["data"]["sourceHandle"] = new_source_handle
+    new_edge["data"]["sourceHandle"] = {**new_edge["data"]["sourceHandle"], "id": last_node["id"]}
     return new_edge
 
 
@@ -234,14 +267,17 @@ def get_updated_edges(base_flow, g_nodes, g_edges, group_node_id):
         list: A list of updated edges.
     """
     updated_edges = []
+    g_nodes_by_id = index_nodes(g_nodes)
     for edge in base_flow["edges"]:
-        new_edge = copy.deepcopy(edge)
+        if edge["target"] != group_node_id and edge["source"] != group_node_id:
+            continue
+        # The handles are replaced, not modified, so copying the edge and its data is enough
+        new_edge = {**edge, "data": {**edge["data"]}}
         if new_edge["target"] == group_node_id:
-            new_edge = update_target_handle(new_edge, g_nodes, group_node_id)
+            new_edge = update_target_handle(new_edge, g_nodes_by_id, group_node_id)
 
         if new_edge["source"] == group_node_id:
             new_edge = update_source_handle(new_edge, g_nodes, g_edges)
 
-        if edge["target"] == group_node_id or edge["source"] == group_node_id:
-            updated_edges.append(new_edge)
+        updated_edges.append(new_edge)
     return updated_edges
@@ -1,12 +1,22 @@
-from typing import Any, Union
+import sys
+from typing import Any, Dict, Iterable, Tuple, Union
 
 from langflow.interface.utils import extract_input_variables_from_prompt
 
+# Tuples of types shared by every vertex and edge with the same types
+_TYPE_TUPLES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
 
 class UnbuiltObject:
     pass
 
 
+def intern_types(types: Iterable[str]) -> Tuple[str, ...]:
+    """Returns the types as a tuple of interned strings, the same tuple for the same types."""
+    key = tuple(sys.intern(type_) for type_ in types)
+    return _TYPE_TUPLES.setdefault(key, key)
+
+
 def validate_prompt(prompt: str):
     """Validate prompt."""
     if extract_input_variables_from_prompt(prompt):
@@ -1,11 +1,13 @@
 import ast
 import inspect
+import time
 import types
 from typing import TYPE_CHECKING, Any, Coroutine, Dict, List, Optional
 
-from langflow.graph.utils import UnbuiltObject
+from langflow.graph.utils import UnbuiltObject, intern_types
 from langflow.interface.initialize import loading
 from langflow.interface.listing import lazy_load_dict
+from langflow.services.deps import get_metrics_service
 from langflow.utils.constants import DIRECT_TYPES
 from langflow.utils.util import sync_to_async
 from loguru import logger
@@ -16,6 +18,29 @@ if TYPE_CHECKING:
 
 
 class Vertex:
+    # Sessions keep their graphs alive, so the attributes of vertices are slots.
+    # Subclasses declare __slots__ too, with the attributes they add
+    __slots__ = (
+        "graph",
+        "id",
+        "_data",
+        "data",
+        "base_type",
+        "output",
+        "required_inputs",
+        "optional_inputs",
+        "vertex_type",
+        "_built_object",
+        "_built",
+        "artifacts",
+        "build_metrics",
+        "task_id",
+        "is_task",
+        "params",
+        "parent_node_id",
+        "parent_is_top_level",
+    )
+
     def __init__(
         self,
         data: Dict,
@@ -32,6 +57,7 @@ class Vertex:
         self._built_object = UnbuiltObject()
         self._built = False
         self.artifacts: Dict[str, Any] = {}
+        self.build_metrics: Dict[str, Any] = {}
         self.task_id: Optional[str] = None
         self.is_task = is_task
         self.params = params or {}
@@ -69,6 +95,7 @@ class Vertex:
             self._built_object = UnbuiltObject()
             self._built = False
         self.artifacts: Dict[str, Any] = {}
+        self.build_metrics: Dict[str, Any] = {}
         self.task_id: Optional[str] = None
         self.parent_node_id = state["parent_node_id"]
         self.parent_is_top_level = state["parent_is_top_level"]
@@ -81,15 +108,11 @@ class Vertex:
         self.output = self.data["node"]["base_classes"]
         template_dicts = {key: value for key, value in self.data["node"]["template"].items() if isinstance(value, dict)}
 
-        self.required_inputs = [
-            template_dicts[key]["type"] for key, value in template_dicts.items() if value["required"]
-        ]
-        self.optional_inputs = [
-            template_dicts[key]["type"] for key, value in template_dicts.items() if not value["required"]
-        ]
-        # Add the template_dicts[key]["input_types"] to the optional_inputs
-        self.optional_inputs.extend(
-            [input_type for value in template_dicts.values() for input_type in value.get("input_types", [])]
+        self.required_inputs = intern_types(value["type"] for value in template_dicts.values() if value["required"])
+        # The input_types of the fields are optional inputs too
+        self.optional_inputs = intern_types(
+            [value["type"] for value in template_dicts.values() if not value["required"]]
+            + [input_type for value in template_dicts.values() for input_type in value.get("input_types", [])]
         )
 
         template_dict = self.data["node"]["template"]
@@ -100,10 +123,7 @@ class Vertex:
         )
 
         if self.base_type is None:
-            for base_type, value in lazy_load_dict.ALL_TYPES_DICT.items():
-                if self.vertex_type in value:
-                    self.base_type = base_type
-                    break
+            self.base_type = lazy_load_dict.get_base_type(self.vertex_type)
 
     def get_task(self):
         # using the task_id, get the task from celery
@@ -203,7 +223,6 @@ class Vertex:
                 else:
                     params.pop(key, None)
         # Add _type to params
-        self._raw_params = params
         self.params = params
 
     async def _build(self, user_id=None):
@@ -211,11 +230,36 @@ class Vertex:
         Initiate the build process.
         """
         logger.debug(f"Building {self.vertex_type}")
-        await self._build_each_node_in_params_dict(user_id)
-        await self._get_and_instantiate_class(user_id)
-        self._validate_built_object()
+        metrics_service = get_metrics_service()
+        memory_before = metrics_service.traced_memory()
+        start = time.perf_counter()
+        try:
+            await self._build_each_node_in_params_dict(user_id)
+            dependencies_done = time.perf_counter()
+            await self._get_and_instantiate_class(user_id)
+            instantiated = time.perf_counter()
+            self._validate_built_object()
+        except Exception:
+            metrics_service.record_vertex_build_error(self.vertex_type)
+            raise
 
         self._built = True
+        memory_after = metrics_service.traced_memory()
+        self.build_metrics = {
+            "wall_time": instantiated - start,
+            "dependencies_time": dependencies_done - start,
+            "instantiate_time": instantiated - dependencies_done,
+            "memory_delta": memory_after - memory_before if memory_before is not None else None,
+            "cache_hits": self.build_metrics.get("cache_hits", 0),
+        }
+        metrics_service.record_vertex_build(self.vertex_type, self.build_metrics)
+
+    def record_reuse(self):
+        """
+        Counts a reuse of the built object by a later build, e.g. by another request of the same session.
+        """
+        self.build_metrics["cache_hits"] = self.build_metrics.get("cache_hits", 0) + 1
+        get_metrics_service().record_vertex_cache_hit(self.vertex_type)
 
     async def _build_each_node_in_params_dict(self, user_id=None):
         """
@@ -248,9 +292,11 @@ class Vertex:
             return self._built_object
 
         if self.is_task and self.task_id is not None:
+            from langflow.services.task.utils import wait_for_task_result
+
             task = self.get_task()
 
-            result = task.get(timeout=timeout)
+            result = await wait_for_task_result(task, timeout=timeout)
             if isinstance(result, Coroutine):
                 result = await result
             if result is not None:  # If result is ready
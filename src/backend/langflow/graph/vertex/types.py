@@ -7,6 +7,8 @@ from langflow.interface.utils import extract_input_variables_from_prompt
 
 
 class AgentVertex(Vertex):
+    __slots__ = ("tools", "chains")
+
     def __init__(self, data: Dict, graph, params: Optional[Dict] = None):
         super().__init__(data, graph=graph, base_type="agents", params=params)
 
@@ -51,6 +53,8 @@ class AgentVertex(Vertex):
 
 
 class ToolVertex(Vertex):
+    __slots__ = ()
+
     def __init__(
         self,
         data: Dict,
@@ -61,11 +65,17 @@ class ToolVertex(Vertex):
 
 
 class LLMVertex(Vertex):
-    built_node_type = None
-    class_built_object = None
+    __slots__ = ("built_node_type", "class_built_object")
 
     def __init__(self, data: Dict, graph, params: Optional[Dict] = None):
         super().__init__(data, graph=graph, base_type="llms", params=params)
+        self.built_node_type = None
+        self.class_built_object = None
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.built_node_type = None
+        self.class_built_object = None
 
     async def build(self, force: bool = False, user_id=None, *args, **kwargs) -> Any:
         # LLM is different because some models might take up too much memory
@@ -82,16 +92,22 @@ class LLMVertex(Vertex):
 
 
 class ToolkitVertex(Vertex):
+    __slots__ = ()
+
     def __init__(self, data: Dict, graph, params=None):
         super().__init__(data, graph=graph, base_type="toolkits", params=params)
 
 
 class FileToolVertex(ToolVertex):
+    __slots__ = ()
+
     def __init__(self, data: Dict, graph, params=None):
         super().__init__(data, graph=graph, params=params)
 
 
 class WrapperVertex(Vertex):
+    __slots__ = ()
+
     def __init__(self, data: Dict, graph):
         super().__init__(data, graph=graph, base_type="wrappers")
 
@@ -104,6 +120,8 @@ class WrapperVertex(Vertex):
 
 
 class DocumentLoaderVertex(Vertex):
+    __slots__ = ()
+
     def __init__(self, data: Dict, graph, params: Optional[Dict] = None):
         super().__init__(data, graph=graph, base_type="documentloaders", params=params)
 
@@ -122,11 +140,15 @@ class DocumentLoaderVertex(Vertex):
 
 
 class EmbeddingVertex(Vertex):
+    __slots__ = ()
+
     def __init__(self, data: Dict, graph, params: Optional[Dict] = None):
         super().__init__(data, graph=graph, base_type="embeddings", params=params)
 
 
 class VectorStoreVertex(Vertex):
+    __slots__ = ()
+
     def __init__(self, data: Dict, graph, params=None):
         super().__init__(data, graph=graph, base_type="vectorstores")
 
@@ -159,16 +181,22 @@ class VectorStoreVertex(Vertex):
 
 
 class MemoryVertex(Vertex):
+    __slots__ = ()
+
     def __init__(self, data: Dict, graph):
         super().__init__(data, graph=graph, base_type="memory")
 
 
 class RetrieverVertex(Vertex):
+    __slots__ = ()
+
     def __init__(self, data: Dict, graph):
         super().__init__(data, graph=graph, base_type="retrievers")
 
 
 class TextSplitterVertex(Vertex):
+    __slots__ = ()
+
     def __init__(self, data: Dict, graph, params: Optional[Dict] = None):
         super().__init__(data, graph=graph, base_type="textsplitters", params=params)
 
@@ -185,6 +213,8 @@ class TextSplitterVertex(Vertex):
 
 
 class ChainVertex(Vertex):
+    __slots__ = ()
+
     def __init__(self, data: Dict, graph):
         super().__init__(data, graph=graph, base_type="chains")
 
@@ -215,6 +245,8 @@ class ChainVertex(Vertex):
 
 
 class PromptVertex(Vertex):
+    __slots__ = ()
+
     def __init__(self, data: Dict, graph):
         super().__init__(data, graph=graph, base_type="prompts")
 
@@ -284,11 +316,15 @@ class PromptVertex(Vertex):
 
 
 class OutputParserVertex(Vertex):
+    __slots__ = ()
+
     def __init__(self, data: Dict, graph):
         super().__init__(data, graph=graph, base_type="output_parsers")
 
 
 class CustomComponentVertex(Vertex):
+    __slots__ = ()
+
     def __init__(self, data: Dict, graph):
         super().__init__(data, graph=graph, base_type="custom_components", is_task=False)
 
@@ -3,7 +3,7 @@ from typing import Any, Dict, List, Optional, Type, Union
 from langchain.chains.base import Chain
 from langchain.agents import AgentExecutor
 from langflow.services.deps import get_settings_service
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 from langflow.template.field.base import TemplateField
 from langflow.template.frontend_node.base import FrontendNode
@@ -18,6 +18,8 @@ class LangChainTypeCreator(BaseModel, ABC):
     type_name: str
     type_dict: Optional[Dict] = None
     name_docs_dict: Optional[Dict[str, str]] = None
+    # Frontend nodes by name as dicts, as the types of a creator don't change once they are loaded
+    _frontend_node_dicts: Dict[str, Dict] = PrivateAttr(default_factory=dict)
 
     @property
     def frontend_node_class(self) -> Type[FrontendNode]:
@@ -60,10 +62,12 @@ class LangChainTypeCreator(BaseModel, ABC):
             # frontend_node.to_dict() returns a dict with the following structure:
             # {name: {template: {fields}, description: str}}
             # so we should update the result dict
-            node = self.frontend_node(name)
-            if node is not None:
-                node = node.to_dict()  # type: ignore
-                result[self.type_name].update(node)
+            if (node_dict := self._frontend_node_dicts.get(name)) is None:
+                node = self.frontend_node(name)
+                if node is None:
+                    continue
+                node_dict = self._frontend_node_dicts[name] = node.to_dict()
+            result[self.type_name].update(node_dict)
 
         return result
 
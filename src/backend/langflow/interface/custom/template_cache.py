@@ -0,0 +1,125 @@
+import asyncio
+import contextlib
+import copy
+import hashlib
+from typing import Any, Dict, Optional, Tuple, Union
+from uuid import UUID
+
+from cachetools import TTLCache
+from loguru import logger
+
+from langflow.interface.custom.custom_component import CustomComponent
+from langflow.interface.custom.utils import build_custom_component_template
+from langflow.services.deps import get_settings_service
+
+
+class SupersededError(Exception):
+    """Raised for a pending request of a client that sent a newer one."""
+
+
+def build_template(code: str, user_id: Optional[Union[str, UUID]], field: Optional[str]) -> Optional[Dict[str, Any]]:
+    return build_custom_component_template(CustomComponent(code=code), user_id=user_id, update_field=field)
+
+
+class CustomComponentTemplateCache:
+    """
+    Templates of custom components shared between requests.
+
+    The editor asks for the template of a component on every change of its code,
+    so the templates are cached by code hash, user and field. Concurrent requests
+    for the same template wait for a single build, which runs in a thread as it
+    parses and runs the code of the component. A request with a client_id is
+    answered with a SupersededError as soon as the same client sends a newer one.
+    """
+
+    def __init__(self):
+        self._templates: Optional[TTLCache] = None
+        self._pending: Dict[Tuple, asyncio.Future] = {}
+        self._clients: Dict[Tuple, asyncio.Event] = {}
+
+    @property
+    def templates(self) -> Optional[TTLCache]:
+        if self._templates is None:
+            settings = get_settings_service().settings
+            if settings.CUSTOM_COMPONENT_CACHE_SIZE > 0 and settings.CUSTOM_COMPONENT_CACHE_TTL > 0:
+                self._templates = TTLCache(
+                    maxsize=settings.CUSTOM_COMPONENT_CACHE_SIZE, ttl=settings.CUSTOM_COMPONENT_CACHE_TTL
+                )
+        return self._templates
+
+    def clear(self):
+        self._templates = None
+
+    async def get_template(
+        self,
+        code: str,
+        user_id: Optional[Union[str, UUID]] = None,
+        field: Optional[str] = None,
+        client_id: Optional[str] = None,
+        cached: bool = True,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Returns a copy of the template of the component, which the caller can change.
+
+        With cached False the template is built again, but still once for concurrent requests.
+        """
+        key = (hashlib.sha256(code.encode()).hexdigest(), str(user_id), field)
+        client_key = (str(user_id), client_id)
+        superseded = self._supersede(client_key) if client_id is not None else None
+        try:
+            if superseded is not None and (debounce := get_settings_service().settings.CUSTOM_COMPONENT_DEBOUNCE):
+                # Wait for the client to stop sending code before building it
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(superseded.wait(), timeout=debounce)
+                if superseded.is_set():
+                    raise SupersededError("Superseded by a newer request")
+
+            templates = self.templates if cached else None
+            if templates is None or (template := templates.get(key)) is None:
+                template = await self._wait(self._build(key, code, user_id, field, cached), superseded)
+            return copy.deepcopy(template)
+        finally:
+            if superseded is not None and self._clients.get(client_key) is superseded:
+                del self._clients[client_key]
+
+    def _supersede(self, client_key: Tuple) -> asyncio.Event:
+        if (previous := self._clients.get(client_key)) is not None:
+            previous.set()
+        superseded = self._clients[client_key] = asyncio.Event()
+        return superseded
+
+    def _build(self, key: Tuple, code: str, user_id, field, cached: bool) -> asyncio.Future:
+        future = self._pending.get(key)
+        if future is not None and future.get_loop() is asyncio.get_running_loop():
+            return future
+
+        async def build():
+            try:
+                template = await asyncio.to_thread(build_template, code, user_id, field)
+                if cached and (templates := self.templates) is not None:
+                    templates[key] = template
+                return template
+            finally:
+                self._pending.pop(key, None)
+
+        future = self._pending[key] = asyncio.ensure_future(build())
+        # The requests waiting for it may all have been superseded
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return future
+
+    async def _wait(self, future: asyncio.Future, superseded: Optional[asyncio.Event]):
+        # A request going away doesn't cancel a build other requests may be waiting for
+        if superseded is None:
+            return await asyncio.shield(future)
+        superseded_wait = asyncio.ensure_future(superseded.wait())
+        try:
+            await asyncio.wait({future, superseded_wait}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            superseded_wait.cancel()
+        if not future.done():
+            logger.debug("Custom component request superseded while building")
+            raise SupersededError("Superseded by a newer request")
+        return future.result()
+
+
+custom_component_template_cache = CustomComponentTemplateCache()
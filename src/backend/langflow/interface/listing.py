@@ -1,22 +1,33 @@
+from typing import Dict, Optional
+
 from langflow.services.deps import get_settings_service
 from langflow.utils.lazy_load import LazyLoadDictBase
 
 
 class AllTypesDict(LazyLoadDictBase):
-    def __init__(self):
-        self._all_types_dict = None
-
     @property
     def ALL_TYPES_DICT(self):
         return self.all_types_dict
 
-    def _build_dict(self):
-        langchain_types_dict = self.get_type_dict()
+    def _build_dict(self, type_dict=None):
+        langchain_types_dict = self.get_type_dict() if type_dict is None else type_dict
         return {
             **langchain_types_dict,
             "Custom": ["Custom Tool", "Python Function"],
         }
 
+    def _build_type_index(self) -> Dict[str, str]:
+        # The first base type listing a type wins, as when the dict was scanned in order
+        index: Dict[str, str] = {}
+        for base_type, value in self.all_types_dict.items():
+            for vertex_type in value:
+                index.setdefault(vertex_type, base_type)
+        return index
+
+    def get_base_type(self, vertex_type: str) -> Optional[str]:
+        """Returns the base type (chains, llms, ...) of a type, or None if it is unknown."""
+        return self.type_index.get(vertex_type)
+
     def get_type_dict(self):
         from langflow.interface.types import get_all_types_dict
 
@@ -10,7 +10,7 @@ from langchain.base_language import BaseLanguageModel
 from PIL.Image import Image
 from loguru import logger
 from langflow.services.chat.config import ChatConfig
-from langflow.services.deps import get_settings_service
+from langflow.services.deps import get_llm_cache_service
 
 
 def load_file_into_dict(file_path: str) -> dict:
@@ -62,27 +62,7 @@ def extract_input_variables_from_prompt(prompt: str) -> list[str]:
 
 def setup_llm_caching():
     """Setup LLM caching."""
-    settings_service = get_settings_service()
     try:
-        set_langchain_cache(settings_service.settings)
-    except ImportError:
-        logger.warning(f"Could not import {settings_service.settings.CACHE_TYPE}. ")
+        get_llm_cache_service().install()
     except Exception as exc:
         logger.warning(f"Could not setup LLM caching. Error: {exc}")
-
-
-def set_langchain_cache(settings):
-    from langchain.globals import set_llm_cache
-    from langflow.interface.importing.utils import import_class
-
-    if cache_type := os.getenv("LANGFLOW_LANGCHAIN_CACHE"):
-        try:
-            cache_class = import_class(f"langchain.cache.{cache_type or settings.LANGCHAIN_CACHE}")
-
-            logger.debug(f"Setting up LLM caching with {cache_class.__name__}")
-            set_llm_cache(cache_class())
-            logger.info(f"LLM caching setup with {cache_class.__name__}")
-        except ImportError:
-            logger.warning(f"Could not import {cache_type}. ")
-    else:
-        logger.info("No LLM cache set.")
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Optional
@@ -5,13 +7,16 @@ from urllib.parse import urlencode
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from langflow.api import router
 from langflow.interface.utils import setup_llm_caching
+from langflow.services.deps import get_metrics_service, get_settings_service
+from langflow.services.metrics.profiling import RequestProfiler
 from langflow.services.plugins.langfuse_plugin import LangfuseInstance
 from langflow.services.utils import initialize_services, teardown_services
+from langflow.utils.concurrency import shutdown_thread_pool
 from langflow.utils.logger import configure
 
 
@@ -22,6 +27,7 @@ async def lifespan(app: FastAPI):
     LangfuseInstance.update()
     yield
     teardown_services()
+    shutdown_thread_pool(wait=False)
 
 
 def create_app():
@@ -50,6 +56,35 @@ def create_app():
 
         return await call_next(request)
 
+    # A profiler sees the whole process, so a single request is profiled at a time
+    profiling_lock = asyncio.Lock()
+
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next):
+        # Only the work done until the response starts is profiled,
+        # the body of streaming responses is produced afterwards.
+        mode = request.headers.get("x-langflow-profile")
+        if not mode or not get_settings_service().settings.PROFILING_ENABLED:
+            return await call_next(request)
+        try:
+            profiler = RequestProfiler(mode)
+        except (ValueError, ImportError) as exc:
+            return JSONResponse(status_code=400, content={"detail": str(exc)})
+        if profiling_lock.locked():
+            return JSONResponse(status_code=409, content={"detail": "Another request is being profiled"})
+
+        async with profiling_lock:
+            start = time.perf_counter()
+            profiler.start()
+            try:
+                response = await call_next(request)
+            finally:
+                report = profiler.stop()
+        duration = time.perf_counter() - start
+        profile_id = get_metrics_service().add_profile(request.method, request.url.path, mode, duration, report)
+        response.headers["X-Langflow-Profile-Id"] = profile_id
+        return response
+
     @app.get("/health")
     def health():
         return {"status": "ok"}
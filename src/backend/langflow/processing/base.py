@@ -11,13 +11,15 @@ if TYPE_CHECKING:
     from langfuse.callback import CallbackHandler  # type: ignore
 
 
-def setup_callbacks(sync, trace_id, **kwargs):
-    """Setup callbacks for langchain object"""
+def setup_callbacks(sync, trace_id, stream=True, **kwargs):
+    """
+    Setup callbacks for langchain object. The streaming callbacks send to the
+    websocket of the client, stream=False leaves them out for runs without one.
+    """
     callbacks = []
-    if sync:
-        callbacks.append(StreamingLLMCallbackHandler(**kwargs))
-    else:
-        callbacks.append(AsyncStreamingLLMCallbackHandler(**kwargs))
+    if stream:
+        handler_class = StreamingLLMCallbackHandler if sync else AsyncStreamingLLMCallbackHandler
+        callbacks.append(handler_class(**kwargs))
 
     plugin_service = get_plugins_service()
     plugin_callbacks = plugin_service.get_callbacks(_id=trace_id)
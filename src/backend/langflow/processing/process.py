@@ -1,5 +1,5 @@
 import asyncio
-from typing import Any, Coroutine, Dict, List, Optional, Tuple, Union
+from typing import Any, AsyncIterator, Coroutine, Dict, List, Optional, Tuple, Union
 
 from langchain.agents import AgentExecutor
 from langchain.chains.base import Chain
@@ -10,8 +10,10 @@ from langchain_core.runnables.base import Runnable
 from langflow.graph.graph.base import Graph
 from langflow.interface.custom.custom_component import CustomComponent
 from langflow.interface.run import build_sorted_vertices, get_memory_key, update_memory_keys
+from langflow.interface.utils import try_setting_streaming_options
 from langflow.services.deps import get_session_service
 from langflow.services.session.service import SessionService
+from langflow.utils.concurrency import run_in_thread_pool
 from loguru import logger
 from pydantic import BaseModel
 
@@ -60,7 +62,7 @@ def format_actions(actions: List[Tuple[AgentAction, str]]) -> str:
     return "\n".join(output)
 
 
-def get_result_and_thought(langchain_object: Any, inputs: dict):
+async def get_result_and_thought(langchain_object: Any, inputs: dict):
     """Get result and thought from extracted json"""
     try:
         if hasattr(langchain_object, "verbose"):
@@ -76,11 +78,17 @@ def get_result_and_thought(langchain_object: Any, inputs: dict):
             logger.error(f"Error fixing memory inputs: {exc}")
 
         try:
-            output = langchain_object(inputs, return_only_outputs=True)
+            if hasattr(langchain_object, "acall"):
+                output = await langchain_object.acall(inputs, return_only_outputs=True)
+            else:
+                output = await run_in_thread_pool(langchain_object, inputs, return_only_outputs=True)
         except ValueError as exc:
             # make the error message more informative
             logger.debug(f"Error: {str(exc)}")
-            output = langchain_object.run(inputs)
+            if hasattr(langchain_object, "arun"):
+                output = await langchain_object.arun(inputs)
+            else:
+                output = await run_in_thread_pool(langchain_object.run, inputs)
 
     except Exception as exc:
         raise ValueError(f"Error: {str(exc)}") from exc
@@ -139,6 +147,10 @@ async def process_runnable(runnable: Runnable, inputs: Union[dict, List[dict]]):
         result = await runnable.abatch(inputs)
     elif isinstance(inputs, dict) and hasattr(runnable, "ainvoke"):
         result = await runnable.ainvoke(inputs)
+    elif isinstance(inputs, List) and hasattr(runnable, "batch"):
+        result = await run_in_thread_pool(runnable.batch, inputs)
+    elif isinstance(inputs, dict) and hasattr(runnable, "invoke"):
+        result = await run_in_thread_pool(runnable.invoke, inputs)
     else:
         raise ValueError(f"Runnable {runnable} does not support inputs of type {type(inputs)}")
     # Check if the result is a list of AIMessages
@@ -154,14 +166,14 @@ async def process_inputs_dict(built_object: Union[Chain, VectorStore, Runnable],
         if inputs is None:
             raise ValueError("Inputs must be provided for a Chain")
         logger.debug("Generating result and thought")
-        result = get_result_and_thought(built_object, inputs)
+        result = await get_result_and_thought(built_object, inputs)
 
         logger.debug("Generated result and thought")
     elif isinstance(built_object, VectorStore) and "query" in inputs:
         if isinstance(inputs, dict) and "search_type" not in inputs:
             inputs["search_type"] = "similarity"
             logger.info("search_type not provided, using default value: similarity")
-        result = built_object.search(**inputs)
+        result = await run_in_thread_pool(built_object.search, **inputs)
     elif isinstance(built_object, Document):
         result = built_object.dict()
     elif isinstance(built_object, Runnable):
@@ -173,7 +185,7 @@ async def process_inputs_dict(built_object: Union[Chain, VectorStore, Runnable],
         else:
             result = result
     elif hasattr(built_object, "run") and isinstance(built_object, CustomComponent):
-        result = built_object.run(inputs)
+        result = await run_in_thread_pool(built_object.run, inputs)
     else:
         result = None
 
@@ -206,22 +218,40 @@ class Result(BaseModel):
     session_id: str
 
 
-async def process_graph_cached(
+async def load_graph_from_session(
+    session_service: SessionService,
     data_graph: Dict[str, Any],
-    inputs: Optional[Union[dict, List[dict]]] = None,
     clear_cache=False,
     session_id=None,
-) -> Result:
-    session_service = get_session_service()
+    data_hash: Optional[str] = None,
+) -> Tuple[Graph, Dict[str, Any], str]:
+    """Load the graph and artifacts of a session, building and caching them if needed.
+
+    data_hash is the stored hash of data_graph, if it is the data of a saved flow.
+    """
     if clear_cache:
         session_service.clear_session(session_id)
     if session_id is None:
-        session_id = session_service.generate_key(session_id=session_id, data_graph=data_graph)
+        session_id = session_service.generate_key(session_id=session_id, data_graph=data_graph, data_hash=data_hash)
     # Load the graph using SessionService
-    session = await session_service.load_session(session_id, data_graph)
+    session = await session_service.load_session(session_id, data_graph, data_hash=data_hash)
     graph, artifacts = session if session else (None, None)
     if not graph:
         raise ValueError("Graph not found in the session")
+    return graph, artifacts or {}, session_id
+
+
+async def process_graph_cached(
+    data_graph: Dict[str, Any],
+    inputs: Optional[Union[dict, List[dict]]] = None,
+    clear_cache=False,
+    session_id=None,
+    data_hash: Optional[str] = None,
+) -> Result:
+    session_service = get_session_service()
+    graph, artifacts, session_id = await load_graph_from_session(
+        session_service, data_graph, clear_cache=clear_cache, session_id=session_id, data_hash=data_hash
+    )
 
     result = await build_graph_and_generate_result(
         graph=graph, session_id=session_id, inputs=inputs, artifacts=artifacts, session_service=session_service
@@ -230,6 +260,94 @@ async def process_graph_cached(
     return result
 
 
+async def stream_chain(chain: Chain, inputs: dict) -> AsyncIterator[Tuple[str, Any]]:
+    """Run a Chain with acall and yield its tokens as they are generated."""
+    from langflow.api.v1.callback import AsyncQueueCallbackHandler
+
+    chain = try_setting_streaming_options(chain)
+    try:
+        fix_memory_inputs(chain)
+    except Exception as exc:
+        logger.error(f"Error fixing memory inputs: {exc}")
+
+    handler = AsyncQueueCallbackHandler()
+    task = asyncio.create_task(chain.acall(inputs, callbacks=[handler], return_only_outputs=True))
+    try:
+        while True:
+            next_token = asyncio.ensure_future(handler.queue.get())
+            done, _ = await asyncio.wait({next_token, task}, return_when=asyncio.FIRST_COMPLETED)
+            if next_token in done:
+                yield "token", next_token.result()
+                continue
+            next_token.cancel()
+            break
+        while not handler.queue.empty():
+            yield "token", handler.queue.get_nowait()
+        yield "result", task.result()
+    finally:
+        # The client may go away before the chain finishes
+        if not task.done():
+            task.cancel()
+
+
+async def stream_runnable(runnable: Runnable, inputs: dict) -> AsyncIterator[Tuple[str, Any]]:
+    """Run a Runnable with astream and yield each chunk."""
+    chunks = []
+    async for chunk in runnable.astream(inputs):
+        content = chunk.content if hasattr(chunk, "content") else chunk
+        chunks.append(content)
+        yield "token", content
+    if chunks and all(isinstance(chunk, str) for chunk in chunks):
+        yield "result", "".join(chunks)
+    else:
+        yield "result", chunks[-1] if len(chunks) == 1 else chunks
+
+
+async def stream_result(
+    built_object: Union[Chain, VectorStore, Runnable], inputs: dict
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Generate the result of a built object, yielding ("token", chunk) tuples while it is
+    generated and a final ("result", result) tuple.
+
+    Objects that cannot stream only yield the final result.
+    """
+    if isinstance(built_object, Chain):
+        async for event in stream_chain(built_object, inputs):
+            yield event
+    elif isinstance(built_object, Runnable) and hasattr(built_object, "astream"):
+        async for event in stream_runnable(built_object, inputs):
+            yield event
+    else:
+        yield "result", await generate_result(built_object, inputs)
+
+
+async def process_graph_cached_stream(
+    data_graph: Dict[str, Any],
+    inputs: Optional[dict] = None,
+    clear_cache=False,
+    session_id=None,
+    data_hash: Optional[str] = None,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Streaming version of process_graph_cached.
+
+    Yields ("token", chunk) tuples followed by a ("result", Result) tuple.
+    """
+    session_service = get_session_service()
+    graph, artifacts, session_id = await load_graph_from_session(
+        session_service, data_graph, clear_cache=clear_cache, session_id=session_id, data_hash=data_hash
+    )
+    built_object = await graph.build()
+    processed_inputs = process_inputs(inputs, artifacts)
+    async for event, value in stream_result(built_object, processed_inputs):
+        if event == "result":
+            # The built object may have new memory
+            session_service.update_session(session_id, (graph, artifacts))
+            value = Result(result=value, session_id=session_id)
+        yield event, value
+
+
 async def build_graph_and_generate_result(
     graph: "Graph",
     session_id: str,
@@ -0,0 +1,26 @@
+from typing import TYPE_CHECKING
+
+from langflow.services.admission.service import AdmissionService
+from langflow.services.factory import ServiceFactory
+
+if TYPE_CHECKING:
+    from langflow.services.metrics.service import MetricsService
+    from langflow.services.settings.service import SettingsService
+
+
+class AdmissionServiceFactory(ServiceFactory):
+    def __init__(self):
+        super().__init__(AdmissionService)
+
+    def create(self, settings_service: "SettingsService", metrics_service: "MetricsService"):
+        settings = settings_service.settings
+        return AdmissionService(
+            enabled=settings.ADMISSION_CONTROL_ENABLED,
+            max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+            max_queue=settings.ADMISSION_MAX_QUEUE,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+            adaptive=settings.ADMISSION_ADAPTIVE,
+            min_limit=settings.ADMISSION_MIN_LIMIT,
+            target_latency=settings.ADMISSION_TARGET_LATENCY,
+            metrics_service=metrics_service,
+        )
@@ -0,0 +1,183 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Deque, Optional
+
+from loguru import logger
+
+from langflow.services.base import Service
+
+if TYPE_CHECKING:
+    from langflow.services.metrics.service import MetricsService
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request is shed. retry_after is a hint in seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Permit:
+    def __init__(self):
+        self.admitted_at = time.monotonic()
+        self.released = False
+
+
+class AdmissionService(Service):
+    """
+    Bounds the number of flow executions in flight in this worker.
+
+    Requests over the limit wait up to queue_timeout seconds for a permit and
+    are rejected right away when max_queue requests are already waiting. When
+    adaptive is on, the limit follows the observed latency: it grows by one
+    for every window of requests faster than target_latency and is cut by
+    backoff_ratio when a request admitted after the last cut is slower. It
+    never goes below min_limit or above max_in_flight.
+    """
+
+    name = "admission_service"
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_in_flight: int = 64,
+        max_queue: int = 64,
+        queue_timeout: float = 5.0,
+        adaptive: bool = True,
+        min_limit: int = 4,
+        target_latency: float = 30.0,
+        backoff_ratio: float = 0.9,
+        metrics_service: Optional["MetricsService"] = None,
+    ):
+        self.enabled = enabled
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.adaptive = adaptive
+        self.min_limit = min(min_limit, max_in_flight)
+        self.target_latency = target_latency
+        self.backoff_ratio = backoff_ratio
+        self.metrics_service = metrics_service
+        self._limit = float(max_in_flight)
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        self._average_latency: Optional[float] = None
+        self._record_state()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait, based on the average latency."""
+        estimate = self._average_latency if self._average_latency is not None else self.queue_timeout
+        return max(1, math.ceil(estimate))
+
+    async def acquire(self) -> Permit:
+        """
+        Wait for a permit.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the wait timed out.
+        """
+        if not self.enabled:
+            return Permit()
+        if self._in_flight < self.limit and not self._waiters:
+            return self._admit()
+        if len(self._waiters) >= self.max_queue or self.queue_timeout <= 0:
+            self._reject("queue_full")
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await asyncio.wait_for(future, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not future.done() or future.cancelled():
+                self._reject("queue_timeout")
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The permit was handed over as the client went away
+                self._in_flight -= 1
+                self._wake_waiters()
+            raise
+        finally:
+            if future in self._waiters:
+                self._waiters.remove(future)
+        return Permit()
+
+    def release(self, permit: Permit):
+        if permit.released or not self.enabled:
+            return
+        permit.released = True
+        self._in_flight -= 1
+        self._observe(permit)
+        self._wake_waiters()
+        self._record_state()
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[Permit]:
+        permit = await self.acquire()
+        try:
+            yield permit
+        finally:
+            self.release(permit)
+
+    def _admit(self) -> Permit:
+        self._in_flight += 1
+        self._record_state()
+        return Permit()
+
+    def _reject(self, reason: str):
+        if self.metrics_service is not None:
+            self.metrics_service.record_admission_rejection(reason)
+        retry_after = self.retry_after()
+        logger.warning(f"Shedding request ({reason}): {self._in_flight} in flight, limit {self.limit}")
+        raise AdmissionRejectedError(f"Server is overloaded, retry in {retry_after} seconds", retry_after)
+
+    def _wake_waiters(self):
+        while self._waiters and self._in_flight < self.limit:
+            future = self._waiters.popleft()
+            if future.done():
+                continue
+            # The permit is counted here so no other request takes it first
+            self._in_flight += 1
+            future.set_result(None)
+
+    def _observe(self, permit: Permit):
+        now = time.monotonic()
+        latency = now - permit.admitted_at
+        if self._average_latency is None:
+            self._average_latency = latency
+        else:
+            self._average_latency = 0.8 * self._average_latency + 0.2 * latency
+        if not self.adaptive:
+            return
+        if latency > self.target_latency:
+            # Only requests admitted after the last cut reflect the current limit
+            if permit.admitted_at >= self._last_decrease:
+                self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+                self._last_decrease = now
+        else:
+            self._limit = min(float(self.max_in_flight), self._limit + 1 / self._limit)
+
+    def _record_state(self):
+        if self.metrics_service is not None:
+            self.metrics_service.set_admission_state(self.limit, self._in_flight)
+
+    def __repr__(self):
+        return (
+            f"AdmissionService(enabled={self.enabled}, limit={self.limit}, max_in_flight={self.max_in_flight},"
+            f" max_queue={self.max_queue}, queue_timeout={self.queue_timeout}, adaptive={self.adaptive})"
+        )
@@ -0,0 +1,58 @@
+from contextlib import AsyncExitStack
+from typing import Any, AsyncContextManager, AsyncIterator, Optional
+
+from fastapi import Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from langflow.services.admission.service import AdmissionRejectedError, AdmissionService, Permit
+from langflow.services.deps import get_admission_service
+
+
+async def admit_request(admission_service: AdmissionService) -> Permit:
+    """Acquire a permit or reject the request with a 503 and a Retry-After header."""
+    try:
+        return await admission_service.acquire()
+    except AdmissionRejectedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+
+
+async def admission_control(
+    admission_service: AdmissionService = Depends(get_admission_service),
+) -> AsyncIterator[None]:
+    """Dependency that holds a permit for the duration of the endpoint."""
+    permit = await admit_request(admission_service)
+    try:
+        yield
+    finally:
+        admission_service.release(permit)
+
+
+async def admitted_streaming_response(
+    admission_service: AdmissionService,
+    content: AsyncIterator[Any],
+    hold: Optional[AsyncContextManager] = None,
+    **kwargs,
+) -> StreamingResponse:
+    """
+    StreamingResponse that holds a permit until the stream ends. The permit is
+    released by a background task, which also runs if the client disconnects
+    before the stream starts.
+
+    hold, e.g. a scheduler slot, is entered once the permit is granted and
+    exited with it.
+    """
+    permit = await admit_request(admission_service)
+    stack = AsyncExitStack()
+    stack.callback(admission_service.release, permit)
+    if hold is not None:
+        try:
+            await stack.enter_async_context(hold)
+        except BaseException:
+            await stack.aclose()
+            raise
+    return StreamingResponse(content, background=BackgroundTask(stack.aclose), **kwargs)
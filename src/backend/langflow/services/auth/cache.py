@@ -0,0 +1,96 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import Session
+
+from langflow.services.database.models.user.model import User
+
+
+def hash_credential(credential: str) -> str:
+    """Hash an API key or a token so the cache never holds the credential itself."""
+    return hashlib.sha256(credential.encode()).hexdigest()
+
+
+class PrincipalCache:
+    """
+    Short-lived cache of the users resolved from API keys and JWTs.
+
+    Users are kept as detached snapshots and merged into the session of each
+    request without loading them again. An entry is dropped when it expires,
+    when its API key is deleted or when its user changes. Invalidation only
+    reaches the current worker, so the TTL bounds how long other workers can
+    use a stale entry.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_size: int = 10_000):
+        self.ttl = ttl
+        self.max_size = max_size
+        # key -> (expires_at, user snapshot, api key id)
+        self._entries: "OrderedDict[str, Tuple[float, User, Optional[UUID]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, key: str, session: Session) -> Optional[Tuple[User, Optional[UUID]]]:
+        """
+        Return the cached user attached to the session and the id of the API key it was resolved from.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, snapshot, api_key_id = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return session.merge(snapshot, load=False), api_key_id
+
+    def set(self, key: str, user: User, api_key_id: Optional[UUID] = None, expires_at: Optional[float] = None):
+        """
+        Cache a user. expires_at caps the TTL, e.g. with the expiration of a JWT.
+        """
+        if not self.enabled:
+            return
+        entry_expires_at = time.time() + self.ttl
+        if expires_at is not None:
+            entry_expires_at = min(entry_expires_at, expires_at)
+        snapshot = self._snapshot(user)
+        with self._lock:
+            self._entries[key] = (entry_expires_at, snapshot, api_key_id)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: UUID):
+        with self._lock:
+            for key in [key for key, (_, user, _) in self._entries.items() if user.id == user_id]:
+                del self._entries[key]
+
+    def invalidate_api_key(self, api_key_id: UUID):
+        with self._lock:
+            for key in [key for key, (_, _, key_id) in self._entries.items() if key_id == api_key_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _snapshot(user: User) -> User:
+        # A copy of the column values that is not bound to the session it was loaded from
+        snapshot = User(**{column: getattr(user, column) for column in User.__table__.columns.keys()})
+        make_transient_to_detached(snapshot)
+        return snapshot
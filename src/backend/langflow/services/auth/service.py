@@ -1,6 +1,8 @@
-from langflow.services.base import Service
 from typing import TYPE_CHECKING
 
+from langflow.services.auth.cache import PrincipalCache
+from langflow.services.base import Service
+
 if TYPE_CHECKING:
     from langflow.services.settings.service import SettingsService
 
@@ -10,3 +12,7 @@ class AuthService(Service):
 
     def __init__(self, settings_service: "SettingsService"):
         self.settings_service = settings_service
+        self.principal_cache = PrincipalCache(ttl=settings_service.auth_settings.PRINCIPAL_CACHE_TTL)
+
+    def teardown(self):
+        self.principal_cache.clear()
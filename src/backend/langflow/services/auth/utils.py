@@ -8,11 +8,12 @@ from fastapi.security import APIKeyHeader, APIKeyQuery, OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlmodel import Session
 
-from langflow.services.database.models.api_key.model import ApiKey
-from langflow.services.database.models.api_key.crud import check_key
-from langflow.services.database.models.user.crud import get_user_by_id, get_user_by_username, update_user_last_login_at
+from langflow.services.auth.cache import hash_credential
+from langflow.services.database.models.api_key.crud import check_key, update_api_keys_usage
+from langflow.services.database.models.user.crud import get_user_by_id, get_user_by_username, update_users_last_login_at
 from langflow.services.database.models.user.model import User
-from langflow.services.deps import get_session, get_settings_service
+from langflow.services.deps import get_auth_service, get_session, get_settings_service, get_write_behind_service
+from langflow.services.write_behind.service import merge_counters
 
 oauth2_login = OAuth2PasswordBearer(tokenUrl="api/v1/login", auto_error=False)
 
@@ -29,7 +30,6 @@ async def api_key_security(
     db: Session = Depends(get_session),
 ) -> Optional[User]:
     settings_service = get_settings_service()
-    result: Optional[Union[ApiKey, User]] = None
     if settings_service.auth_settings.AUTO_LOGIN:
         # Get the first user
         if not settings_service.auth_settings.SUPERUSER:
@@ -38,7 +38,7 @@ async def api_key_security(
                 detail="Missing first superuser credentials",
             )
 
-        result = get_user_by_username(db, settings_service.auth_settings.SUPERUSER)
+        return get_auto_login_user(db, settings_service.auth_settings.SUPERUSER)
 
     elif not query_param and not header_param:
         raise HTTPException(
@@ -46,21 +46,55 @@ async def api_key_security(
             detail="An API key must be passed as query or header",
         )
 
-    elif query_param:
-        result = check_key(db, query_param)
-
-    else:
-        result = check_key(db, header_param)
-
-    if not result:
+    user = get_user_by_api_key(db, query_param or header_param)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid or missing API key",
         )
-    if isinstance(result, ApiKey):
-        return result.user
-    elif isinstance(result, User):
-        return result
+    return user
+
+
+def get_auto_login_user(db: Session, username: str) -> Optional[User]:
+    """Get the superuser used when AUTO_LOGIN is on, from the principal cache when possible."""
+    principal_cache = get_auth_service().principal_cache
+    cache_key = f"superuser:{username}"
+    if cached := principal_cache.get(cache_key, db):
+        return cached[0]
+    user = get_user_by_username(db, username)
+    if user is not None:
+        principal_cache.set(cache_key, user)
+    return user
+
+
+def get_user_by_api_key(db: Session, api_key: str) -> Optional[User]:
+    """
+    Get the user that owns an API key, from the principal cache when possible.
+
+    Each use of the key is counted in memory and written later in a batch.
+    """
+    auth_service = get_auth_service()
+    cache_key = f"api_key:{hash_credential(api_key)}"
+    if cached := auth_service.principal_cache.get(cache_key, db):
+        user, api_key_id = cached
+    else:
+        api_key_object = check_key(db, api_key)
+        if api_key_object is None:
+            return None
+        user, api_key_id = api_key_object.user, api_key_object.id
+        if user is not None:
+            auth_service.principal_cache.set(cache_key, user, api_key_id=api_key_id)
+    if api_key_id is not None:
+        get_write_behind_service().submit(
+            update_api_keys_usage, api_key_id, (1, datetime.now(timezone.utc)), merge=merge_counters
+        )
+    return user
+
+
+def record_last_login(user_id: Union[UUID, str]):
+    """Queue the update of the last login of a user."""
+    user_id = user_id if isinstance(user_id, UUID) else UUID(str(user_id))
+    get_write_behind_service().submit(update_users_last_login_at, user_id, datetime.now(timezone.utc))
 
 
 async def get_current_user(
@@ -105,6 +139,11 @@ async def get_current_user_by_jwt(
     if settings_service.auth_settings.SECRET_KEY is None:
         raise credentials_exception
 
+    principal_cache = get_auth_service().principal_cache
+    cache_key = f"jwt:{hash_credential(token)}"
+    if cached := principal_cache.get(cache_key, db):
+        return cached[0]
+
     try:
         payload = jwt.decode(
             token,
@@ -127,6 +166,8 @@ async def get_current_user_by_jwt(
     user = get_user_by_id(db, user_id)  # type: ignore
     if user is None or not user.is_active:
         raise credentials_exception
+    # The cached user must not outlive the token
+    principal_cache.set(cache_key, user, expires_at=expires)
     return user
 
 
@@ -209,7 +250,7 @@ def create_user_longterm_token(db: Session = Depends(get_session)) -> dict:
     )
 
     # Update: last_login_at
-    update_user_last_login_at(super_user.id, db)
+    record_last_login(super_user.id)
 
     return {
         "access_token": access_token,
@@ -252,7 +293,7 @@ def create_user_tokens(user_id: UUID, db: Session = Depends(get_session), update
 
     # Update: last_login_at
     if update_last_login:
-        update_user_last_login_at(user_id, db)
+        record_last_login(user_id)
 
     return {
         "access_token": access_token,
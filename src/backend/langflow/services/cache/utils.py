@@ -45,6 +45,10 @@ def clear_old_cache_files(max_cache_size: int = 3):
                 os.remove(cache_file)
 
 
+# Keys of a node that only matter to the UI
+NODE_UI_KEYS = ("position", "positionAbsolute", "selected", "dragging")
+
+
 def filter_json(json_data):
     filtered_data = json_data.copy()
 
@@ -54,17 +58,11 @@ def filter_json(json_data):
     if "chatHistory" in filtered_data:
         del filtered_data["chatHistory"]
 
-    # Filter nodes
+    # Filter nodes, copying them so the nodes of json_data keep their keys
     if "nodes" in filtered_data:
-        for node in filtered_data["nodes"]:
-            if "position" in node:
-                del node["position"]
-            if "positionAbsolute" in node:
-                del node["positionAbsolute"]
-            if "selected" in node:
-                del node["selected"]
-            if "dragging" in node:
-                del node["dragging"]
+        filtered_data["nodes"] = [
+            {key: value for key, value in node.items() if key not in NODE_UI_KEYS} for node in filtered_data["nodes"]
+        ]
 
     return filtered_data
 
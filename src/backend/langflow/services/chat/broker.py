@@ -0,0 +1,368 @@
+import abc
+import asyncio
+from collections import defaultdict, deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+
+import orjson
+from cachetools import TTLCache
+from loguru import logger
+
+
+class ChatBroker(abc.ABC):
+    """
+    Shares chat state between workers.
+
+    A broker holds three things that must be visible to every worker serving
+    the same flow: the build record (the graph data needed to rebuild a flow),
+    the chat history of each client and a pub/sub channel used to fan out
+    the messages streamed to a client.
+
+    Every method has an async counterpart used on the event loop. The default
+    ones call the sync methods, which is fine for brokers that don't do any I/O.
+    Remote brokers set is_remote and implement them with an async client.
+    """
+
+    name = "chat_broker"
+    # Whether the calls go over the network, so they must not block the event loop
+    is_remote = False
+
+    @abc.abstractmethod
+    def set_build(self, flow_id: str, build: Dict[str, Any]):
+        """
+        Store the build record of a flow.
+
+        Args:
+            flow_id: The flow identifier.
+            build: A JSON serializable dict with the graph data and the user id.
+        """
+
+    @abc.abstractmethod
+    def get_build(self, flow_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the build record of a flow.
+
+        Returns:
+            The build record or None if the flow was never built.
+        """
+
+    @abc.abstractmethod
+    def delete_build(self, flow_id: str):
+        """Remove the build record of a flow."""
+
+    @abc.abstractmethod
+    def add_message(self, client_id: str, message: Dict[str, Any]):
+        """
+        Append a serialized message to the history of a client.
+
+        When the history holds more than max_messages, the oldest messages are dropped.
+        """
+
+    @abc.abstractmethod
+    def get_messages(self, client_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Return a page of the serialized history of a client, oldest first.
+
+        Args:
+            client_id: The client identifier.
+            offset: Number of most recent messages to skip.
+            limit: Maximum number of messages to return. None returns every remaining message.
+        """
+
+    @abc.abstractmethod
+    def count_messages(self, client_id: str) -> int:
+        """Return the number of messages in the history of a client."""
+
+    @abc.abstractmethod
+    def clear_messages(self, client_id: str):
+        """Remove the history of a client."""
+
+    async def set_build_async(self, flow_id: str, build: Dict[str, Any]):
+        self.set_build(flow_id, build)
+
+    async def get_build_async(self, flow_id: str) -> Optional[Dict[str, Any]]:
+        return self.get_build(flow_id)
+
+    async def delete_build_async(self, flow_id: str):
+        self.delete_build(flow_id)
+
+    async def add_message_async(self, client_id: str, message: Dict[str, Any]):
+        self.add_message(client_id, message)
+
+    async def get_messages_async(
+        self, client_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        return self.get_messages(client_id, offset=offset, limit=limit)
+
+    async def clear_messages_async(self, client_id: str):
+        self.clear_messages(client_id)
+
+    @abc.abstractmethod
+    async def publish(self, channel: str, message: Dict[str, Any]):
+        """Publish a message to every subscriber of a channel."""
+
+    @abc.abstractmethod
+    def subscribe(self, channel: str) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over the messages published to a channel."""
+
+    async def has_remote_subscribers(self, channel: str) -> bool:
+        """
+        Check if a process other than this one subscribed to a channel.
+
+        Messages are only worth publishing for them, the subscribers of this
+        process get them from the websocket they were produced for.
+        """
+        return False
+
+    def teardown(self):
+        pass
+
+
+class InMemoryChatBroker(ChatBroker):
+    """
+    A broker that keeps everything in the current process.
+
+    This is the default and only makes sense when running a single worker.
+    """
+
+    def __init__(self, max_messages: Optional[int] = None):
+        self.max_messages = max_messages
+        self._builds: Dict[str, Dict[str, Any]] = {}
+        self._messages: Dict[str, Deque[Dict[str, Any]]] = defaultdict(lambda: deque(maxlen=self.max_messages))
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    def set_build(self, flow_id: str, build: Dict[str, Any]):
+        self._builds[flow_id] = build
+
+    def get_build(self, flow_id: str) -> Optional[Dict[str, Any]]:
+        return self._builds.get(flow_id)
+
+    def delete_build(self, flow_id: str):
+        self._builds.pop(flow_id, None)
+
+    def add_message(self, client_id: str, message: Dict[str, Any]):
+        self._messages[client_id].append(message)
+
+    def get_messages(self, client_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        messages = list(self._messages.get(client_id, []))
+        end = len(messages) - offset
+        if end <= 0:
+            return []
+        start = 0 if limit is None else max(end - limit, 0)
+        return messages[start:end]
+
+    def count_messages(self, client_id: str) -> int:
+        return len(self._messages.get(client_id, []))
+
+    def clear_messages(self, client_id: str):
+        self._messages.pop(client_id, None)
+
+    async def publish(self, channel: str, message: Dict[str, Any]):
+        for queue in self._subscribers.get(channel, set()):
+            queue.put_nowait(message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[Dict[str, Any]]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers[channel].add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers[channel].discard(queue)
+            if not self._subscribers[channel]:
+                self._subscribers.pop(channel, None)
+
+    def __repr__(self):
+        return f"InMemoryChatBroker(max_messages={self.max_messages})"
+
+
+class RedisChatBroker(ChatBroker):
+    """
+    A broker backed by Redis, shared by every worker connected to the same database.
+
+    Build records are stored as JSON strings, histories as Redis lists and
+    streamed messages go through Redis pub/sub.
+
+    Example:
+
+        broker = RedisChatBroker(url="redis://localhost:6379/0")
+        broker.set_build("flow_id", {"graph_data": {...}, "user_id": None})
+    """
+
+    is_remote = True
+
+    def __init__(
+        self,
+        host="localhost",
+        port=6379,
+        db=0,
+        url=None,
+        expiration_time=60 * 60,
+        prefix="langflow:chat",
+        max_messages=None,
+        client=None,
+        async_client=None,
+        subscribers_ttl=1.0,
+    ):
+        """
+        Initialize a new RedisChatBroker instance.
+
+        Args:
+            host (str, optional): Redis host.
+            port (int, optional): Redis port.
+            db (int, optional): Redis DB.
+            url (str, optional): Redis URL. Takes precedence over host, port and db.
+            expiration_time (int, optional): Time in seconds after which build records
+            and histories expire. Default is 1 hour.
+            prefix (str, optional): Prefix of every key and channel.
+            max_messages (int, optional): Maximum number of messages kept per history.
+            client (optional): A sync Redis client. Mostly useful for tests.
+            async_client (optional): An asyncio Redis client. Mostly useful for tests.
+            subscribers_ttl (float, optional): Seconds the number of subscribers of a channel
+            is cached. A worker that subscribes misses the messages published in that time.
+        """
+        if client is None or async_client is None:
+            try:
+                import redis
+                import redis.asyncio as aioredis
+            except ImportError as exc:
+                raise ImportError(
+                    "RedisChatBroker requires the redis-py package."
+                    " Please install Langflow with the deploy extra: pip install langflow[deploy]"
+                ) from exc
+            if url:
+                client = client or redis.StrictRedis.from_url(url)
+                async_client = async_client or aioredis.StrictRedis.from_url(url)
+            else:
+                client = client or redis.StrictRedis(host=host, port=port, db=db)
+                async_client = async_client or aioredis.StrictRedis(host=host, port=port, db=db)
+        self._client = client
+        self._async_client = async_client
+        self.expiration_time = expiration_time
+        self.prefix = prefix
+        self.max_messages = max_messages
+        # Subscriptions of this process, by channel
+        self._local_subscribers: Dict[str, int] = defaultdict(int)
+        # Whether other processes subscribed to a channel, checked at most every subscribers_ttl seconds
+        self._remote_subscribers: TTLCache = TTLCache(maxsize=1024, ttl=subscribers_ttl)
+
+    def is_connected(self):
+        """
+        Check if the Redis client is connected.
+        """
+        try:
+            self._client.ping()
+            return True
+        except Exception:
+            return False
+
+    def _key(self, kind: str, name: str) -> str:
+        return f"{self.prefix}:{kind}:{name}"
+
+    def set_build(self, flow_id: str, build: Dict[str, Any]):
+        self._client.setex(self._key("build", flow_id), self.expiration_time, orjson.dumps(build, default=str))
+
+    def get_build(self, flow_id: str) -> Optional[Dict[str, Any]]:
+        value = self._client.get(self._key("build", flow_id))
+        return orjson.loads(value) if value else None
+
+    def delete_build(self, flow_id: str):
+        self._client.delete(self._key("build", flow_id))
+
+    def add_message(self, client_id: str, message: Dict[str, Any]):
+        key = self._key("history", client_id)
+        pipeline = self._client.pipeline()
+        pipeline.rpush(key, orjson.dumps(message, default=str))
+        if self.max_messages:
+            pipeline.ltrim(key, -self.max_messages, -1)
+        pipeline.expire(key, self.expiration_time)
+        pipeline.execute()
+
+    def get_messages(self, client_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        # Negative indexes count from the most recent message
+        end = -1 - offset
+        start = 0 if limit is None else -(offset + limit)
+        if limit is not None and limit <= 0:
+            return []
+        values = self._client.lrange(self._key("history", client_id), start, end)
+        return [orjson.loads(value) for value in values]
+
+    def count_messages(self, client_id: str) -> int:
+        return self._client.llen(self._key("history", client_id))
+
+    def clear_messages(self, client_id: str):
+        self._client.delete(self._key("history", client_id))
+
+    async def set_build_async(self, flow_id: str, build: Dict[str, Any]):
+        await self._async_client.setex(
+            self._key("build", flow_id), self.expiration_time, orjson.dumps(build, default=str)
+        )
+
+    async def get_build_async(self, flow_id: str) -> Optional[Dict[str, Any]]:
+        value = await self._async_client.get(self._key("build", flow_id))
+        return orjson.loads(value) if value else None
+
+    async def delete_build_async(self, flow_id: str):
+        await self._async_client.delete(self._key("build", flow_id))
+
+    async def add_message_async(self, client_id: str, message: Dict[str, Any]):
+        key = self._key("history", client_id)
+        pipeline = self._async_client.pipeline()
+        pipeline.rpush(key, orjson.dumps(message, default=str))
+        if self.max_messages:
+            pipeline.ltrim(key, -self.max_messages, -1)
+        pipeline.expire(key, self.expiration_time)
+        await pipeline.execute()
+
+    async def get_messages_async(
+        self, client_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        if limit is not None and limit <= 0:
+            return []
+        end = -1 - offset
+        start = 0 if limit is None else -(offset + limit)
+        values = await self._async_client.lrange(self._key("history", client_id), start, end)
+        return [orjson.loads(value) for value in values]
+
+    async def clear_messages_async(self, client_id: str):
+        await self._async_client.delete(self._key("history", client_id))
+
+    async def publish(self, channel: str, message: Dict[str, Any]):
+        await self._async_client.publish(self._key("channel", channel), orjson.dumps(message, default=str))
+
+    async def has_remote_subscribers(self, channel: str) -> bool:
+        if (remote := self._remote_subscribers.get(channel)) is None:
+            subscribers = await self._async_client.pubsub_numsub(self._key("channel", channel))
+            count = subscribers[0][1] if subscribers else 0
+            remote = self._remote_subscribers[channel] = count > self._local_subscribers.get(channel, 0)
+        return remote
+
+    async def subscribe(self, channel: str) -> AsyncIterator[Dict[str, Any]]:
+        pubsub = self._async_client.pubsub()
+        await pubsub.subscribe(self._key("channel", channel))
+        self._local_subscribers[channel] += 1
+        try:
+            async for message in pubsub.listen():
+                if message is None or message.get("type") != "message":
+                    continue
+                try:
+                    yield orjson.loads(message["data"])
+                except orjson.JSONDecodeError as exc:
+                    logger.error(f"Invalid message in channel {channel}: {exc}")
+        finally:
+            self._local_subscribers[channel] -= 1
+            if self._local_subscribers[channel] <= 0:
+                del self._local_subscribers[channel]
+            await pubsub.unsubscribe(self._key("channel", channel))
+            await pubsub.close()
+
+    def teardown(self):
+        try:
+            self._client.close()
+        except Exception as exc:
+            logger.debug(f"Error closing Redis client: {exc}")
+
+    def __repr__(self):
+        return (
+            f"RedisChatBroker(prefix={self.prefix}, expiration_time={self.expiration_time},"
+            f" max_messages={self.max_messages})"
+        )
@@ -1,11 +1,39 @@
+from typing import TYPE_CHECKING
+
+from langflow.services.chat.broker import ChatBroker, InMemoryChatBroker, RedisChatBroker
 from langflow.services.chat.service import ChatService
 from langflow.services.factory import ServiceFactory
+from langflow.utils.logger import logger
+
+if TYPE_CHECKING:
+    from langflow.services.settings.service import SettingsService
 
 
 class ChatServiceFactory(ServiceFactory):
     def __init__(self):
         super().__init__(ChatService)
 
-    def create(self):
+    def create(self, settings_service: "SettingsService"):
         # Here you would have logic to create and configure a ChatService
-        return ChatService()
+        return ChatService(
+            broker=self.create_broker(settings_service),
+            max_history_messages=settings_service.settings.CHAT_HISTORY_MAX_MESSAGES,
+            persist_history=settings_service.settings.CHAT_HISTORY_PERSIST,
+        )
+
+    def create_broker(self, settings_service: "SettingsService") -> ChatBroker:
+        if settings_service.settings.CHAT_BROKER_TYPE == "redis":
+            logger.debug("Creating Redis chat broker")
+            redis_broker = RedisChatBroker(
+                host=settings_service.settings.REDIS_HOST,
+                port=settings_service.settings.REDIS_PORT,
+                db=settings_service.settings.REDIS_DB,
+                url=settings_service.settings.REDIS_URL,
+                expiration_time=settings_service.settings.REDIS_CACHE_EXPIRE,
+                max_messages=settings_service.settings.CHAT_HISTORY_MAX_MESSAGES,
+            )
+            if redis_broker.is_connected():
+                logger.debug("Redis chat broker is connected")
+                return redis_broker
+            logger.warning("Redis chat broker is not connected, falling back to in-memory broker")
+        return InMemoryChatBroker(max_messages=settings_service.settings.CHAT_HISTORY_MAX_MESSAGES)
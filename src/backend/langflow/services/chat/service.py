@@ -1,7 +1,8 @@
 import asyncio
 import uuid
-from collections import defaultdict
-from typing import Any, Dict, List
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
 
 import orjson
 from fastapi import WebSocket, status
@@ -9,49 +10,204 @@ from loguru import logger
 from starlette.websockets import WebSocketState
 
 from langflow.api.v1.schemas import ChatMessage, ChatResponse, FileResponse
+from langflow.interface.run import build_sorted_vertices
 from langflow.interface.utils import pil_to_base64
 from langflow.services import ServiceType, service_manager
 from langflow.services.base import Service
+from langflow.services.chat.broker import ChatBroker, InMemoryChatBroker
 from langflow.services.chat.cache import Subject
-from langflow.services.chat.utils import process_graph
+from langflow.services.chat.utils import get_remote_build_result, message_from_dict, process_graph
+from langflow.services.database.models.chat_record.crud import count_chat_records, get_chat_records, write_chat_records
+from langflow.services.database.utils import session_getter
+from langflow.services.deps import get_db_service, get_task_service, get_write_behind_service
+from langflow.services.task.scheduler import INTERACTIVE
+from langflow.services.write_behind.service import merge_lists
 
 from .cache import cache_service
 
+# Messages that only make sense while a response is being generated
+TRANSIENT_MESSAGE_TYPES = ["start", "stream"]
+# Seconds a read of the persisted history waits for the pending writes
+PERSIST_FLUSH_TIMEOUT = 5
+
 
 class ChatHistory(Subject):
-    def __init__(self):
+    """
+    Keeps the chat history of each client.
+
+    Every history is capped to max_messages, token stream messages are collapsed
+    into a single pending message until the final message arrives, and the
+    messages can optionally be persisted to the database.
+    """
+
+    def __init__(
+        self,
+        broker: Optional[ChatBroker] = None,
+        max_messages: Optional[int] = None,
+        persist: bool = False,
+    ):
         super().__init__()
-        self.history: Dict[str, List[ChatMessage]] = defaultdict(list)
+        self.broker = broker or InMemoryChatBroker(max_messages=max_messages)
+        self.max_messages = max_messages
+        self.persist = persist
+        self.history: Dict[str, Deque[ChatMessage]] = defaultdict(lambda: deque(maxlen=self.max_messages))
+        # The tokens streamed so far for each client, collapsed into one message
+        self.streams: Dict[str, ChatResponse] = {}
+        # The last pending write to a remote broker for each client
+        self._writes: Dict[str, asyncio.Task] = {}
 
     def add_message(self, client_id: str, message: ChatMessage):
         """Add a message to the chat history."""
-
+        if message.type == "stream":
+            self._collapse_stream(client_id, message)
+            return
+        # The final message holds the whole streamed response
+        self.streams.pop(client_id, None)
+
+        if isinstance(message, FileResponse):
+            encode_file_data(message)
         self.history[client_id].append(message)
+        # The broker keeps the history that is sent to clients when they connect,
+        # which may happen on a different worker than the one that produced it
+        if message.type not in TRANSIENT_MESSAGE_TYPES:
+            message_dict = message.model_dump()
+            self._write(client_id, self.broker.add_message, self.broker.add_message_async, message_dict)
+            if self.persist:
+                self._persist(client_id, message_dict)
 
         if not isinstance(message, FileResponse):
             self.notify()
 
-    def get_history(self, client_id: str, filter_messages=True) -> List[ChatMessage]:
-        """Get the chat history for a client."""
-        if history := self.history.get(client_id, []):
-            if filter_messages:
-                return [msg for msg in history if msg.type not in ["start", "stream"]]
-            return history
+    def _collapse_stream(self, client_id: str, message: ChatMessage):
+        if (pending := self.streams.get(client_id)) is None:
+            self.streams[client_id] = message.model_copy()
+            return
+        if isinstance(message.message, str):
+            pending.message = f"{pending.message or ''}{message.message}"
+        intermediate_steps = getattr(message, "intermediate_steps", "")
+        if intermediate_steps and isinstance(pending, ChatResponse):
+            pending.intermediate_steps = f"{pending.intermediate_steps}\n{intermediate_steps}".strip()
+
+    def _write(self, client_id: str, write: Callable[..., None], write_async: Callable[..., Awaitable], *args):
+        """
+        Write to the broker without blocking the event loop.
+
+        On the event loop, the writes to a remote broker run in tasks chained
+        for each client, so they are applied in the order they were made.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None or not self.broker.is_remote:
+            write(client_id, *args)
+            return
+
+        previous = self._writes.get(client_id)
+        if previous is not None and previous.get_loop() is not loop:
+            previous = None
+
+        async def run():
+            if previous is not None:
+                await asyncio.wait([previous])
+            try:
+                await write_async(client_id, *args)
+            except Exception as exc:
+                logger.error(f"Error writing the chat history of {client_id}: {exc}")
+
+        task = self._writes[client_id] = loop.create_task(run())
+        task.add_done_callback(lambda done: self._writes.get(client_id) is done and self._writes.pop(client_id))
+
+    async def wait_for_writes(self, client_id: str):
+        """Wait until the pending writes of a client reach the broker."""
+        task = self._writes.get(client_id)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            await asyncio.wait([task])
+
+    def _persist(self, client_id: str, message: Optional[Dict[str, Any]]):
+        # The records are written in the background, a None message clears the history
+        get_write_behind_service().submit(
+            write_chat_records, client_id, [(message, datetime.utcnow())], merge=merge_lists
+        )
+
+    def _wait_for_persisted(self):
+        # Reads see the messages this worker persisted
+        get_write_behind_service().flush(timeout=PERSIST_FLUSH_TIMEOUT)
+
+    def get_history(
+        self,
+        client_id: str,
+        filter_messages=True,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[ChatMessage]:
+        """
+        Get the chat history for a client.
+
+        Args:
+            client_id: The client identifier.
+            filter_messages: If True, return the shared history without transient messages.
+            If False, return every message this worker holds for the client.
+            offset: Number of most recent messages to skip.
+            limit: Maximum number of messages to return.
+        """
+        if not filter_messages:
+            return list(self.history.get(client_id, []))
+        if self.persist:
+            self._wait_for_persisted()
+            with session_getter(get_db_service()) as session:
+                messages = get_chat_records(session, client_id, offset=offset, limit=limit)
         else:
-            return []
+            messages = self.broker.get_messages(client_id, offset=offset, limit=limit)
+        return [message_from_dict(message) for message in messages]
+
+    async def get_history_async(
+        self, client_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> List[ChatMessage]:
+        """Get the shared chat history of a client without blocking the event loop."""
+        if self.persist:
+            return await asyncio.to_thread(self.get_history, client_id, offset=offset, limit=limit)
+        await self.wait_for_writes(client_id)
+        messages = await self.broker.get_messages_async(client_id, offset=offset, limit=limit)
+        return [message_from_dict(message) for message in messages]
+
+    def count_messages(self, client_id: str) -> int:
+        """Count the messages in the history of a client."""
+        if self.persist:
+            self._wait_for_persisted()
+            with session_getter(get_db_service()) as session:
+                return count_chat_records(session, client_id)
+        return self.broker.count_messages(client_id)
+
+    def release(self, client_id: str):
+        """Drop what this worker holds for a client. The shared history is kept."""
+        self.history.pop(client_id, None)
+        self.streams.pop(client_id, None)
 
     def empty_history(self, client_id: str):
         """Empty the chat history for a client."""
-        self.history[client_id] = []
+        self.history.pop(client_id, None)
+        self.streams.pop(client_id, None)
+        self._write(client_id, self.broker.clear_messages, self.broker.clear_messages_async)
+        if self.persist:
+            self._persist(client_id, None)
 
 
 class ChatService(Service):
     name = "chat_service"
 
-    def __init__(self):
+    def __init__(
+        self,
+        broker: Optional[ChatBroker] = None,
+        max_history_messages: Optional[int] = None,
+        persist_history: bool = False,
+    ):
         self.active_connections: Dict[str, WebSocket] = {}
         self.connection_ids: Dict[str, str] = {}
-        self.chat_history = ChatHistory()
+        self.broker = broker or InMemoryChatBroker(max_messages=max_history_messages)
+        # Used to skip the messages this worker published itself
+        self.worker_id = uuid.uuid4().hex
+        self.chat_history = ChatHistory(self.broker, max_messages=max_history_messages, persist=persist_history)
         self.chat_cache = cache_service
         self.chat_cache.attach(self.update)
         self.cache_service = service_manager.get(ServiceType.CACHE_SERVICE)
@@ -98,6 +254,7 @@ class ChatService(Service):
     def disconnect(self, client_id: str):
         self.active_connections.pop(client_id, None)
         self.connection_ids.pop(client_id, None)
+        self.chat_history.release(client_id)
 
     async def send_message(self, client_id: str, message: str):
         websocket = self.active_connections[client_id]
@@ -105,7 +262,23 @@ class ChatService(Service):
 
     async def send_json(self, client_id: str, message: ChatMessage):
         websocket = self.active_connections[client_id]
-        await websocket.send_json(message.model_dump())
+        message_dict = message.model_dump()
+        await websocket.send_json(message_dict)
+        # Other workers may be serving the same client
+        if await self.broker.has_remote_subscribers(client_id):
+            await self.broker.publish(client_id, {"origin": self.worker_id, "message": message_dict})
+
+    async def forward_broker_messages(self, client_id: str, websocket: WebSocket):
+        """Send to the websocket the messages other workers streamed to this client."""
+        try:
+            async for message in self.broker.subscribe(client_id):
+                if message.get("origin") == self.worker_id:
+                    continue
+                await websocket.send_json(message["message"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error(f"Error forwarding broker messages: {exc}")
 
     async def close_connection(self, client_id: str, code: int, reason: str):
         if websocket := self.active_connections[client_id]:
@@ -154,11 +327,7 @@ class ChatService(Service):
             # Iterate backwards through the history
             for msg in reversed(history):
                 if isinstance(msg, FileResponse):
-                    if msg.data_type == "image":
-                        # Base64 encode the image
-                        if isinstance(msg.data, str):
-                            continue
-                        msg.data = pil_to_base64(msg.data)
+                    # Images were encoded when they were added to the history
                     file_responses.append(msg)
                 if msg.type == "start":
                     break
@@ -186,11 +355,59 @@ class ChatService(Service):
         self.cache_service.upsert(client_id, result_dict)
         return client_id in self.cache_service
 
-    async def handle_websocket(self, client_id: str, websocket: WebSocket):
+    async def set_build(
+        self,
+        flow_id: str,
+        graph_data: dict,
+        user_id: Optional[Any] = None,
+        remote: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Share the data needed to rebuild a flow with the other workers.
+
+        remote describes the Celery worker that holds the flow if it was built
+        by the distributed build.
+        """
+        await self.broker.set_build_async(
+            flow_id,
+            {"graph_data": graph_data, "user_id": str(user_id) if user_id is not None else None, "remote": remote},
+        )
+
+    async def has_build_result(self, client_id: str) -> bool:
+        """
+        Check if this worker or any other worker built the flow.
+        """
+        return client_id in self.cache_service or await self.broker.get_build_async(client_id) is not None
+
+    async def get_build_result(self, client_id: str) -> Any:
+        """
+        Get the built object of a flow, rebuilding it from the shared build record
+        if it was built by another worker. Flows built by a Celery worker are not
+        rebuilt, their messages are sent to that worker.
+        """
+        cached = self.cache_service.get(client_id)
+        if isinstance(cached, dict) and cached.get("result") is not None:
+            return cached["result"]
+
+        build = await self.broker.get_build_async(client_id)
+        if not build or not build.get("graph_data"):
+            return None
+        if (remote_build := get_remote_build_result(build)) is not None:
+            self.set_cache(client_id, remote_build)
+            return remote_build
+        logger.debug(f"Rebuilding flow {client_id} from the shared build record")
+        graph, _ = await build_sorted_vertices(build["graph_data"], user_id=build.get("user_id"))
+        langchain_object = await graph.build()
+        self.set_cache(client_id, langchain_object)
+        return langchain_object
+
+    async def handle_websocket(self, client_id: str, websocket: WebSocket, owner: Optional[str] = None):
+        """Answer the messages of a chat. Each message is scheduled for owner like a sync /process call."""
         await self.connect(client_id, websocket)
+        listener = asyncio.create_task(self.forward_broker_messages(client_id, websocket))
 
         try:
-            chat_history = self.chat_history.get_history(client_id)
+            chat_history = await self.chat_history.get_history_async(client_id)
             # iterate and make BaseModel into dict
             chat_history = [chat.model_dump() for chat in chat_history]
             await websocket.send_json(chat_history)
@@ -202,12 +419,13 @@ class ChatService(Service):
                 elif isinstance(json_payload, dict):
                     payload = json_payload
                 if "clear_history" in payload and payload["clear_history"]:
-                    self.chat_history.history[client_id] = []
+                    self.chat_history.empty_history(client_id)
                     continue
 
                 with self.chat_cache.set_client_id(client_id):
-                    if build_result := self.cache_service.get(client_id).get("result"):
-                        await self.process_message(client_id, payload, build_result)
+                    if build_result := await self.get_build_result(client_id):
+                        async with get_task_service().scheduler.slot(owner, INTERACTIVE):
+                            await self.process_message(client_id, payload, build_result)
 
                     else:
                         raise RuntimeError(f"Could not find a build result for client_id {client_id}")
@@ -224,6 +442,7 @@ class ChatService(Service):
                 self.disconnect(client_id)
 
         finally:
+            listener.cancel()
             try:
                 # first check if the connection is still open
                 if websocket.client_state == WebSocketState.CONNECTED:
@@ -236,6 +455,15 @@ class ChatService(Service):
                 logger.error(f"Error closing connection: {exc}")
             self.disconnect(client_id)
 
+    def teardown(self):
+        self.broker.teardown()
+
+
+def encode_file_data(message: FileResponse):
+    """Encode the image of a file response in base64, so the message can be serialized."""
+    if message.data_type == "image" and message.data is not None and not isinstance(message.data, str):
+        message.data = pil_to_base64(message.data)
+
 
 def dict_to_markdown_table(my_dict):
     markdown_table = "| Key | Value |\n|---|---|\n"
@@ -1,13 +1,15 @@
-from typing import Any
+from typing import Any, Dict, Optional
 
 from langchain.agents import AgentExecutor
 from langchain.chains.base import Chain
 from langchain_core.runnables import Runnable
 from loguru import logger
 
-from langflow.api.v1.schemas import ChatMessage
+from langflow.api.v1.schemas import ChatMessage, ChatResponse, FileResponse, PromptResponse
 from langflow.interface.utils import try_setting_streaming_options
 from langflow.processing.base import get_result_and_steps
+from langflow.services.deps import get_settings_service, get_task_service
+from langflow.services.task.distributed import RemoteBuildResult
 from langflow.utils.chat import ChatDefinition
 
 LANGCHAIN_RUNNABLES = (Chain, Runnable, AgentExecutor)
@@ -18,7 +20,11 @@ async def process_graph(
     chat_inputs: ChatMessage,
     client_id: str,
     session_id: str,
+    stream: bool = True,
 ):
+    if isinstance(build_result, RemoteBuildResult):
+        # The object lives in the Celery worker that built it
+        return await build_result.process(chat_inputs, client_id=client_id, session_id=session_id)
     build_result = try_setting_streaming_options(build_result)
     logger.debug("Loaded langchain object")
 
@@ -39,6 +45,7 @@ async def process_graph(
                 chat_inputs.message,
                 client_id=client_id,
                 session_id=session_id,
+                stream=stream,
             )
         elif isinstance(build_result, ChatDefinition):
             raw_output = await run_build_result(
@@ -66,3 +73,34 @@ async def process_graph(
 
 async def run_build_result(build_result: Any, chat_inputs: ChatMessage, client_id: str, session_id: str):
     return build_result(inputs=chat_inputs.message)
+
+
+def get_remote_build_result(build: Dict[str, Any]) -> Optional[RemoteBuildResult]:
+    """Return a handle to the Celery worker that built the flow, if it was built by the distributed build."""
+    remote = build.get("remote")
+    settings = get_settings_service().settings
+    if not remote or not settings.DISTRIBUTED_BUILD or not get_task_service().use_celery:
+        return None
+    from langflow.worker import process_built_graph
+
+    return RemoteBuildResult(
+        process_built_graph,
+        build["graph_data"],
+        remote["flow_hash"],
+        remote["build_id"],
+        worker=remote.get("worker"),
+        user_id=build.get("user_id"),
+        timeout=settings.DISTRIBUTED_BUILD_TIMEOUT,
+    )
+
+
+def message_from_dict(message: Dict[str, Any]) -> ChatMessage:
+    """Rebuild a chat message from its serialized form."""
+    message_type = message.get("type")
+    if message_type == "human":
+        return ChatMessage(**message)
+    elif message_type == "prompt":
+        return PromptResponse(**message)
+    elif message_type == "file":
+        return FileResponse(**message)
+    return ChatResponse(**message)
@@ -1,6 +1,7 @@
 from .api_key import ApiKey
+from .chat_record import ChatRecord
 from .credential import Credential
 from .flow import Flow
 from .user import User
 
-__all__ = ["Flow", "User", "ApiKey", "Credential"]
+__all__ = ["Flow", "User", "ApiKey", "Credential", "ChatRecord"]
@@ -1,9 +1,9 @@
 import datetime
 import secrets
-import threading
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
+from sqlalchemy import bindparam, update
 from sqlmodel import Session, select
 from sqlmodel.sql.expression import SelectOfScalar
 
@@ -45,29 +45,18 @@ def delete_api_key(session: Session, api_key_id: UUID) -> None:
 def check_key(session: Session, api_key: str) -> Optional[ApiKey]:
     """Check if the API key is valid."""
     query: SelectOfScalar = select(ApiKey).where(ApiKey.api_key == api_key)
-    api_key_object: Optional[ApiKey] = session.exec(query).first()
-    if api_key_object is not None:
-        threading.Thread(
-            target=update_total_uses,
-            args=(
-                session,
-                api_key_object,
-            ),
-        ).start()
-    return api_key_object
+    return session.exec(query).first()
 
 
-def update_total_uses(session, api_key: ApiKey):
-    """Update the total uses and last used at."""
-    # This is running in a separate thread to avoid slowing down the request
-    # but session is not thread safe so we need to create a new session
-
-    with Session(session.get_bind()) as new_session:
-        new_api_key = new_session.get(ApiKey, api_key.id)
-        if new_api_key is None:
-            raise ValueError("API Key not found")
-        new_api_key.total_uses += 1
-        new_api_key.last_used_at = datetime.datetime.now(datetime.timezone.utc)
-        new_session.add(new_api_key)
-        new_session.commit()
-    return new_api_key
+def update_api_keys_usage(session: Session, usage: Dict[UUID, Tuple[int, datetime.datetime]]):
+    """Add the uses of several API keys and set when they were last used. Does not commit."""
+    table = ApiKey.__table__  # type: ignore
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("key_id"))
+        .values(total_uses=table.c.total_uses + bindparam("uses"), last_used_at=bindparam("used_at"))
+    )
+    session.execute(
+        statement,
+        [{"key_id": api_key_id, "uses": uses, "used_at": used_at} for api_key_id, (uses, used_at) in usage.items()],
+    )
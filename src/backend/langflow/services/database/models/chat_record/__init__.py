@@ -0,0 +1,3 @@
+from .model import ChatRecord, ChatRecordCreate
+
+__all__ = ["ChatRecord", "ChatRecordCreate"]
@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlmodel import Session, col, delete, func, select
+
+from langflow.services.database.models.chat_record.model import ChatRecord
+
+
+def write_chat_records(session: Session, changes: Dict[str, List[Tuple[Optional[Dict[str, Any]], datetime]]]):
+    """
+    Apply the pending changes to the histories of several clients, in order. Does not commit.
+
+    Each change is a message and the time it was added. A None message clears the history.
+    """
+    for client_id, client_changes in changes.items():
+        for message, created_at in client_changes:
+            if message is None:
+                session.exec(delete(ChatRecord).where(ChatRecord.client_id == client_id))  # type: ignore
+                continue
+            session.add(
+                ChatRecord(
+                    client_id=client_id,
+                    type=message.get("type", "human"),
+                    is_bot=message.get("is_bot", False),
+                    data=message,
+                    created_at=created_at,
+                )
+            )
+
+
+def get_chat_records(
+    session: Session, client_id: str, offset: int = 0, limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Get a page of the messages of a client, oldest first, skipping the `offset` most recent ones."""
+    query = (
+        select(ChatRecord)
+        .where(ChatRecord.client_id == client_id)
+        .order_by(col(ChatRecord.created_at).desc())
+        .offset(offset)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    records = session.exec(query).all()
+    return [record.data for record in reversed(records)]
+
+
+def count_chat_records(session: Session, client_id: str) -> int:
+    query = select(func.count()).select_from(ChatRecord).where(ChatRecord.client_id == client_id)
+    return session.exec(query).one()
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import UUID, uuid4
+
+from sqlmodel import JSON, Column, Field, SQLModel
+
+
+class ChatRecordBase(SQLModel):
+    client_id: str = Field(index=True, description="Client (usually the flow id) the message belongs to")
+    type: str = Field(description="Type of the message (e.g human, end, prompt)")
+    is_bot: bool = Field(default=False)
+    data: Dict = Field(default_factory=dict, sa_column=Column(JSON), description="Serialized message")
+
+
+class ChatRecord(ChatRecordBase, table=True):
+    id: Optional[UUID] = Field(default_factory=uuid4, primary_key=True, description="Unique ID for the message")
+    created_at: datetime = Field(default_factory=datetime.utcnow, description="Creation time of the message")
+
+
+class ChatRecordCreate(ChatRecordBase):
+    pass
@@ -1,3 +1,3 @@
-from .model import Flow, FlowCreate, FlowRead, FlowUpdate
+from .model import Flow, FlowCreate, FlowRead, FlowSummary, FlowUpdate
 
-__all__ = ["Flow", "FlowCreate", "FlowRead", "FlowUpdate"]
+__all__ = ["Flow", "FlowCreate", "FlowRead", "FlowSummary", "FlowUpdate"]
@@ -18,6 +18,8 @@ class FlowBase(SQLModel):
     is_component: Optional[bool] = Field(default=False, nullable=True)
     updated_at: Optional[datetime] = Field(default_factory=datetime.utcnow, nullable=True)
     folder: Optional[str] = Field(default=None, nullable=True)
+    # Whether /process results of this flow may be served from the result cache
+    cache_results: Optional[bool] = Field(default=True, nullable=True)
 
     @field_validator("data")
     def validate_json(v):
@@ -54,6 +56,10 @@ class FlowBase(SQLModel):
 class Flow(FlowBase, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True, unique=True)
     data: Optional[Dict] = Field(default=None, sa_column=Column(JSON))
+    # Computed from data when the flow is written, so listings don't load it
+    node_count: Optional[int] = Field(default=None, nullable=True)
+    # Content hash of data (see compute_dict_hash), so cache keys don't rehash the graph
+    data_hash: Optional[str] = Field(default=None, nullable=True)
     user_id: UUID = Field(index=True, foreign_key="user.id", nullable=True)
     user: "User" = Relationship(back_populates="flows")
 
@@ -65,9 +71,30 @@ class FlowCreate(FlowBase):
 class FlowRead(FlowBase):
     id: UUID
     user_id: UUID = Field()
+    node_count: Optional[int] = None
+
+
+class FlowSummary(SQLModel):
+    """A flow without its data, as listed by /flows/summary/."""
+
+    id: UUID
+    name: str
+    description: Optional[str] = None
+    is_component: Optional[bool] = None
+    updated_at: Optional[datetime] = None
+    folder: Optional[str] = None
+    node_count: Optional[int] = None
+    user_id: Optional[UUID] = None
+
+    @field_serializer("updated_at")
+    def serialize_dt(self, dt: datetime, _info):
+        if dt is None:
+            return None
+        return dt.isoformat()
 
 
 class FlowUpdate(SQLModel):
     name: Optional[str] = None
     description: Optional[str] = None
     data: Optional[Dict] = None
+    cache_results: Optional[bool] = None
@@ -1,10 +1,11 @@
 from datetime import datetime, timezone
-from typing import Optional, Union
+from typing import Dict, Optional, Union
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 from langflow.services.database.models.user.model import User, UserUpdate
-from langflow.services.deps import get_session
+from langflow.services.deps import get_auth_service, get_session
+from sqlalchemy import bindparam, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm.attributes import flag_modified
 from sqlmodel import Session, select
@@ -45,13 +46,16 @@ def update_user(user_db: Optional[User], user: UserUpdate, db: Session = Depends
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e)) from e
 
+    # Cached principals must see changes like a deactivation
+    get_auth_service().principal_cache.invalidate_user(user_db.id)
     return user_db
 
 
-def update_user_last_login_at(user_id: UUID, db: Session = Depends(get_session)):
-    try:
-        user_data = UserUpdate(last_login_at=datetime.now(timezone.utc))  # type: ignore
-        user = get_user_by_id(db, user_id)
-        return update_user(user, user_data, db)
-    except Exception:
-        pass
+def update_users_last_login_at(session: Session, last_logins: Dict[UUID, datetime]):
+    """Set the last login of several users. Does not commit."""
+    table = User.__table__  # type: ignore
+    statement = update(table).where(table.c.id == bindparam("user_id")).values(last_login_at=bindparam("logged_in_at"))
+    session.execute(
+        statement,
+        [{"user_id": user_id, "logged_in_at": logged_in_at} for user_id, logged_in_at in last_logins.items()],
+    )
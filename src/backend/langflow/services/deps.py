@@ -3,15 +3,21 @@ from typing import TYPE_CHECKING, Generator
 from langflow.services import ServiceType, service_manager
 
 if TYPE_CHECKING:
+    from langflow.services.admission.service import AdmissionService
+    from langflow.services.auth.service import AuthService
     from langflow.services.cache.service import BaseCacheService
     from langflow.services.chat.service import ChatService
     from langflow.services.credentials.service import CredentialService
     from langflow.services.database.service import DatabaseService
+    from langflow.services.llm_cache.service import LLMCacheService
+    from langflow.services.metrics.service import MetricsService
     from langflow.services.plugins.service import PluginService
+    from langflow.services.result_cache.service import ResultCacheService
     from langflow.services.session.service import SessionService
     from langflow.services.settings.service import SettingsService
     from langflow.services.store.service import StoreService
     from langflow.services.task.service import TaskService
+    from langflow.services.write_behind.service import WriteBehindService
     from sqlmodel import Session
 
 
@@ -34,6 +40,10 @@ def get_settings_service() -> "SettingsService":
         return service_manager.get(ServiceType.SETTINGS_SERVICE)  # type: ignore
 
 
+def get_auth_service() -> "AuthService":
+    return service_manager.get(ServiceType.AUTH_SERVICE)  # type: ignore
+
+
 def get_db_service() -> "DatabaseService":
     return service_manager.get(ServiceType.DATABASE_SERVICE)  # type: ignore
 
@@ -61,3 +71,23 @@ def get_chat_service() -> "ChatService":
 
 def get_store_service() -> "StoreService":
     return service_manager.get(ServiceType.STORE_SERVICE)  # type: ignore
+
+
+def get_metrics_service() -> "MetricsService":
+    return service_manager.get(ServiceType.METRICS_SERVICE)  # type: ignore
+
+
+def get_write_behind_service() -> "WriteBehindService":
+    return service_manager.get(ServiceType.WRITE_BEHIND_SERVICE)  # type: ignore
+
+
+def get_admission_service() -> "AdmissionService":
+    return service_manager.get(ServiceType.ADMISSION_SERVICE)  # type: ignore
+
+
+def get_result_cache_service() -> "ResultCacheService":
+    return service_manager.get(ServiceType.RESULT_CACHE_SERVICE)  # type: ignore
+
+
+def get_llm_cache_service() -> "LLMCacheService":
+    return service_manager.get(ServiceType.LLM_CACHE_SERVICE)  # type: ignore
@@ -0,0 +1,74 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+
+if TYPE_CHECKING:
+    from langflow.services.metrics.service import MetricsService
+
+MODEL_PATTERN = re.compile(r"""['"](?:model_name|model|model_id|deployment_name)['"]\s*[,:]\s*['"]([^'"]+)['"]""")
+TYPE_PATTERN = re.compile(r"""['"]_type['"]\s*[,:]\s*['"]([^'"]+)['"]""")
+
+
+def model_from_llm_string(llm_string: str) -> str:
+    """Extract the model name from the string LangChain uses to identify an LLM and its parameters."""
+    if match := MODEL_PATTERN.search(llm_string):
+        return match.group(1)
+    if match := TYPE_PATTERN.search(llm_string):
+        return match.group(1)
+    return "unknown"
+
+
+class LRUInMemoryCache(BaseCache):
+    """An in-memory LLM cache that drops the least recently used entries past max_size."""
+
+    def __init__(self, max_size: Optional[int] = 1000):
+        self.max_size = max_size
+        self._cache: "OrderedDict[Tuple[str, str], RETURN_VAL_TYPE]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = (prompt, llm_string)
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+            return value
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = (prompt, llm_string)
+        with self._lock:
+            self._cache[key] = return_val
+            self._cache.move_to_end(key)
+            if self.max_size is not None:
+                while len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+
+class InstrumentedLLMCache(BaseCache):
+    """Wraps an LLM cache and records the hits and misses of each model."""
+
+    def __init__(self, cache: BaseCache, metrics_service: Optional["MetricsService"] = None):
+        self.cache = cache
+        self.metrics_service = metrics_service
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        value = self.cache.lookup(prompt, llm_string)
+        if self.metrics_service is not None:
+            self.metrics_service.record_llm_cache_lookup(model_from_llm_string(llm_string), hit=value is not None)
+        return value
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.cache.update(prompt, llm_string, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.cache.clear(**kwargs)
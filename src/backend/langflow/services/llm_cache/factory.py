@@ -0,0 +1,98 @@
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from loguru import logger
+
+from langflow.services.factory import ServiceFactory
+from langflow.services.llm_cache.base import LRUInMemoryCache
+from langflow.services.llm_cache.service import LLMCacheService
+
+if TYPE_CHECKING:
+    from langchain_core.caches import BaseCache
+
+    from langflow.services.metrics.service import MetricsService
+    from langflow.services.settings.base import Settings
+    from langflow.services.settings.service import SettingsService
+
+# Values of the legacy LANGCHAIN_CACHE setting that map to an LLM_CACHE_TYPE
+LEGACY_CACHE_TYPES = {
+    "InMemoryCache": "memory",
+    "SQLiteCache": "sqlite",
+    "RedisCache": "redis",
+    "RedisSemanticCache": "redis_semantic",
+}
+
+
+def get_redis_url(settings: "Settings") -> str:
+    return settings.REDIS_URL or f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}"
+
+
+def create_sqlite_cache(database_path: str) -> "BaseCache":
+    """Create an SQLite cache in WAL mode so several workers can read it while one writes."""
+    from langchain.cache import SQLAlchemyCache
+    from sqlalchemy import create_engine, event
+
+    engine = create_engine(f"sqlite:///{database_path}")
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        # Wait for the lock held by another worker instead of failing right away
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+    return SQLAlchemyCache(engine)
+
+
+def create_llm_cache(settings: "Settings") -> Optional["BaseCache"]:
+    cache_type = settings.LLM_CACHE_TYPE
+    legacy_set = "LANGCHAIN_CACHE" in settings.model_fields_set or os.getenv("LANGFLOW_LANGCHAIN_CACHE")
+    if cache_type is None and legacy_set:
+        cache_type = LEGACY_CACHE_TYPES.get(settings.LANGCHAIN_CACHE)
+        if cache_type is None:
+            # Any other class of langchain.cache that takes no arguments
+            from langflow.interface.importing.utils import import_class
+
+            return import_class(f"langchain.cache.{settings.LANGCHAIN_CACHE}")()
+    if cache_type is None or cache_type == "none":
+        return None
+
+    if cache_type == "memory":
+        return LRUInMemoryCache(max_size=settings.LLM_CACHE_MAX_SIZE)
+    if cache_type == "sqlite":
+        database_path = settings.LLM_CACHE_SQLITE_PATH or str(Path(settings.CONFIG_DIR or ".") / "llm_cache.db")
+        return create_sqlite_cache(database_path)
+    if cache_type == "redis":
+        import redis
+        from langchain.cache import RedisCache
+
+        return RedisCache(redis_=redis.Redis.from_url(get_redis_url(settings)), ttl=settings.LLM_CACHE_TTL)
+    if cache_type == "redis_semantic":
+        from langchain.cache import RedisSemanticCache
+        from langflow.interface.importing.utils import import_class
+
+        embeddings = import_class(f"langchain.embeddings.{settings.LLM_CACHE_SEMANTIC_EMBEDDINGS}")()
+        return RedisSemanticCache(
+            redis_url=get_redis_url(settings),
+            embedding=embeddings,
+            score_threshold=settings.LLM_CACHE_SEMANTIC_THRESHOLD,
+        )
+    raise ValueError(f"Unknown LLM cache type {cache_type}")
+
+
+class LLMCacheServiceFactory(ServiceFactory):
+    def __init__(self):
+        super().__init__(LLMCacheService)
+
+    def create(self, settings_service: "SettingsService", metrics_service: "MetricsService"):
+        try:
+            cache = create_llm_cache(settings_service.settings)
+        except ImportError as exc:
+            logger.warning(f"Could not import the LLM cache dependencies: {exc}")
+            cache = None
+        except Exception as exc:
+            logger.warning(f"Could not setup LLM caching. Error: {exc}")
+            cache = None
+        return LLMCacheService(cache, metrics_service)
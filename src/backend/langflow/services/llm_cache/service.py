@@ -0,0 +1,51 @@
+from typing import TYPE_CHECKING, Optional
+
+from loguru import logger
+
+from langflow.services.base import Service
+from langflow.services.llm_cache.base import InstrumentedLLMCache
+
+if TYPE_CHECKING:
+    from langchain_core.caches import BaseCache
+
+    from langflow.services.metrics.service import MetricsService
+
+
+class LLMCacheService(Service):
+    """
+    Holds the cache LangChain uses for LLM calls.
+
+    The cache is wrapped so every lookup is counted per model. install()
+    makes it the global LangChain cache.
+    """
+
+    name = "llm_cache_service"
+
+    def __init__(self, cache: Optional["BaseCache"] = None, metrics_service: Optional["MetricsService"] = None):
+        self.cache = InstrumentedLLMCache(cache, metrics_service) if cache is not None else None
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache is not None
+
+    def install(self):
+        from langchain.globals import set_llm_cache
+
+        set_llm_cache(self.cache)
+        if self.cache is None:
+            logger.info("No LLM cache set.")
+        else:
+            logger.info(f"LLM caching setup with {self.cache.cache.__class__.__name__}")
+
+    def clear(self):
+        if self.cache is not None:
+            self.cache.clear()
+
+    def teardown(self):
+        from langchain.globals import get_llm_cache, set_llm_cache
+
+        if self.cache is not None and get_llm_cache() is self.cache:
+            set_llm_cache(None)
+
+    def __repr__(self):
+        return f"LLMCacheService(cache={self.cache.cache if self.cache is not None else None})"
@@ -134,11 +134,16 @@ def initialize_session_service():
     Initialize the session manager.
     """
     from langflow.services.cache import factory as cache_factory
+    from langflow.services.metrics import factory as metrics_factory
     from langflow.services.session import factory as session_service_factory  # type: ignore
 
     initialize_settings_service()
 
     service_manager.register_factory(cache_factory.CacheServiceFactory(), dependencies=[ServiceType.SETTINGS_SERVICE])
+    # Building the graph records its metrics
+    service_manager.register_factory(
+        metrics_factory.MetricsServiceFactory(), dependencies=[ServiceType.SETTINGS_SERVICE]
+    )
 
     service_manager.register_factory(
         session_service_factory.SessionServiceFactory(),
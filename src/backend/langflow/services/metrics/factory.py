@@ -0,0 +1,19 @@
+from typing import TYPE_CHECKING
+
+from langflow.services.factory import ServiceFactory
+from langflow.services.metrics.service import MetricsService
+
+if TYPE_CHECKING:
+    from langflow.services.settings.service import SettingsService
+
+
+class MetricsServiceFactory(ServiceFactory):
+    def __init__(self):
+        super().__init__(MetricsService)
+
+    def create(self, settings_service: "SettingsService"):
+        return MetricsService(
+            enabled=settings_service.settings.METRICS_ENABLED,
+            trace_memory=settings_service.settings.METRICS_TRACE_MEMORY,
+            max_profiles=settings_service.settings.PROFILING_MAX_PROFILES,
+        )
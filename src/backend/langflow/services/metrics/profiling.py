@@ -0,0 +1,50 @@
+import cProfile
+import io
+import pstats
+
+PROFILER_MODES = ("cprofile", "pyinstrument")
+
+
+class RequestProfiler:
+    """
+    Profiles the code run between start and stop with cProfile or pyinstrument.
+
+    pyinstrument is optional and understands async code better than cProfile,
+    which attributes the time spent awaiting to whatever the event loop runs.
+    cProfile sees the whole thread, so a cProfile report also holds the work
+    of the other requests the worker served meanwhile. Profile on an idle
+    worker, or use pyinstrument, which only follows the profiled request.
+    """
+
+    def __init__(self, mode: str = "cprofile"):
+        if mode not in PROFILER_MODES:
+            raise ValueError(f"Unknown profiler mode {mode}. Use one of {PROFILER_MODES}")
+        self.mode = mode
+        if mode == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError as exc:
+                raise ImportError(
+                    "The pyinstrument profiler mode requires pyinstrument. Please install it: pip install pyinstrument"
+                ) from exc
+            self._profiler = Profiler(async_mode="enabled")
+        else:
+            self._profiler = cProfile.Profile()
+
+    def start(self):
+        if self.mode == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self) -> str:
+        """Stop profiling and return the report as text."""
+        if self.mode == "pyinstrument":
+            self._profiler.stop()
+            return self._profiler.output_text(unicode=True)
+
+        self._profiler.disable()
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(50)
+        return stream.getvalue()
@@ -0,0 +1,190 @@
+import time
+import tracemalloc
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from loguru import logger
+
+from langflow.services.base import Service
+from langflow.services.metrics.base import DEFAULT_BUCKETS, Counter, Gauge, Histogram, Metric
+
+
+class MetricsService(Service):
+    """
+    Collects metrics about the flows built by this worker and renders them in
+    the Prometheus text format. It also keeps the last request profiles.
+    """
+
+    name = "metrics_service"
+
+    def __init__(self, enabled: bool = True, trace_memory: bool = False, max_profiles: int = 20):
+        self.enabled = enabled
+        self.max_profiles = max_profiles
+        self._metrics: Dict[str, Metric] = {}
+        self._profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._started_tracemalloc = False
+        if enabled and trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        self.vertex_build_seconds = self.histogram(
+            "langflow_vertex_build_seconds", "Wall time of each vertex build.", ["vertex_type"]
+        )
+        self.vertex_dependency_wait_seconds = self.histogram(
+            "langflow_vertex_dependency_wait_seconds",
+            "Time a vertex build spent waiting on its dependencies.",
+            ["vertex_type"],
+        )
+        self.vertex_instantiate_seconds = self.histogram(
+            "langflow_vertex_instantiate_seconds",
+            "Time spent instantiating the class of a vertex.",
+            ["vertex_type"],
+        )
+        self.vertex_cache_hits = self.counter(
+            "langflow_vertex_build_cache_hits_total",
+            "Number of times a vertex built by an earlier build was reused.",
+            ["vertex_type"],
+        )
+        self.vertex_build_errors = self.counter(
+            "langflow_vertex_build_errors_total", "Number of failed vertex builds.", ["vertex_type"]
+        )
+        self.vertex_memory_delta_bytes = self.gauge(
+            "langflow_vertex_build_memory_delta_bytes",
+            "Traced memory allocated by the last build of a vertex type. Only set when memory tracing is on.",
+            ["vertex_type"],
+        )
+        self.graph_build_seconds = self.histogram("langflow_graph_build_seconds", "Wall time of each graph build.")
+        self.task_queue_wait_seconds = self.histogram(
+            "langflow_task_queue_wait_seconds",
+            "Time a flow execution waited for a scheduler slot.",
+            ["priority"],
+        )
+        self.result_cache_lookups = self.counter(
+            "langflow_result_cache_lookups_total", "Number of /process result cache lookups.", ["result"]
+        )
+        self.llm_cache_lookups = self.counter(
+            "langflow_llm_cache_lookups_total", "Number of LLM cache lookups.", ["model", "result"]
+        )
+        self.admission_rejections = self.counter(
+            "langflow_admission_rejections_total", "Number of requests shed by admission control.", ["reason"]
+        )
+        self.admission_limit = self.gauge("langflow_admission_limit", "Current in-flight limit of admission control.")
+        self.admission_in_flight = self.gauge(
+            "langflow_admission_in_flight", "Number of requests holding an admission permit."
+        )
+        self.task_queue_depth = self.gauge(
+            "langflow_task_queue_depth", "Number of flow executions waiting for a scheduler slot.", ["priority"]
+        )
+
+    def _get_or_create(self, metric_class, name: str, *args, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = metric_class(name, *args, **kwargs)
+            self._metrics[name] = metric
+        elif not isinstance(metric, metric_class):
+            raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+    def traced_memory(self) -> Optional[int]:
+        """Return the current traced memory in bytes or None if memory is not traced."""
+        if not tracemalloc.is_tracing():
+            return None
+        current, _ = tracemalloc.get_traced_memory()
+        return current
+
+    def record_vertex_build(self, vertex_type: str, build_metrics: Dict[str, Any]):
+        if not self.enabled:
+            return
+        self.vertex_build_seconds.observe(build_metrics["wall_time"], vertex_type=vertex_type)
+        self.vertex_dependency_wait_seconds.observe(build_metrics["dependencies_time"], vertex_type=vertex_type)
+        self.vertex_instantiate_seconds.observe(build_metrics["instantiate_time"], vertex_type=vertex_type)
+        if build_metrics.get("memory_delta") is not None:
+            self.vertex_memory_delta_bytes.set(build_metrics["memory_delta"], vertex_type=vertex_type)
+
+    def record_vertex_cache_hit(self, vertex_type: str):
+        if self.enabled:
+            self.vertex_cache_hits.inc(vertex_type=vertex_type)
+
+    def record_vertex_build_error(self, vertex_type: str):
+        if self.enabled:
+            self.vertex_build_errors.inc(vertex_type=vertex_type)
+
+    def record_graph_build(self, duration: float):
+        if self.enabled:
+            self.graph_build_seconds.observe(duration)
+
+    def record_task_queue_wait(self, priority: str, duration: float):
+        if self.enabled:
+            self.task_queue_wait_seconds.observe(duration, priority=priority)
+
+    def set_task_queue_depth(self, priority: str, depth: int):
+        if self.enabled:
+            self.task_queue_depth.set(depth, priority=priority)
+
+    def record_result_cache_lookup(self, hit: bool):
+        if self.enabled:
+            self.result_cache_lookups.inc(result="hit" if hit else "miss")
+
+    def record_llm_cache_lookup(self, model: str, hit: bool):
+        if self.enabled:
+            self.llm_cache_lookups.inc(model=model, result="hit" if hit else "miss")
+
+    def record_admission_rejection(self, reason: str):
+        if self.enabled:
+            self.admission_rejections.inc(reason=reason)
+
+    def set_admission_state(self, limit: int, in_flight: int):
+        if self.enabled:
+            self.admission_limit.set(limit)
+            self.admission_in_flight.set(in_flight)
+
+    def add_profile(self, method: str, path: str, mode: str, duration: float, report: str) -> str:
+        """Store a request profile and return its id. Only the last max_profiles are kept."""
+        profile_id = uuid.uuid4().hex
+        self._profiles[profile_id] = {
+            "id": profile_id,
+            "method": method,
+            "path": path,
+            "mode": mode,
+            "duration": duration,
+            "created_at": time.time(),
+            "report": report,
+        }
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+        logger.debug(f"Stored {mode} profile {profile_id} for {method} {path}")
+        return profile_id
+
+    def get_profile(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        return self._profiles.get(profile_id)
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        return [
+            {key: value for key, value in profile.items() if key != "report"}
+            for profile in reversed(self._profiles.values())
+        ]
+
+    def teardown(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
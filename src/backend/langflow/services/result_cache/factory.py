@@ -0,0 +1,36 @@
+from typing import TYPE_CHECKING
+
+from langflow.services.cache.service import InMemoryCache, RedisCache
+from langflow.services.factory import ServiceFactory
+from langflow.services.result_cache.service import ResultCacheService
+from langflow.utils.logger import logger
+
+if TYPE_CHECKING:
+    from langflow.services.metrics.service import MetricsService
+    from langflow.services.settings.service import SettingsService
+
+
+class ResultCacheServiceFactory(ServiceFactory):
+    def __init__(self):
+        super().__init__(ResultCacheService)
+
+    def create(self, settings_service: "SettingsService", metrics_service: "MetricsService"):
+        settings = settings_service.settings
+        if not settings.RESULT_CACHE_ENABLED:
+            return ResultCacheService(enabled=False)
+
+        cache = InMemoryCache(max_size=settings.RESULT_CACHE_MAX_SIZE, expiration_time=settings.RESULT_CACHE_TTL)
+        if settings.RESULT_CACHE_TYPE == "redis":
+            logger.debug("Creating Redis result cache")
+            redis_cache = RedisCache(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                url=settings.REDIS_URL,
+                expiration_time=settings.RESULT_CACHE_TTL,
+            )
+            if redis_cache.is_connected():
+                cache = redis_cache
+            else:
+                logger.warning("Redis result cache is not connected, falling back to in-memory cache")
+        return ResultCacheService(cache=cache, enabled=True, metrics_service=metrics_service)
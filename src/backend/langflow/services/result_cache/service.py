@@ -0,0 +1,105 @@
+import hashlib
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+import orjson
+from loguru import logger
+
+from langflow.services.base import Service
+from langflow.services.session.utils import compute_dict_hash
+
+if TYPE_CHECKING:
+    from langflow.services.cache.base import BaseCacheService
+    from langflow.services.metrics.service import MetricsService
+
+# Vertices with one of these base classes keep state between runs
+STATEFUL_BASE_CLASSES = frozenset({"BaseMemory", "BaseChatMemory", "BaseChatMessageHistory"})
+
+
+def has_memory(graph_data: Dict[str, Any]) -> bool:
+    """Check if a flow has a memory component, in which case its outputs depend on previous runs."""
+    for node in graph_data.get("nodes", []):
+        base_classes = node.get("data", {}).get("node", {}).get("base_classes") or []
+        if STATEFUL_BASE_CLASSES.intersection(base_classes):
+            return True
+    return False
+
+
+class ResultCacheService(Service):
+    """
+    Memoizes the results of /process executions.
+
+    Results are keyed by the flow id, the content hash of the flow and the
+    normalized inputs and tweaks, so editing a flow or changing an input is a
+    miss and users with identical flows don't share results. The entries are
+    stored in a cache service (in memory with LRU and TTL, or Redis).
+
+    Example:
+
+        key = result_cache_service.build_key(graph_data, inputs, tweaks, flow_id=flow.id)
+        if (cached := result_cache_service.get(key)) is None:
+            result = await process_graph_cached(...)
+            result_cache_service.set(key, result.result)
+    """
+
+    name = "result_cache_service"
+
+    def __init__(
+        self,
+        cache: Optional["BaseCacheService"] = None,
+        enabled: bool = False,
+        prefix: str = "langflow:result:",
+        metrics_service: Optional["MetricsService"] = None,
+    ):
+        self.cache = cache
+        self.enabled = enabled and cache is not None
+        self.prefix = prefix
+        self.metrics_service = metrics_service
+
+    def is_cacheable(self, graph_data: Dict[str, Any], session_id: Optional[str] = None) -> bool:
+        """Only flows without memory and runs that don't continue a session are memoized."""
+        return self.enabled and session_id is None and not has_memory(graph_data)
+
+    def build_key(
+        self,
+        graph_data: Dict[str, Any],
+        inputs: Optional[Union[dict, List[dict]]] = None,
+        tweaks: Optional[dict] = None,
+        data_hash: Optional[str] = None,
+        flow_id: Optional[Any] = None,
+    ) -> str:
+        # Sorting the keys makes {"a": 1, "b": 2} and {"b": 2, "a": 1} the same input
+        normalized = orjson.dumps(
+            {"inputs": inputs or {}, "tweaks": tweaks or {}},
+            option=orjson.OPT_SORT_KEYS,
+            default=str,
+        )
+        inputs_hash = hashlib.sha256(normalized).hexdigest()
+        scope = f"{flow_id}:" if flow_id is not None else ""
+        return f"{self.prefix}{scope}{data_hash or compute_dict_hash(graph_data)}:{inputs_hash}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        try:
+            value = self.cache.get(key)  # type: ignore
+        except Exception as exc:
+            logger.warning(f"Error reading the result cache: {exc}")
+            value = None
+        if self.metrics_service is not None:
+            self.metrics_service.record_result_cache_lookup(hit=value is not None)
+        return value
+
+    def set(self, key: str, result: Any):
+        if not self.enabled:
+            return
+        try:
+            self.cache.set(key, {"result": result})  # type: ignore
+        except Exception as exc:
+            logger.warning(f"Error writing the result cache: {exc}")
+
+    def invalidate(self, key: str):
+        if self.enabled:
+            self.cache.delete(key)  # type: ignore
+
+    def __repr__(self):
+        return f"ResultCacheService(enabled={self.enabled}, cache={self.cache})"
@@ -17,3 +17,8 @@ class ServiceType(str, Enum):
     PLUGIN_SERVICE = "plugin_service"
     STORE_SERVICE = "store_service"
     CREDENTIAL_SERVICE = "credential_service"
+    METRICS_SERVICE = "metrics_service"
+    WRITE_BEHIND_SERVICE = "write_behind_service"
+    ADMISSION_SERVICE = "admission_service"
+    RESULT_CACHE_SERVICE = "result_cache_service"
+    LLM_CACHE_SERVICE = "llm_cache_service"
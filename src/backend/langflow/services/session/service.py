@@ -1,5 +1,7 @@
 from typing import TYPE_CHECKING, Optional
 
+from cachetools import LRUCache
+
 from langflow.interface.run import build_sorted_vertices
 from langflow.services.base import Service
 from langflow.services.session.utils import compute_dict_hash, session_id_generator
@@ -7,22 +9,43 @@ from langflow.services.session.utils import compute_dict_hash, session_id_genera
 if TYPE_CHECKING:
     from langflow.services.cache.base import BaseCacheService
 
+# Number of saved flows whose data is shared by the graphs of their sessions
+SHARED_FLOW_DATA_SIZE = 128
+
 
 class SessionService(Service):
     name = "session_service"
 
     def __init__(self, cache_service):
         self.cache_service: "BaseCacheService" = cache_service
+        self.shared_flow_data: LRUCache = LRUCache(maxsize=SHARED_FLOW_DATA_SIZE)
+
+    def get_shared_flow_data(self, data_hash: str, data_graph: dict) -> dict:
+        """
+        Returns the first data_graph loaded with data_hash, so the graphs of every session
+        of a saved flow share its nodes and templates instead of each keeping a copy.
+        Graphs only read the data they are built from.
+        """
+        if (shared := self.shared_flow_data.get(data_hash)) is None:
+            shared = self.shared_flow_data[data_hash] = data_graph
+        return shared
 
-    async def load_session(self, key, data_graph: Optional[dict] = None):
+    async def load_session(self, key, data_graph: Optional[dict] = None, data_hash: Optional[str] = None):
+        # data_hash is the stored hash of data_graph, if it is the data of a saved flow
         # Check if the data is cached
         if key in self.cache_service:
-            return self.cache_service.get(key)
+            session = self.cache_service.get(key)
+            if session and (graph := session[0]) is not None:
+                # The vertices built by an earlier request are reused
+                graph.record_reuse()
+            return session
 
         if key is None:
             key = self.generate_key(session_id=None, data_graph=data_graph)
         if data_graph is None:
             return (None, None)
+        if data_hash is not None:
+            data_graph = self.get_shared_flow_data(data_hash, data_graph)
         # If not cached, build the graph and cache it
         graph, artifacts = await build_sorted_vertices(data_graph)
 
@@ -30,16 +53,17 @@ class SessionService(Service):
 
         return graph, artifacts
 
-    def build_key(self, session_id, data_graph):
-        json_hash = compute_dict_hash(data_graph)
+    def build_key(self, session_id, data_graph, data_hash: Optional[str] = None):
+        # data_hash is the stored hash of a flow, when data_graph is its data
+        json_hash = data_hash or compute_dict_hash(data_graph)
         return f"{session_id}{':' if session_id else ''}{json_hash}"
 
-    def generate_key(self, session_id, data_graph):
+    def generate_key(self, session_id, data_graph, data_hash: Optional[str] = None):
         # Hash the JSON and combine it with the session_id to create a unique key
         if session_id is None:
             # generate a 5 char session_id to concatenate with the json_hash
             session_id = session_id_generator()
-        return self.build_key(session_id, data_graph=data_graph)
+        return self.build_key(session_id, data_graph=data_graph, data_hash=data_hash)
 
     def update_session(self, session_id, value):
         self.cache_service.set(session_id, value)
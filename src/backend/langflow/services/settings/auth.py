@@ -27,6 +27,9 @@ class AuthSettings(BaseSettings):
     API_KEY_ALGORITHM: str = "HS256"
     API_V1_STR: str = "/api/v1"
 
+    # Seconds a user resolved from an API key or a JWT is cached. 0 disables the cache.
+    PRINCIPAL_CACHE_TTL: int = 30
+
     # If AUTO_LOGIN = True
     # > The application does not request login and logs in automatically as a super user.
     AUTO_LOGIN: bool = True
@@ -50,6 +50,99 @@ class Settings(BaseSettings):
     REDIS_URL: Optional[str] = None
     REDIS_CACHE_EXPIRE: int = 3600
 
+    # Cache of LLM responses: "memory" (LRU), "sqlite" (on disk, shared by the workers of a host),
+    # "redis" (exact match), "redis_semantic" or "none". Unset falls back to LANGCHAIN_CACHE if given
+    LLM_CACHE_TYPE: Optional[str] = None
+    # Maximum number of responses kept by the in-memory LLM cache
+    LLM_CACHE_MAX_SIZE: int = 1000
+    # Path of the SQLite LLM cache. Defaults to llm_cache.db in CONFIG_DIR
+    LLM_CACHE_SQLITE_PATH: Optional[str] = None
+    # Expiration in seconds of the Redis LLM cache entries. None keeps them forever
+    LLM_CACHE_TTL: Optional[int] = None
+    # Embeddings class of langchain.embeddings used by the semantic cache and its similarity threshold
+    LLM_CACHE_SEMANTIC_EMBEDDINGS: str = "OpenAIEmbeddings"
+    LLM_CACHE_SEMANTIC_THRESHOLD: float = 0.2
+
+    # Memoize /process results keyed by the flow content hash, inputs and tweaks.
+    # Flows with memory and flows with cache_results off are never memoized
+    RESULT_CACHE_ENABLED: bool = False
+    # "memory" or "redis". Redis uses the REDIS_* settings
+    RESULT_CACHE_TYPE: str = "memory"
+    RESULT_CACHE_TTL: int = 3600
+    # Maximum number of results kept by the in-memory result cache
+    RESULT_CACHE_MAX_SIZE: int = 1024
+
+    # Shares chat build records, histories and streamed messages between workers
+    # "memory" or "redis"
+    CHAT_BROKER_TYPE: str = "memory"
+    # Maximum number of messages kept in each chat history
+    CHAT_HISTORY_MAX_MESSAGES: int = 100
+    # Also store chat histories in the database
+    CHAT_HISTORY_PERSIST: bool = False
+
+    # Number of threads used to run sync-only objects (e.g. Chains without acall) on the process endpoints
+    PROCESS_THREAD_POOL_SIZE: int = 16
+    # Number of flow executions (sync, streamed, chat or background) the task scheduler runs at the same time.
+    # 0 uses ADMISSION_MAX_IN_FLIGHT, so admitted requests only wait for slots held by background executions
+    TASK_CONCURRENCY: int = 0
+    # Maximum number of flow executions waiting for the scheduler before new ones are rejected with 429
+    TASK_QUEUE_SIZE: int = 100
+    # Maximum number of flow executions a single user runs at the same time. 0 disables the quota.
+    # Ignored with AUTO_LOGIN, where every request is made by the same user
+    TASK_OWNER_CONCURRENCY: int = 0
+    # Share of the scheduler given to interactive executions relative to batch ones
+    TASK_INTERACTIVE_WEIGHT: int = 4
+    TASK_BATCH_WEIGHT: int = 1
+    # Seconds a finished task result is kept before it's evicted
+    TASK_RESULT_TTL: int = 3600
+
+    # Shed process and build requests with a 503 when this worker is overloaded
+    ADMISSION_CONTROL_ENABLED: bool = True
+    # Maximum number of process and build requests in flight in this worker
+    ADMISSION_MAX_IN_FLIGHT: int = 64
+    # Maximum number of requests waiting for a permit before new ones are rejected
+    ADMISSION_MAX_QUEUE: int = 64
+    # Seconds a request waits for a permit before it's rejected. 0 rejects right away
+    ADMISSION_QUEUE_TIMEOUT: float = 5.0
+    # Lower the in-flight limit when requests get slower than ADMISSION_TARGET_LATENCY
+    ADMISSION_ADAPTIVE: bool = True
+    ADMISSION_MIN_LIMIT: int = 4
+    ADMISSION_TARGET_LATENCY: float = 30.0
+
+    # Collect build metrics and expose them in the Prometheus format at /api/v1/metrics
+    METRICS_ENABLED: bool = True
+    # Trace memory allocations to report the memory delta of each vertex build. Slows down every allocation.
+    METRICS_TRACE_MEMORY: bool = False
+    # Allow profiling a request by sending the X-Langflow-Profile header ("cprofile" or "pyinstrument").
+    # One request is profiled at a time. cProfile reports include the other requests served meanwhile.
+    PROFILING_ENABLED: bool = False
+    # Number of request profiles kept in memory
+    PROFILING_MAX_PROFILES: int = 20
+
+    # Background writer for bookkeeping writes (API key usage, last login)
+    # Number of worker threads, each with its own connection
+    WRITE_BEHIND_WORKERS: int = 2
+    # Maximum number of writes waiting in each worker queue
+    WRITE_BEHIND_QUEUE_SIZE: int = 10000
+    # Rows written per batch
+    WRITE_BEHIND_BATCH_SIZE: int = 500
+    # Seconds between flushes
+    WRITE_BEHIND_FLUSH_INTERVAL: float = 1.0
+    # Number of times a row that failed to write is retried with the next batches before it's dropped
+    WRITE_BEHIND_MAX_RETRIES: int = 3
+
+    # Build the vertices of /build/stream in Celery workers, which receive the flow payload once per flow
+    DISTRIBUTED_BUILD: bool = False
+    # Seconds to wait for a vertex built by a worker
+    DISTRIBUTED_BUILD_TIMEOUT: float = 300.0
+
+    # Templates built by /custom_component, shared between requests for the same code, user and field.
+    # A CUSTOM_COMPONENT_CACHE_TTL of 0 disables the cache but still builds each template once at a time
+    CUSTOM_COMPONENT_CACHE_SIZE: int = 256
+    CUSTOM_COMPONENT_CACHE_TTL: int = 60
+    # Seconds a request with a client_id waits for a newer one from the same client before building
+    CUSTOM_COMPONENT_DEBOUNCE: float = 0.0
+
     # PLUGIN_DIR: Optional[str] = None
 
     LANGFUSE_SECRET_KEY: Optional[str] = None
@@ -1,23 +1,36 @@
+import asyncio
+import time
 import traceback
-from typing import Any, Callable, Optional, Tuple
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
 
-import anyio
 from loguru import logger
 
 from langflow.services.task.backends.base import TaskBackend
+from langflow.services.task.scheduler import BATCH, FairScheduler, Ticket
+from langflow.utils.concurrency import run_in_thread_pool
+
+READY_STATES = frozenset({"SUCCESS", "FAILURE", "REVOKED"})
 
 
 class AnyIOTaskResult:
-    def __init__(self, scope):
-        self._scope = scope
+    """
+    The state of a task run by the AnyIOBackend.
+
+    Statuses follow Celery's naming: PENDING, STARTED, SUCCESS, FAILURE and REVOKED.
+    """
+
+    def __init__(self, task_id: str):
+        self.task_id = task_id
         self._status = "PENDING"
         self._result = None
-        self._exception = None
+        self._exception: Optional[BaseException] = None
+        self._traceback = None
+        self._task: Optional[asyncio.Task] = None
+        self.finished_at: Optional[float] = None
 
     @property
     def status(self) -> str:
-        if self._status == "DONE":
-            return "FAILURE" if self._exception is not None else "SUCCESS"
         return self._status
 
     @property
@@ -28,52 +41,124 @@ class AnyIOTaskResult:
 
     @property
     def result(self) -> Any:
+        if self._status == "FAILURE":
+            return self._exception
         return self._result
 
     def ready(self) -> bool:
-        return self._status == "DONE"
+        return self._status in READY_STATES
+
+    def cancel(self) -> bool:
+        if self.ready():
+            return False
+        if self._status == "PENDING":
+            self._finish("REVOKED")
+        if self._task is not None:
+            self._task.cancel()
+        return True
+
+    def _finish(self, status: str):
+        self._status = status
+        self.finished_at = time.monotonic()
 
     async def run(self, func, *args, **kwargs):
+        self._status = "STARTED"
         try:
-            self._result = await func(*args, **kwargs)
+            if asyncio.iscoroutinefunction(func):
+                self._result = await func(*args, **kwargs)
+            else:
+                self._result = await run_in_thread_pool(func, *args, **kwargs)
+            self._finish("SUCCESS")
+        except asyncio.CancelledError:
+            self._finish("REVOKED")
         except Exception as e:
             self._exception = e
             self._traceback = e.__traceback__
-        finally:
-            self._status = "DONE"
+            self._finish("FAILURE")
 
 
 class AnyIOBackend(TaskBackend):
+    """
+    Runs tasks in the background of the current event loop.
+
+    Launching a task returns right away. The task waits for a slot of the
+    scheduler, which decides the order in which tasks of different owners and
+    priority classes run and raises TaskQueueFullError when too many tasks are
+    waiting. Finished results are kept for result_ttl seconds.
+    """
+
     name = "anyio"
 
-    def __init__(self):
-        self.tasks = {}
+    def __init__(self, scheduler: Optional[FairScheduler] = None, result_ttl: float = 3600):
+        self.scheduler = scheduler or FairScheduler(capacity=4, max_waiting=100)
+        self.result_ttl = result_ttl
+        self.tasks: Dict[str, AnyIOTaskResult] = {}
+
+    async def _run(self, ticket: Ticket, task_result: AnyIOTaskResult, func, args, kwargs):
+        await self.scheduler.wait(ticket)
+        await task_result.run(func, *args, **kwargs)
 
     async def launch_task(
-        self, task_func: Callable[..., Any], *args: Any, **kwargs: Any
+        self,
+        task_func: Callable[..., Any],
+        *args: Any,
+        owner: Optional[str] = None,
+        priority: str = BATCH,
+        **kwargs: Any,
     ) -> Tuple[Optional[str], Optional[AnyIOTaskResult]]:
         """
-        Launch a new task in an asynchronous manner.
+        Queue a task to run in the background.
 
         Parameters:
-            task_func: The asynchronous function to run.
+            task_func: The function to run. Sync functions run in the thread pool.
             *args: Positional arguments to pass to task_func.
+            owner: The user or API key the task is accounted to.
+            priority: The priority class of the task.
             **kwargs: Keyword arguments to pass to task_func.
 
         Returns:
             A tuple containing a unique task ID and the task result object.
+
+        Raises:
+            TaskQueueFullError: If too many tasks are waiting.
         """
-        async with anyio.create_task_group() as tg:
-            try:
-                task_result = AnyIOTaskResult(tg)
-                tg.start_soon(task_result.run, task_func, *args, **kwargs)
-                task_id = str(id(task_result))
-                self.tasks[task_id] = task_result
-                logger.info(f"Task {task_id} started.")
-                return task_id, task_result
-            except Exception as e:
-                logger.error(f"An error occurred while launching the task: {e}")
-                return None, None
+        self.evict_expired()
+        ticket = self.scheduler.submit(owner, priority)
+        task_id = uuid.uuid4().hex
+        task_result = AnyIOTaskResult(task_id)
+        task = asyncio.get_running_loop().create_task(self._run(ticket, task_result, task_func, args, kwargs))
+        # Also covers tasks cancelled before they started running
+        task.add_done_callback(lambda _: self.scheduler.release(ticket))
+        task_result._task = task
+        self.tasks[task_id] = task_result
+        logger.info(f"Task {task_id} queued.")
+        return task_id, task_result
 
     def get_task(self, task_id: str) -> Any:
+        self.evict_expired()
         return self.tasks.get(task_id)
+
+    def cancel_task(self, task_id: str) -> bool:
+        task_result = self.tasks.get(task_id)
+        if task_result is None:
+            return False
+        return task_result.cancel()
+
+    def evict_expired(self):
+        """Remove the results that finished more than result_ttl seconds ago."""
+        deadline = time.monotonic() - self.result_ttl
+        expired = [
+            task_id
+            for task_id, task_result in self.tasks.items()
+            if task_result.finished_at is not None and task_result.finished_at <= deadline
+        ]
+        for task_id in expired:
+            del self.tasks[task_id]
+
+    def teardown(self):
+        try:
+            for task_result in list(self.tasks.values()):
+                task_result.cancel()
+        except RuntimeError:
+            # The loop is already closed
+            pass
@@ -1,12 +1,30 @@
 from abc import ABC, abstractmethod
-from typing import Any, Callable
+from typing import Any, Callable, Optional
+
+
+class TaskQueueFullError(Exception):
+    """Raised when a backend can't accept more tasks."""
 
 
 class TaskBackend(ABC):
     @abstractmethod
-    def launch_task(self, task_func: Callable[..., Any], *args: Any, **kwargs: Any):
+    def launch_task(
+        self,
+        task_func: Callable[..., Any],
+        *args: Any,
+        owner: Optional[str] = None,
+        priority: str = "batch",
+        **kwargs: Any,
+    ):
         pass
 
     @abstractmethod
     def get_task(self, task_id: str) -> Any:
         pass
+
+    def cancel_task(self, task_id: str) -> bool:
+        """Cancel a task. Returns False if the task is unknown or already finished."""
+        return False
+
+    def teardown(self):
+        pass
@@ -1,23 +1,84 @@
-from typing import Any, Callable
+import asyncio
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
 from celery.result import AsyncResult  # type: ignore
 from langflow.services.task.backends.base import TaskBackend
+from langflow.services.task.scheduler import BATCH, FairScheduler, Ticket
+from langflow.services.task.utils import wait_for_task_result
+from langflow.utils.concurrency import run_in_thread_pool
 from langflow.worker import celery_app
+from loguru import logger
 
 
 class CeleryBackend(TaskBackend):
+    """
+    Sends tasks to the Celery workers.
+
+    Tasks are only sent once the scheduler grants them a slot and hold it until
+    they finish, so the scheduler decides which owner and priority class goes
+    next and bounds the number of tasks in flight from this process.
+    """
+
     name = "celery"
 
-    def __init__(self):
+    def __init__(self, scheduler: Optional[FairScheduler] = None):
         self.celery_app = celery_app
+        self.scheduler = scheduler or FairScheduler(capacity=4, max_waiting=100)
+        self._dispatches: Dict[str, Tuple[asyncio.Task, Ticket]] = {}
 
-    def launch_task(self, task_func: Callable[..., Any], *args: Any, **kwargs: Any) -> tuple[str, AsyncResult]:
-        # I need to type the delay method to make it easier
-        from celery import Task  # type: ignore
+    async def launch_task(
+        self,
+        task_func: Callable[..., Any],
+        *args: Any,
+        owner: Optional[str] = None,
+        priority: str = BATCH,
+        **kwargs: Any,
+    ) -> tuple[str, AsyncResult]:
+        if not hasattr(task_func, "apply_async"):
+            raise ValueError(f"Task function {task_func} does not have an apply_async method")
+        ticket = self.scheduler.submit(owner, priority)
+        # The id is known before the task is sent so the client can poll it right away
+        task_id = str(uuid.uuid4())
+        dispatch = asyncio.get_running_loop().create_task(self._dispatch(ticket, task_func, task_id, args, kwargs))
+        dispatch.add_done_callback(lambda _: self._dispatch_done(task_id, ticket))
+        self._dispatches[task_id] = (dispatch, ticket)
+        return task_id, AsyncResult(task_id, app=self.celery_app)
 
-        if not hasattr(task_func, "delay"):
-            raise ValueError(f"Task function {task_func} does not have a delay method")
-        task: Task = task_func.delay(*args, **kwargs)
-        return task.id, AsyncResult(task.id, app=self.celery_app)
+    async def _dispatch(self, ticket: Ticket, task_func, task_id: str, args, kwargs):
+        await self.scheduler.wait(ticket)
+        task = await run_in_thread_pool(task_func.apply_async, args=args, kwargs=kwargs, task_id=task_id)
+        try:
+            await wait_for_task_result(task)
+        except Exception as exc:
+            # The client reads the failure from the result backend
+            logger.debug(f"Task {task_id} failed: {exc}")
+
+    def _dispatch_done(self, task_id: str, ticket: Ticket):
+        self.scheduler.release(ticket)
+        self._dispatches.pop(task_id, None)
 
     def get_task(self, task_id: str) -> Any:
         return AsyncResult(task_id, app=self.celery_app)
+
+    def cancel_task(self, task_id: str) -> bool:
+        result = AsyncResult(task_id, app=self.celery_app)
+        if result.ready():
+            return False
+        dispatch, ticket = self._dispatches.get(task_id, (None, None))
+        if dispatch is not None and ticket is not None and not ticket.granted:
+            # Never sent to a worker, record the revocation ourselves
+            dispatch.cancel()
+            self.celery_app.backend.mark_as_revoked(task_id, reason="cancelled before dispatch")
+            return True
+        result.revoke(terminate=True)
+        return True
+
+    def teardown(self):
+        for dispatch, _ in list(self._dispatches.values()):
+            try:
+                dispatch.cancel()
+            except RuntimeError:
+                # The loop is already closed
+                pass
+        self._dispatches.clear()
@@ -0,0 +1,278 @@
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
+from uuid import UUID
+
+import orjson
+from loguru import logger
+
+from langflow.services.session.utils import compute_dict_hash
+from langflow.services.task.utils import wait_for_task_result
+from langflow.utils.concurrency import run_in_thread_pool
+
+if TYPE_CHECKING:
+    from langflow.api.v1.schemas import ChatMessage
+    from langflow.graph.graph.base import Graph
+
+
+class GraphNotCachedError(Exception):
+    """Raised by a worker that received a flow hash without the payload and does not know the flow."""
+
+    def __init__(self, flow_hash: str):
+        super().__init__(f"Flow {flow_hash} is not cached in this worker")
+        self.flow_hash = flow_hash
+
+    def __reduce__(self):
+        # Pickled by the result backend, which would otherwise pass the message as the flow hash
+        return (self.__class__, (self.flow_hash,))
+
+
+class CompiledGraphCache:
+    """
+    Worker side cache of the flows sent by the API.
+
+    Payloads are kept by content hash so a flow is only shipped once per
+    worker. The compiled graph of each build is kept by (flow hash, build id)
+    so every vertex of a build reuses the vertices already built by this worker.
+    """
+
+    def __init__(self, max_payloads: int = 128, max_graphs: int = 32):
+        self.max_payloads = max_payloads
+        self.max_graphs = max_graphs
+        self._payloads: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._graphs: "OrderedDict[Tuple[str, str], Graph]" = OrderedDict()
+
+    def get_graph(self, flow_hash: str, build_id: str, graph_data: Optional[Dict[str, Any]] = None) -> "Graph":
+        from langflow.graph.graph.base import Graph
+
+        key = (flow_hash, build_id)
+        if key in self._graphs:
+            self._graphs.move_to_end(key)
+            return self._graphs[key]
+
+        if graph_data is not None:
+            self._put(self._payloads, flow_hash, graph_data, self.max_payloads)
+        elif flow_hash in self._payloads:
+            self._payloads.move_to_end(flow_hash)
+            graph_data = self._payloads[flow_hash]
+        else:
+            raise GraphNotCachedError(flow_hash)
+
+        graph = Graph.from_payload(graph_data)
+        self._put(self._graphs, key, graph, self.max_graphs)
+        return graph
+
+    @staticmethod
+    def _put(cache: OrderedDict, key, value, max_size: int):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+
+    def clear(self):
+        self._payloads.clear()
+        self._graphs.clear()
+
+
+def vertex_result_handle(graph: "Graph", vertex_id: str, valid: bool, params: str, duration: float) -> Dict[str, Any]:
+    """
+    Lightweight description of a vertex build. The built object itself stays in the worker.
+    """
+    from langflow.api.utils import build_input_keys_response
+    from langflow.utils.payload import get_root_vertex
+
+    vertex = graph.get_vertex(vertex_id)
+    handle: Dict[str, Any] = {
+        "id": vertex_id,
+        "valid": valid,
+        "params": params,
+        "duration": duration,
+        "artifacts": vertex.artifacts if vertex is not None and valid else {},
+        "input_keys": None,
+    }
+    root_vertex = get_root_vertex(graph)
+    if valid and vertex is root_vertex and hasattr(vertex._built_object, "input_keys"):
+        artifacts: Dict[str, Any] = {}
+        for built_vertex in graph.vertices:
+            artifacts.update(built_vertex.artifacts)
+        handle["input_keys"] = build_input_keys_response(vertex._built_object, artifacts)
+    # Results go through the result backend, so anything that is not JSON becomes a string
+    return orjson.loads(orjson.dumps(handle, default=str))
+
+
+async def build_cached_vertex(
+    cache: CompiledGraphCache,
+    flow_hash: str,
+    build_id: str,
+    vertex_id: str,
+    graph_data: Optional[Dict[str, Any]] = None,
+    user_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build a vertex, and the subgraph it depends on, from the graph cached in this worker."""
+    graph = cache.get_graph(flow_hash, build_id, graph_data)
+    user_uuid = UUID(user_id) if user_id else None
+    vertex = graph.get_vertex(vertex_id)
+    if vertex is None:
+        raise ValueError(f"Vertex {vertex_id} not found in flow {flow_hash}")
+    start = time.perf_counter()
+    try:
+        await vertex.build(user_id=user_uuid)
+        params = vertex._built_object_repr()
+        valid = True
+    except Exception as exc:
+        logger.exception(exc)
+        params = str(exc)
+        valid = False
+    return vertex_result_handle(graph, vertex_id, valid, params, time.perf_counter() - start)
+
+
+async def process_cached_graph(
+    cache: CompiledGraphCache,
+    flow_hash: str,
+    build_id: str,
+    inputs: Union[dict, str],
+    client_id: str,
+    session_id: str,
+    graph_data: Optional[Dict[str, Any]] = None,
+    user_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run a chat message through the object built in this worker, building it only if the worker lost it.
+
+    The worker has no websocket for the client, so the message runs without
+    streaming callbacks and only the final result is sent back.
+    """
+    from langflow.api.v1.schemas import ChatMessage
+    from langflow.services.chat.utils import process_graph
+    from langflow.utils.payload import get_root_vertex
+
+    graph = cache.get_graph(flow_hash, build_id, graph_data)
+    root_vertex = get_root_vertex(graph)
+    if root_vertex is None:
+        raise ValueError(f"No root vertex found in flow {flow_hash}")
+    build_result = await root_vertex.build(user_id=UUID(user_id) if user_id else None)
+    result, intermediate_steps, _ = await process_graph(
+        build_result=build_result,
+        chat_inputs=ChatMessage(message=inputs),
+        client_id=client_id,
+        session_id=session_id,
+        stream=False,
+    )
+    return orjson.loads(orjson.dumps({"result": result, "intermediate_steps": intermediate_steps}, default=str))
+
+
+async def send_task(task, *args, worker: Optional[str] = None, timeout: Optional[float] = None, **kwargs):
+    """
+    Run a task and wait for its result. If worker is given the task is sent
+    to the direct queue of that worker instead of the shared queue.
+    """
+    options = {}
+    if worker:
+        from celery.utils.nodenames import worker_direct  # type: ignore
+
+        options["queue"] = worker_direct(worker)
+    # Publishing to the broker is network I/O, so it runs in the thread pool
+    result = await run_in_thread_pool(task.apply_async, args=args, kwargs=kwargs, **options)
+    return await wait_for_task_result(result, timeout=timeout)
+
+
+class DistributedGraphBuilder:
+    """
+    API side of the distributed build.
+
+    Vertices are built by Celery workers from the flow payload, which is sent
+    with the first task of each flow and then referred to by its content hash.
+    The first task goes to any worker and the rest of the build is sent to the
+    direct queue of that worker, so the whole flow is built once, in one place.
+    Tasks are awaited by polling the result backend, so the event loop is
+    never blocked.
+    """
+
+    def __init__(self, build_task, graph_data: Dict[str, Any], build_id: str, user_id: Optional[Any] = None):
+        self.build_task = build_task
+        self.graph_data = graph_data
+        self.flow_hash = compute_dict_hash(graph_data)
+        self.build_id = build_id
+        self.user_id = str(user_id) if user_id else None
+        self._payload_sent = False
+        # Hostname of the worker that holds the build
+        self.worker: Optional[str] = None
+
+    async def build_vertex(self, vertex_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        graph_data = None if self._payload_sent else self.graph_data
+        try:
+            handle = await self._run(vertex_id, graph_data, timeout)
+        except GraphNotCachedError:
+            # The task went to a worker that never received this flow
+            logger.debug(f"Resending flow {self.flow_hash} to the worker")
+            handle = await self._run(vertex_id, self.graph_data, timeout)
+        self._payload_sent = True
+        self.worker = self.worker or handle.get("worker")
+        return handle
+
+    async def _run(self, vertex_id: str, graph_data: Optional[Dict[str, Any]], timeout: Optional[float]):
+        return await send_task(
+            self.build_task,
+            self.flow_hash,
+            self.build_id,
+            vertex_id,
+            worker=self.worker,
+            timeout=timeout,
+            graph_data=graph_data,
+            user_id=self.user_id,
+        )
+
+    def build_record(self) -> Dict[str, Any]:
+        """Where the build lives, shared with the other API servers so chat messages go to that worker."""
+        return {"flow_hash": self.flow_hash, "build_id": self.build_id, "worker": self.worker}
+
+
+class RemoteBuildResult:
+    """
+    Build result of a flow that was built by a Celery worker.
+
+    The built object stays in the worker, chat messages are sent to it
+    instead of rebuilding the flow in the API.
+    """
+
+    def __init__(
+        self,
+        process_task,
+        graph_data: Dict[str, Any],
+        flow_hash: str,
+        build_id: str,
+        worker: Optional[str] = None,
+        user_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.process_task = process_task
+        self.graph_data = graph_data
+        self.flow_hash = flow_hash
+        self.build_id = build_id
+        self.worker = worker
+        self.user_id = user_id
+        self.timeout = timeout
+
+    async def process(self, chat_inputs: "ChatMessage", client_id: str, session_id: str):
+        """Run a chat message in the worker. Returns the result, the intermediate steps and the raw output."""
+        try:
+            output = await self._run(chat_inputs, client_id, session_id, None)
+        except GraphNotCachedError:
+            # The worker was restarted or evicted the flow, so it builds it again
+            logger.debug(f"Resending flow {self.flow_hash} to the worker")
+            output = await self._run(chat_inputs, client_id, session_id, self.graph_data)
+        return output["result"], output["intermediate_steps"], output["result"]
+
+    async def _run(self, chat_inputs: "ChatMessage", client_id: str, session_id: str, graph_data):
+        return await send_task(
+            self.process_task,
+            self.flow_hash,
+            self.build_id,
+            chat_inputs.message,
+            client_id,
+            session_id,
+            worker=self.worker,
+            timeout=self.timeout,
+            graph_data=graph_data,
+            user_id=self.user_id,
+        )
@@ -1,11 +1,16 @@
+from typing import TYPE_CHECKING
+
 from langflow.services.task.service import TaskService
 from langflow.services.factory import ServiceFactory
 
+if TYPE_CHECKING:
+    from langflow.services.metrics.service import MetricsService
+    from langflow.services.settings.service import SettingsService
+
 
 class TaskServiceFactory(ServiceFactory):
     def __init__(self):
         super().__init__(TaskService)
 
-    def create(self):
-        # Here you would have logic to create and configure a TaskService
-        return TaskService()
+    def create(self, settings_service: "SettingsService", metrics_service: "MetricsService"):
+        return TaskService(settings_service, metrics_service)
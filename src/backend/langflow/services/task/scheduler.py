@@ -0,0 +1,207 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Deque, Dict, Optional, Tuple
+
+from langflow.services.task.backends.base import TaskQueueFullError
+
+if TYPE_CHECKING:
+    from langflow.services.metrics.service import MetricsService
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITY_CLASSES = (INTERACTIVE, BATCH)
+ANONYMOUS_OWNER = "anonymous"
+
+FlowKey = Tuple[str, str]
+
+
+class Ticket:
+    """A request for an execution slot."""
+
+    def __init__(self, owner: str, priority: str, start_tag: float):
+        self.owner = owner
+        self.priority = priority
+        self.start_tag = start_tag
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self._future: Optional[asyncio.Future] = None
+
+    @property
+    def flow(self) -> FlowKey:
+        return (self.priority, self.owner)
+
+
+class FairScheduler:
+    """
+    Hands out a fixed number of execution slots using start-time fair queuing.
+
+    Every (priority class, owner) pair is a flow. A waiting ticket is tagged
+    with max(virtual time, last tag of its flow) + 1 / weight of its class and
+    free slots go to the eligible ticket with the smallest tag. Owners share the
+    slots evenly and a class with twice the weight gets twice as many slots
+    when both are waiting. An owner never holds more than owner_limit slots.
+
+    Example:
+
+        scheduler = FairScheduler(capacity=4, owner_limit=2)
+        async with scheduler.slot(owner=str(user.id), priority=INTERACTIVE):
+            await run_flow()
+    """
+
+    def __init__(
+        self,
+        capacity: int = 4,
+        owner_limit: int = 0,
+        weights: Optional[Dict[str, float]] = None,
+        max_waiting: int = 0,
+        metrics_service: Optional["MetricsService"] = None,
+    ):
+        """
+        Args:
+            capacity: Number of slots.
+            owner_limit: Maximum slots held by one owner. 0 means no limit.
+            weights: Weight of each priority class.
+            max_waiting: Maximum number of waiting tickets. 0 means no limit.
+            metrics_service: Where the queue wait and depth of each class are recorded.
+        """
+        self.capacity = capacity
+        self.owner_limit = owner_limit
+        self.weights = weights or {INTERACTIVE: 4, BATCH: 1}
+        self.max_waiting = max_waiting
+        self.metrics_service = metrics_service
+        self._waiting: Dict[FlowKey, Deque[Ticket]] = {}
+        self._last_tags: Dict[FlowKey, float] = {}
+        self._running: Dict[str, int] = {}
+        self._in_use = 0
+        self._virtual_time = 0.0
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    def waiting_count(self, priority: Optional[str] = None) -> int:
+        return sum(
+            len(tickets)
+            for (ticket_priority, _), tickets in self._waiting.items()
+            if priority is None or ticket_priority == priority
+        )
+
+    def submit(self, owner: Optional[str] = None, priority: str = BATCH) -> Ticket:
+        """
+        Queue a request for a slot. Use wait() to get it.
+
+        Raises:
+            ValueError: If the priority class is unknown.
+            TaskQueueFullError: If max_waiting tickets are already waiting.
+        """
+        if priority not in self.weights:
+            raise ValueError(f"Unknown priority class {priority}. Expected one of {list(self.weights)}")
+        if self.max_waiting and self.waiting_count() >= self.max_waiting:
+            raise TaskQueueFullError(f"Task queue is full ({self.max_waiting} waiting tasks)")
+        flow = (priority, owner or ANONYMOUS_OWNER)
+        start_tag = max(self._virtual_time, self._last_tags.get(flow, 0.0))
+        self._last_tags[flow] = start_tag + 1 / self.weights[priority]
+        ticket = Ticket(flow[1], priority, start_tag)
+        self._waiting.setdefault(flow, deque()).append(ticket)
+        self._record_depth(priority)
+        self._dispatch()
+        return ticket
+
+    async def wait(self, ticket: Ticket):
+        """Wait until the ticket is granted a slot. Cancelling the wait withdraws the ticket."""
+        if not ticket.granted:
+            ticket._future = asyncio.get_running_loop().create_future()
+            try:
+                await ticket._future
+            except asyncio.CancelledError:
+                if ticket.granted:
+                    self.release(ticket)
+                else:
+                    self._withdraw(ticket)
+                raise
+        if self.metrics_service is not None:
+            self.metrics_service.record_task_queue_wait(ticket.priority, time.monotonic() - ticket.enqueued_at)
+
+    def release(self, ticket: Ticket):
+        """Give back the slot of a granted ticket or withdraw a waiting one. Releasing twice is a no-op."""
+        if not ticket.granted:
+            self._withdraw(ticket)
+            return
+        ticket.granted = False
+        self._in_use -= 1
+        running = self._running.get(ticket.owner, 0) - 1
+        if running > 0:
+            self._running[ticket.owner] = running
+        else:
+            self._running.pop(ticket.owner, None)
+        self._dispatch()
+
+    async def acquire(self, owner: Optional[str] = None, priority: str = BATCH) -> Ticket:
+        ticket = self.submit(owner, priority)
+        await self.wait(ticket)
+        return ticket
+
+    @asynccontextmanager
+    async def slot(self, owner: Optional[str] = None, priority: str = BATCH) -> AsyncIterator[Ticket]:
+        ticket = await self.acquire(owner, priority)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def clear(self):
+        """Drop every waiting ticket. Their waiters are cancelled."""
+        for tickets in self._waiting.values():
+            for ticket in tickets:
+                if ticket._future is not None and not ticket._future.done():
+                    try:
+                        ticket._future.cancel()
+                    except RuntimeError:
+                        # The loop is already closed
+                        pass
+        self._waiting.clear()
+        self._last_tags.clear()
+
+    def _withdraw(self, ticket: Ticket):
+        tickets = self._waiting.get(ticket.flow)
+        if tickets is None or ticket not in tickets:
+            return
+        tickets.remove(ticket)
+        if not tickets:
+            del self._waiting[ticket.flow]
+        self._record_depth(ticket.priority)
+
+    def _is_eligible(self, owner: str) -> bool:
+        return not self.owner_limit or self._running.get(owner, 0) < self.owner_limit
+
+    def _dispatch(self):
+        while self._in_use < self.capacity:
+            candidates = [
+                tickets[0] for (_, owner), tickets in self._waiting.items() if self._is_eligible(owner)
+            ]
+            if not candidates:
+                break
+            ticket = min(candidates, key=lambda candidate: candidate.start_tag)
+            self._withdraw(ticket)
+            self._virtual_time = max(self._virtual_time, ticket.start_tag)
+            ticket.granted = True
+            self._in_use += 1
+            self._running[ticket.owner] = self._running.get(ticket.owner, 0) + 1
+            if ticket._future is not None and not ticket._future.done():
+                ticket._future.set_result(None)
+        # Idle flows that are behind the virtual time would start from it anyway
+        for flow, tag in list(self._last_tags.items()):
+            if flow not in self._waiting and tag <= self._virtual_time:
+                del self._last_tags[flow]
+
+    def _record_depth(self, priority: str):
+        if self.metrics_service is not None:
+            self.metrics_service.set_task_queue_depth(priority, self.waiting_count(priority))
+
+    def __repr__(self):
+        return (
+            f"FairScheduler(capacity={self.capacity}, owner_limit={self.owner_limit},"
+            f" weights={self.weights}, max_waiting={self.max_waiting})"
+        )
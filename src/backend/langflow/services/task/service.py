@@ -1,12 +1,21 @@
-from typing import Any, Callable, Coroutine, Union
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Optional, Union
 
+from cachetools import TTLCache
 from langflow.services.base import Service
 from langflow.services.task.backends.anyio import AnyIOBackend
 from langflow.services.task.backends.base import TaskBackend
+from langflow.services.task.scheduler import BATCH, INTERACTIVE, FairScheduler
 from langflow.services.task.utils import get_celery_worker_status
 from langflow.utils.logger import configure
 from loguru import logger
 
+if TYPE_CHECKING:
+    from langflow.services.metrics.service import MetricsService
+    from langflow.services.settings.service import SettingsService
+
+# Number of launched tasks whose owner is remembered, to check who may cancel them
+TASK_OWNERS_SIZE = 10_000
+
 
 def check_celery_availability():
     try:
@@ -32,9 +41,22 @@ except ImportError:
 class TaskService(Service):
     name = "task_service"
 
-    def __init__(self):
+    def __init__(self, settings_service: "SettingsService", metrics_service: Optional["MetricsService"] = None):
+        self.settings_service = settings_service
+        settings = settings_service.settings
+        # With AUTO_LOGIN every request has the same owner, so a quota would cap the whole server
+        owner_limit = 0 if settings_service.auth_settings.AUTO_LOGIN else settings.TASK_OWNER_CONCURRENCY
+        self.scheduler = FairScheduler(
+            capacity=settings.TASK_CONCURRENCY or settings.ADMISSION_MAX_IN_FLIGHT,
+            owner_limit=owner_limit,
+            weights={INTERACTIVE: settings.TASK_INTERACTIVE_WEIGHT, BATCH: settings.TASK_BATCH_WEIGHT},
+            max_waiting=settings.TASK_QUEUE_SIZE,
+            metrics_service=metrics_service,
+        )
         self.backend = self.get_backend()
         self.use_celery = USE_CELERY
+        # task id -> owner, kept as long as the task results
+        self.task_owners: TTLCache = TTLCache(maxsize=TASK_OWNERS_SIZE, ttl=settings.TASK_RESULT_TTL)
 
     @property
     def backend_name(self) -> str:
@@ -45,9 +67,9 @@ class TaskService(Service):
             from langflow.services.task.backends.celery import CeleryBackend
 
             logger.debug("Using Celery backend")
-            return CeleryBackend()
+            return CeleryBackend(self.scheduler)
         logger.debug("Using AnyIO backend")
-        return AnyIOBackend()
+        return AnyIOBackend(self.scheduler, result_ttl=self.settings_service.settings.TASK_RESULT_TTL)
 
     # In your TaskService class
     async def launch_and_await_task(
@@ -68,11 +90,38 @@ class TaskService(Service):
             result = await result
         return task.id, result
 
-    async def launch_task(self, task_func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    async def launch_task(
+        self,
+        task_func: Callable[..., Any],
+        *args: Any,
+        owner: Optional[str] = None,
+        priority: str = BATCH,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Launch a task in the background. It runs once the scheduler grants it a slot.
+
+        Args:
+            owner: The user the task is accounted to for the concurrency quota.
+            priority: The priority class of the task, interactive or batch.
+        """
         logger.debug(f"Launching task {task_func} with args {args} and kwargs {kwargs}")
         logger.debug(f"Using backend {self.backend}")
-        task = self.backend.launch_task(task_func, *args, **kwargs)
-        return await task if isinstance(task, Coroutine) else task
+        task = self.backend.launch_task(task_func, *args, owner=owner, priority=priority, **kwargs)
+        task_id, task_result = await task if isinstance(task, Coroutine) else task
+        if task_id is not None and owner is not None:
+            self.task_owners[task_id] = owner
+        return task_id, task_result
+
+    def get_task_owner(self, task_id: str) -> Optional[str]:
+        return self.task_owners.get(task_id)
 
     def get_task(self, task_id: Union[int, str]) -> Any:
         return self.backend.get_task(task_id)
+
+    def cancel_task(self, task_id: str) -> bool:
+        return self.backend.cancel_task(task_id)
+
+    def teardown(self):
+        self.backend.teardown()
+        self.scheduler.clear()
@@ -1,7 +1,15 @@
+import asyncio
 import contextlib
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional
+
+from fastapi import HTTPException, status
+
+from langflow.services.task.backends.base import TaskQueueFullError
 
 if TYPE_CHECKING:
+    from langflow.services.task.service import TaskService
+
     with contextlib.suppress(ImportError):
         from celery import Celery  # type: ignore
 
@@ -20,3 +28,33 @@ def get_celery_worker_status(app: "Celery"):
         "active_tasks": active_tasks,
         "scheduled_tasks": scheduled_tasks,
     }
+
+
+async def wait_for_task_result(task, poll_interval: float = 0.1, timeout: Optional[float] = None) -> Any:
+    """
+    Wait for a Celery task without blocking the event loop.
+
+    The result backend is polled every poll_interval seconds. Raises the
+    exception of the task if it failed and TimeoutError after timeout seconds.
+    """
+    from langflow.utils.concurrency import run_in_thread_pool
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while not await run_in_thread_pool(task.ready):
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError(f"Task {task.id} did not finish in {timeout} seconds")
+        await asyncio.sleep(poll_interval)
+    return await run_in_thread_pool(task.get, propagate=True)
+
+
+@contextlib.asynccontextmanager
+async def scheduler_slot(task_service: "TaskService", owner: Optional[str], priority: str) -> AsyncIterator[None]:
+    """Wait for a slot of the task scheduler to run a flow inline, or reject the request with a 429."""
+    try:
+        ticket = await task_service.scheduler.acquire(owner, priority)
+    except TaskQueueFullError as exc:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(exc)) from exc
+    try:
+        yield
+    finally:
+        task_service.scheduler.release(ticket)
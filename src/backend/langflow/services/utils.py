@@ -10,16 +10,21 @@ from .deps import get_db_service, get_session, get_settings_service
 
 
 def get_factories_and_deps():
+    from langflow.services.admission import factory as admission_factory
     from langflow.services.auth import factory as auth_factory
     from langflow.services.cache import factory as cache_factory
     from langflow.services.chat import factory as chat_factory
     from langflow.services.credentials import factory as credentials_factory
     from langflow.services.database import factory as database_factory
+    from langflow.services.llm_cache import factory as llm_cache_factory
+    from langflow.services.metrics import factory as metrics_factory
     from langflow.services.plugins import factory as plugins_factory
+    from langflow.services.result_cache import factory as result_cache_factory
     from langflow.services.session import factory as session_service_factory  # type: ignore
     from langflow.services.settings import factory as settings_factory
     from langflow.services.store import factory as store_factory
     from langflow.services.task import factory as task_factory
+    from langflow.services.write_behind import factory as write_behind_factory
 
     return [
         (settings_factory.SettingsServiceFactory(), []),
@@ -35,8 +40,8 @@ def get_factories_and_deps():
             cache_factory.CacheServiceFactory(),
             [ServiceType.SETTINGS_SERVICE],
         ),
-        (chat_factory.ChatServiceFactory(), []),
-        (task_factory.TaskServiceFactory(), []),
+        (chat_factory.ChatServiceFactory(), [ServiceType.SETTINGS_SERVICE]),
+        (task_factory.TaskServiceFactory(), [ServiceType.SETTINGS_SERVICE, ServiceType.METRICS_SERVICE]),
         (
             session_service_factory.SessionServiceFactory(),
             [ServiceType.CACHE_SERVICE],
@@ -44,6 +49,20 @@ def get_factories_and_deps():
         (plugins_factory.PluginServiceFactory(), [ServiceType.SETTINGS_SERVICE]),
         (store_factory.StoreServiceFactory(), [ServiceType.SETTINGS_SERVICE]),
         (credentials_factory.CredentialServiceFactory(), [ServiceType.SETTINGS_SERVICE]),
+        (metrics_factory.MetricsServiceFactory(), [ServiceType.SETTINGS_SERVICE]),
+        (
+            write_behind_factory.WriteBehindServiceFactory(),
+            [ServiceType.SETTINGS_SERVICE, ServiceType.DATABASE_SERVICE],
+        ),
+        (admission_factory.AdmissionServiceFactory(), [ServiceType.SETTINGS_SERVICE, ServiceType.METRICS_SERVICE]),
+        (
+            result_cache_factory.ResultCacheServiceFactory(),
+            [ServiceType.SETTINGS_SERVICE, ServiceType.METRICS_SERVICE],
+        ),
+        (
+            llm_cache_factory.LLMCacheServiceFactory(),
+            [ServiceType.SETTINGS_SERVICE, ServiceType.METRICS_SERVICE],
+        ),
     ]
 
 
@@ -149,6 +168,12 @@ def teardown_services():
     """
     Teardown all the services.
     """
+    try:
+        # Drain the pending writes while the database is still available
+        if write_behind_service := service_manager.services.get(ServiceType.WRITE_BEHIND_SERVICE):
+            write_behind_service.teardown()
+    except Exception as exc:
+        logger.exception(exc)
     try:
         teardown_superuser(get_settings_service(), next(get_session()))
     except Exception as exc:
@@ -173,11 +198,16 @@ def initialize_session_service():
     Initialize the session manager.
     """
     from langflow.services.cache import factory as cache_factory
+    from langflow.services.metrics import factory as metrics_factory
     from langflow.services.session import factory as session_service_factory  # type: ignore
 
     initialize_settings_service()
 
     service_manager.register_factory(cache_factory.CacheServiceFactory(), dependencies=[ServiceType.SETTINGS_SERVICE])
+    # Building the graph records its metrics
+    service_manager.register_factory(
+        metrics_factory.MetricsServiceFactory(), dependencies=[ServiceType.SETTINGS_SERVICE]
+    )
 
     service_manager.register_factory(
         session_service_factory.SessionServiceFactory(),
@@ -0,0 +1,24 @@
+from typing import TYPE_CHECKING
+
+from langflow.services.factory import ServiceFactory
+from langflow.services.write_behind.service import WriteBehindService
+
+if TYPE_CHECKING:
+    from langflow.services.database.service import DatabaseService
+    from langflow.services.settings.service import SettingsService
+
+
+class WriteBehindServiceFactory(ServiceFactory):
+    def __init__(self):
+        super().__init__(WriteBehindService)
+
+    def create(self, settings_service: "SettingsService", database_service: "DatabaseService"):
+        settings = settings_service.settings
+        return WriteBehindService(
+            database_service.engine,
+            workers=settings.WRITE_BEHIND_WORKERS,
+            max_queue_size=settings.WRITE_BEHIND_QUEUE_SIZE,
+            batch_size=settings.WRITE_BEHIND_BATCH_SIZE,
+            flush_interval=settings.WRITE_BEHIND_FLUSH_INTERVAL,
+            max_retries=settings.WRITE_BEHIND_MAX_RETRIES,
+        )
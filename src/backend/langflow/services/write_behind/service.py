@@ -0,0 +1,206 @@
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from loguru import logger
+from sqlmodel import Session
+
+from langflow.services.base import Service
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+# Writes the rows of a batch. Receives the session and a dict of key -> value
+# and must not commit, the service commits the rows of each handler in their own transaction.
+WriteHandler = Callable[[Session, Dict[Hashable, Any]], None]
+# Combines the pending value of a row with a new one
+MergeFunction = Callable[[Any, Any], Any]
+
+_STOP = object()
+
+
+class _FlushRequest:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class WriteBehindService(Service):
+    """
+    Runs fire-and-forget database writes on a fixed pool of worker threads.
+
+    Writes are routed to a worker by their key, so writes to the same row are
+    always handled by the same worker, in order. Each worker coalesces the
+    pending writes of a row with the merge function (the last value wins by
+    default) and writes its batch every flush_interval seconds or when
+    batch_size rows are pending. The rows of each handler are written in their
+    own transaction. When it fails they are written one by one, and the rows
+    that still fail are retried with the next batch up to max_retries times.
+
+    Example:
+
+        write_behind_service.submit(update_users_last_login_at, user.id, datetime.now(timezone.utc))
+    """
+
+    name = "write_behind_service"
+
+    def __init__(
+        self,
+        engine: "Engine",
+        workers: int = 2,
+        max_queue_size: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_retries: int = 3,
+    ):
+        if workers < 1:
+            raise ValueError("The write-behind service needs at least one worker")
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._queues: List[queue.Queue] = [queue.Queue(maxsize=max_queue_size) for _ in range(workers)]
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stopped = False
+
+    def _start(self):
+        for index, worker_queue in enumerate(self._queues):
+            thread = threading.Thread(
+                target=self._run, args=(worker_queue,), name=f"langflow-write-behind-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, handler: WriteHandler, key: Hashable, value: Any, merge: Optional[MergeFunction] = None) -> bool:
+        """
+        Queue a write without blocking, it is called from the event loop.
+        Returns False if it was dropped because the service is stopped or the queue is full.
+        """
+        with self._lock:
+            if self._stopped:
+                logger.warning(f"Write-behind service is stopped, dropping write to {key}")
+                return False
+            if not self._threads:
+                self._start()
+        worker_queue = self._queues[hash(key) % len(self._queues)]
+        try:
+            worker_queue.put_nowait((handler, key, value, merge))
+        except queue.Full:
+            logger.warning(f"Write-behind queue is full, dropping write to {key}")
+            return False
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write every pending write and wait for it. Returns False on timeout."""
+        if not self._threads:
+            return True
+        requests = []
+        for worker_queue in self._queues:
+            request = _FlushRequest()
+            try:
+                worker_queue.put(request, timeout=timeout)
+            except queue.Full:
+                return False
+            requests.append(request)
+        return all(request.done.wait(timeout) for request in requests)
+
+    def _run(self, worker_queue: queue.Queue):
+        # handler -> (key -> value)
+        pending: Dict[WriteHandler, Dict[Hashable, Any]] = {}
+        pending_rows = 0
+        # (handler, key) -> number of failed writes of the row
+        failures: Dict[Tuple[WriteHandler, Hashable], int] = {}
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(self.flush_interval - (time.monotonic() - last_flush), 0)
+            try:
+                item = worker_queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                pending, pending_rows = self._write(pending, failures)
+                if pending_rows:
+                    logger.error(f"Write-behind service stopped, dropping {pending_rows} rows that failed to write")
+                return
+            if isinstance(item, _FlushRequest):
+                pending, pending_rows = self._write(pending, failures)
+                last_flush = time.monotonic()
+                item.done.set()
+                continue
+            if item is not None:
+                handler, key, value, merge = item
+                rows = pending.setdefault(handler, {})
+                if key in rows:
+                    rows[key] = merge(rows[key], value) if merge else value
+                else:
+                    rows[key] = value
+                    pending_rows += 1
+
+            if pending_rows >= self.batch_size or time.monotonic() - last_flush >= self.flush_interval:
+                pending, pending_rows = self._write(pending, failures)
+                last_flush = time.monotonic()
+
+    def _write(
+        self, pending: Dict[WriteHandler, Dict[Hashable, Any]], failures: Dict[Tuple[WriteHandler, Hashable], int]
+    ) -> Tuple[Dict[WriteHandler, Dict[Hashable, Any]], int]:
+        """Write the pending rows. Returns the rows to retry with the next batch and their number."""
+        retry: Dict[WriteHandler, Dict[Hashable, Any]] = {}
+        retry_rows = 0
+        for handler, rows in pending.items():
+            if len(rows) > 1 and self._write_rows(handler, rows):
+                if failures:
+                    for key in rows:
+                        failures.pop((handler, key), None)
+                continue
+            # One bad row must not drop the others
+            for key, value in rows.items():
+                if self._write_rows(handler, {key: value}):
+                    failures.pop((handler, key), None)
+                    continue
+                attempts = failures.get((handler, key), 0) + 1
+                if attempts > self.max_retries:
+                    logger.error(f"Dropping the write to {key} after {attempts} failed attempts")
+                    failures.pop((handler, key), None)
+                    continue
+                failures[(handler, key)] = attempts
+                retry.setdefault(handler, {})[key] = value
+                retry_rows += 1
+        return retry, retry_rows
+
+    def _write_rows(self, handler: WriteHandler, rows: Dict[Hashable, Any]) -> bool:
+        try:
+            with Session(self.engine) as session:
+                handler(session, rows)
+                session.commit()
+            return True
+        except Exception as exc:
+            logger.error(f"Error writing {len(rows)} rows with {getattr(handler, '__name__', handler)}: {exc}")
+            return False
+
+    def pending_writes(self) -> int:
+        """Approximate number of writes waiting in the queues."""
+        return sum(worker_queue.qsize() for worker_queue in self._queues)
+
+    def teardown(self):
+        """Stop accepting writes and drain the queues."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+        for worker_queue in self._queues:
+            worker_queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+
+def merge_counters(old: Tuple[int, Any], new: Tuple[int, Any]) -> Tuple[int, Any]:
+    """Merge (count, timestamp) values by adding the counts and keeping the latest timestamp."""
+    return old[0] + new[0], max(old[1], new[1])
+
+
+def merge_lists(old: List[Any], new: List[Any]) -> List[Any]:
+    """Merge list values by appending the new items to the pending ones."""
+    return old + new
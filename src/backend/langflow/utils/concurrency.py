@@ -0,0 +1,45 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """
+    Return the thread pool used to run sync-only objects from async code.
+
+    The pool is created on first use with PROCESS_THREAD_POOL_SIZE workers.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                from langflow.services.deps import get_settings_service
+
+                max_workers = get_settings_service().settings.PROCESS_THREAD_POOL_SIZE
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="langflow-process")
+    return _executor
+
+
+async def run_in_thread_pool(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a sync function in the thread pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    # Copy the context so context variables (e.g. callbacks) are visible in the thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_thread_pool(), functools.partial(context.run, func, *args, **kwargs))
+
+
+def shutdown_thread_pool(wait: bool = True):
+    """Shut down the thread pool. It is created again on next use."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
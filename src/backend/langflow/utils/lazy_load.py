@@ -1,6 +1,7 @@
 class LazyLoadDictBase:
     def __init__(self):
         self._all_types_dict = None
+        self._type_index = None
 
     @property
     def all_types_dict(self):
@@ -8,7 +9,24 @@ class LazyLoadDictBase:
             self._all_types_dict = self._build_dict()
         return self._all_types_dict
 
-    def _build_dict(self):
+    @property
+    def type_index(self):
+        if self._type_index is None:
+            self._type_index = self._build_type_index()
+        return self._type_index
+
+    def refresh(self, type_dict=None):
+        """
+        Drops the types dict and its index so they are built again on the next access,
+        or builds the dict from type_dict when the caller already has the result of get_type_dict.
+        """
+        self._all_types_dict = None if type_dict is None else self._build_dict(type_dict)
+        self._type_index = None
+
+    def _build_dict(self, type_dict=None):
+        raise NotImplementedError
+
+    def _build_type_index(self):
         raise NotImplementedError
 
     def get_type_dict(self):
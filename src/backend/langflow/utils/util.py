@@ -1,8 +1,9 @@
 import re
 import inspect
 import importlib
-from functools import wraps
-from typing import List, Optional, Dict, Any, Union
+import importlib.metadata
+from functools import lru_cache, wraps
+from typing import Callable, List, Optional, Dict, Any, Tuple, Union
 
 from docstring_parser import parse
 
@@ -10,102 +11,145 @@ from langflow.template.frontend_node.constants import FORCE_SHOW_FIELDS
 from langflow.utils import constants
 from langchain.schema import Document
 
+# Templates built from classes, keyed by the class, the version of its library and how they were built
+_TEMPLATE_CACHE: Dict[tuple, Dict[str, Any]] = {}
+
 
 def remove_ansi_escape_codes(text):
     return re.sub(r"\x1b\[[0-9;]*[a-zA-Z]", "", text)
 
 
+@lru_cache
+def get_library_version(module: str) -> Optional[str]:
+    """Returns the version of the distribution of the top level package of module, if it is installed."""
+    try:
+        return importlib.metadata.version(module.split(".")[0])
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def get_cached_template(_class, key: tuple, build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Returns a copy of the template of _class built by build, building it only the first time.
+
+    The copy goes down to the fields, as the creators change the templates they get.
+    """
+    cache_key = (_class.__module__, _class.__qualname__, get_library_version(_class.__module__), *key)
+    if (template := _TEMPLATE_CACHE.get(cache_key)) is None:
+        template = _TEMPLATE_CACHE[cache_key] = build()
+    return {
+        **template,
+        "template": {
+            key: dict(value) if isinstance(value, dict) else value for key, value in template["template"].items()
+        },
+        "base_classes": list(template["base_classes"]),
+    }
+
+
+def clear_template_cache():
+    _TEMPLATE_CACHE.clear()
+
+
+def find_class(
+    name: str, type_to_cls_dict: Dict, get_class: Callable[[Any], Any] = lambda item: item
+) -> Tuple[str, Any]:
+    """Returns the type and the class named name in type_to_cls_dict, or raises a ValueError."""
+    for _type, item in type_to_cls_dict.items():
+        _class = get_class(item)
+        if _class.__name__ == name:
+            return _type, _class
+    raise ValueError(f"{name} not found.")
+
+
 def build_template_from_function(name: str, type_to_loader_dict: Dict, add_function: bool = False):
-    classes = [item.__annotations__["return"].__name__ for item in type_to_loader_dict.values()]
-
-    # Raise error if name is not in chains
-    if name not in classes:
-        raise ValueError(f"{name} not found")
-
-    for _type, v in type_to_loader_dict.items():
-        if v.__annotations__["return"].__name__ == name:
-            _class = v.__annotations__["return"]
-
-            # Get the docstring
-            docs = parse(_class.__doc__)
-
-            variables = {"_type": _type}
-            for class_field_items, value in _class.model_fields.items():
-                if class_field_items in ["callback_manager"]:
-                    continue
-                variables[class_field_items] = {}
-                for name_, value_ in value.__repr_args__():
-                    if name_ == "default_factory":
-                        try:
-                            variables[class_field_items]["default"] = get_default_factory(
-                                module=_class.__base__.__module__, function=value_
-                            )
-                        except Exception:
-                            variables[class_field_items]["default"] = None
-                    elif name_ not in ["name"]:
-                        variables[class_field_items][name_] = value_
-
-                variables[class_field_items]["placeholder"] = (
-                    docs.params[class_field_items] if class_field_items in docs.params else ""
-                )
-            # Adding function to base classes to allow
-            # the output to be a function
-            base_classes = get_base_classes(_class)
-            if add_function:
-                base_classes.append("Callable")
-
-            return {
-                "template": format_dict(variables, name),
-                "description": docs.short_description or "",
-                "base_classes": base_classes,
-            }
+    _type, _class = find_class(name, type_to_loader_dict, lambda loader: loader.__annotations__["return"])
+    return get_cached_template(
+        _class,
+        ("function", _type, add_function),
+        lambda: _build_template_from_function(name, _type, _class, add_function),
+    )
 
 
-def build_template_from_class(name: str, type_to_cls_dict: Dict, add_function: bool = False):
-    classes = [item.__name__ for item in type_to_cls_dict.values()]
-
-    # Raise error if name is not in chains
-    if name not in classes:
-        raise ValueError(f"{name} not found.")
-
-    for _type, v in type_to_cls_dict.items():
-        if v.__name__ == name:
-            _class = v
-
-            # Get the docstring
-            docs = parse(_class.__doc__)
-
-            variables = {"_type": _type}
-
-            if "__fields__" in _class.__dict__:
-                for class_field_items, value in _class.__fields__.items():
-                    if class_field_items in ["callback_manager"]:
-                        continue
-                    variables[class_field_items] = {}
-                    for name_, value_ in value.__repr_args__():
-                        if name_ == "default_factory":
-                            try:
-                                variables[class_field_items]["default"] = get_default_factory(
-                                    module=_class.__base__.__module__, function=value_
-                                )
-                            except Exception:
-                                variables[class_field_items]["default"] = None
-                        elif name_ not in ["name"]:
-                            variables[class_field_items][name_] = value_
-
-                    variables[class_field_items]["placeholder"] = (
-                        docs.params[class_field_items] if class_field_items in docs.params else ""
+def _build_template_from_function(name: str, _type: str, _class, add_function: bool):
+    # Get the docstring
+    docs = parse(_class.__doc__)
+
+    variables = {"_type": _type}
+    for class_field_items, value in _class.model_fields.items():
+        if class_field_items in ["callback_manager"]:
+            continue
+        variables[class_field_items] = {}
+        for name_, value_ in value.__repr_args__():
+            if name_ == "default_factory":
+                try:
+                    variables[class_field_items]["default"] = get_default_factory(
+                        module=_class.__base__.__module__, function=value_
                     )
-            base_classes = get_base_classes(_class)
-            # Adding function to base classes to allow
-            # the output to be a function
-            if add_function:
-                base_classes.append("Callable")
-            return {
-                "template": format_dict(variables, name),
-                "description": docs.short_description or "",
-                "base_classes": base_classes,
-            }
+                except Exception:
+                    variables[class_field_items]["default"] = None
+            elif name_ not in ["name"]:
+                variables[class_field_items][name_] = value_
+
+        variables[class_field_items]["placeholder"] = (
+            docs.params[class_field_items] if class_field_items in docs.params else ""
+        )
+    # Adding function to base classes to allow
+    # the output to be a function
+    base_classes = get_base_classes(_class)
+    if add_function:
+        base_classes.append("Callable")
+
+    return {
+        "template": format_dict(variables, name),
+        "description": docs.short_description or "",
+        "base_classes": base_classes,
+    }
+
+
+def build_template_from_class(name: str, type_to_cls_dict: Dict, add_function: bool = False):
+    _type, _class = find_class(name, type_to_cls_dict)
+    return get_cached_template(
+        _class,
+        ("class", _type, add_function),
+        lambda: _build_template_from_class(name, _type, _class, add_function),
+    )
+
+
+def _build_template_from_class(name: str, _type: str, _class, add_function: bool):
+    # Get the docstring
+    docs = parse(_class.__doc__)
+
+    variables = {"_type": _type}
+
+    if "__fields__" in _class.__dict__:
+        for class_field_items, value in _class.__fields__.items():
+            if class_field_items in ["callback_manager"]:
+                continue
+            variables[class_field_items] = {}
+            for name_, value_ in value.__repr_args__():
+                if name_ == "default_factory":
+                    try:
+                        variables[class_field_items]["default"] = get_default_factory(
+                            module=_class.__base__.__module__, function=value_
+                        )
+                    except Exception:
+                        variables[class_field_items]["default"] = None
+                elif name_ not in ["name"]:
+                    variables[class_field_items][name_] = value_
+
+            variables[class_field_items]["placeholder"] = (
+                docs.params[class_field_items] if class_field_items in docs.params else ""
+            )
+    base_classes = get_base_classes(_class)
+    # Adding function to base classes to allow
+    # the output to be a function
+    if add_function:
+        base_classes.append("Callable")
+    return {
+        "template": format_dict(variables, name),
+        "description": docs.short_description or "",
+        "base_classes": base_classes,
+    }
 
 
 def build_template_from_method(
@@ -114,57 +158,57 @@ def build_template_from_method(
     type_to_cls_dict: Dict,
     add_function: bool = False,
 ):
-    classes = [item.__name__ for item in type_to_cls_dict.values()]
-
-    # Raise error if class_name is not in classes
-    if class_name not in classes:
-        raise ValueError(f"{class_name} not found.")
-
-    for _type, v in type_to_cls_dict.items():
-        if v.__name__ == class_name:
-            _class = v
-
-            # Check if the method exists in this class
-            if not hasattr(_class, method_name):
-                raise ValueError(f"Method {method_name} not found in class {class_name}")
-
-            # Get the method
-            method = getattr(_class, method_name)
-
-            # Get the docstring
-            docs = parse(method.__doc__)
-
-            # Get the signature of the method
-            sig = inspect.signature(method)
-
-            # Get the parameters of the method
-            params = sig.parameters
-
-            # Initialize the variables dictionary with method parameters
-            variables = {
-                "_type": _type,
-                **{
-                    name: {
-                        "default": param.default if param.default != param.empty else None,
-                        "type": param.annotation if param.annotation != param.empty else None,
-                        "required": param.default == param.empty,
-                    }
-                    for name, param in params.items()
-                    if name not in ["self", "kwargs", "args"]
-                },
-            }
+    _type, _class = find_class(class_name, type_to_cls_dict)
 
-            base_classes = get_base_classes(_class)
+    # Check if the method exists in this class
+    if not hasattr(_class, method_name):
+        raise ValueError(f"Method {method_name} not found in class {class_name}")
 
-            # Adding function to base classes to allow the output to be a function
-            if add_function:
-                base_classes.append("Callable")
+    return get_cached_template(
+        _class,
+        ("method", method_name, _type, add_function),
+        lambda: _build_template_from_method(class_name, method_name, _type, _class, add_function),
+    )
 
-            return {
-                "template": format_dict(variables, class_name),
-                "description": docs.short_description or "",
-                "base_classes": base_classes,
+
+def _build_template_from_method(class_name: str, method_name: str, _type: str, _class, add_function: bool):
+    # Get the method
+    method = getattr(_class, method_name)
+
+    # Get the docstring
+    docs = parse(method.__doc__)
+
+    # Get the signature of the method
+    sig = inspect.signature(method)
+
+    # Get the parameters of the method
+    params = sig.parameters
+
+    # Initialize the variables dictionary with method parameters
+    variables = {
+        "_type": _type,
+        **{
+            name: {
+                "default": param.default if param.default != param.empty else None,
+                "type": param.annotation if param.annotation != param.empty else None,
+                "required": param.default == param.empty,
             }
+            for name, param in params.items()
+            if name not in ["self", "kwargs", "args"]
+        },
+    }
+
+    base_classes = get_base_classes(_class)
+
+    # Adding function to base classes to allow the output to be a function
+    if add_function:
+        base_classes.append("Callable")
+
+    return {
+        "template": format_dict(variables, class_name),
+        "description": docs.short_description or "",
+        "base_classes": base_classes,
+    }
 
 
 def get_base_classes(cls):
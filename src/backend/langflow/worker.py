@@ -6,6 +6,7 @@ from langflow.core.celery_app import celery_app
 from langflow.processing.process import Result, generate_result, process_inputs
 from langflow.services.deps import get_session_service
 from langflow.services.manager import initialize_session_service
+from langflow.services.task.distributed import CompiledGraphCache, build_cached_vertex, process_cached_graph
 from loguru import logger
 from rich import print
 
@@ -31,6 +32,62 @@ def build_vertex(self, vertex: "Vertex") -> "Vertex":
         raise self.retry(exc=SoftTimeLimitExceeded("Task took too long"), countdown=2) from e
 
 
+# Flows received by this worker, shared by every task it runs
+compiled_graph_cache = CompiledGraphCache()
+
+
+@celery_app.task(bind=True, soft_time_limit=30, max_retries=3)
+def build_graph_vertex(
+    self,
+    flow_hash: str,
+    build_id: str,
+    vertex_id: str,
+    graph_data: Optional[Dict[str, Any]] = None,
+    user_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Build a vertex and the subgraph it depends on, from the flow cached in this worker.
+
+    graph_data is only sent with the first task of a flow. Returns a lightweight
+    handle describing the build, the built object stays in the worker, whose
+    hostname is in the handle so the rest of the build is sent to it.
+    """
+    try:
+        handle = async_to_sync(build_cached_vertex, force_new_loop=True)(
+            compiled_graph_cache, flow_hash, build_id, vertex_id, graph_data=graph_data, user_id=user_id
+        )
+    except SoftTimeLimitExceeded as e:
+        raise self.retry(exc=SoftTimeLimitExceeded("Task took too long"), countdown=2) from e
+    handle["worker"] = self.request.hostname
+    return handle
+
+
+@celery_app.task(bind=True)
+def process_built_graph(
+    self,
+    flow_hash: str,
+    build_id: str,
+    inputs: Union[dict, str],
+    client_id: str,
+    session_id: str,
+    graph_data: Optional[Dict[str, Any]] = None,
+    user_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run a chat message through a flow built by build_graph_vertex in this worker.
+    """
+    return async_to_sync(process_cached_graph, force_new_loop=True)(
+        compiled_graph_cache,
+        flow_hash,
+        build_id,
+        inputs,
+        client_id,
+        session_id,
+        graph_data=graph_data,
+        user_id=user_id,
+    )
+
+
 @celery_app.task(acks_late=True)
 def process_graph_cached_task(
     data_graph: Dict[str, Any],
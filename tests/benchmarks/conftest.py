@@ -0,0 +1,23 @@
+import pytest
+
+from tests.benchmarks.flows import make_flow
+
+# Number of components of the synthetic flows
+SIZES = [10, 100, 1000]
+# Levels of group nodes around each column of the synthetic flows
+NESTING = [0, 2, 8]
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"{size}_nodes")
+def size(request):
+    return request.param
+
+
+@pytest.fixture(params=NESTING, ids=lambda nesting: f"nesting_{nesting}")
+def nesting(request):
+    return request.param
+
+
+@pytest.fixture
+def synthetic_flow(size, nesting):
+    return make_flow(size, nesting)
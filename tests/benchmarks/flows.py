@@ -0,0 +1,140 @@
+"""Synthetic flows for the benchmarks, built from custom components that use fake LLMs."""
+import copy
+from functools import lru_cache
+from typing import Any, Dict, List
+
+FAKE_LLM_CODE = '''
+from langchain.llms.fake import FakeListLLM
+from langchain_core.language_models import BaseLanguageModel
+
+from langflow import CustomComponent
+
+
+class FakeLLMComponent(CustomComponent):
+    display_name = "Fake LLM"
+
+    def build(self, response: str = "Hello from the fake LLM") -> BaseLanguageModel:
+        return FakeListLLM(responses=[response])
+'''
+
+STEP_CODE = '''
+from langchain_core.language_models import BaseLanguageModel
+
+from langflow import CustomComponent
+
+
+class StepComponent(CustomComponent):
+    display_name = "Step"
+
+    def build(self, llm: BaseLanguageModel) -> BaseLanguageModel:
+        return llm
+'''
+
+CHAIN_CODE = '''
+from typing import List
+
+from langchain.chains import LLMChain
+from langchain.prompts import PromptTemplate
+from langchain_core.language_models import BaseLanguageModel
+
+from langflow import CustomComponent
+
+
+class ChainComponent(CustomComponent):
+    display_name = "Chain"
+
+    def build(self, llms: List[BaseLanguageModel]) -> LLMChain:
+        return LLMChain(llm=llms[0], prompt=PromptTemplate.from_template("{input}"))
+'''
+
+
+@lru_cache
+def component_template(code: str) -> Dict[str, Any]:
+    from langflow.interface.custom.custom_component import CustomComponent
+    from langflow.interface.custom.utils import build_custom_component_template
+
+    return build_custom_component_template(CustomComponent(code=code))
+
+
+def make_node(node_id: str, code: str) -> Dict[str, Any]:
+    return {
+        "id": node_id,
+        "type": "genericNode",
+        "position": {"x": 0, "y": 0},
+        "data": {"id": node_id, "type": "CustomComponent", "node": copy.deepcopy(component_template(code))},
+    }
+
+
+def make_edge(source: Dict[str, Any], target: Dict[str, Any], field: str, proxy=None) -> Dict[str, Any]:
+    source_handle = {
+        "baseClasses": source["data"]["node"]["base_classes"],
+        "dataType": source["data"]["type"],
+        "id": source["id"],
+    }
+    target_handle: Dict[str, Any] = {
+        "fieldName": field,
+        "id": target["id"],
+        "inputTypes": None,
+        "type": "BaseLanguageModel",
+    }
+    if proxy is not None:
+        target_handle["proxy"] = proxy
+    return {
+        "id": f"reactflow__edge-{source['id']}-{target['id']}-{field}",
+        "source": source["id"],
+        "target": target["id"],
+        "data": {"sourceHandle": source_handle, "targetHandle": target_handle},
+    }
+
+
+def make_group(group_id: str, nodes: List[Dict], edges: List[Dict], entry: Dict[str, Any], entry_field: str):
+    """Wrap nodes in a group node whose input is proxied to the entry_field of the entry node."""
+    field_name = f"{entry_field}_{entry['id']}"
+    field = copy.deepcopy(entry["data"]["node"]["template"][entry_field])
+    field["name"] = field_name
+    field["proxy"] = {"id": entry["id"], "field": entry_field}
+    group = {
+        "id": group_id,
+        "type": "genericNode",
+        "position": {"x": 0, "y": 0},
+        "data": {
+            "id": group_id,
+            "type": "GroupNode",
+            "node": {
+                "display_name": "Group",
+                "base_classes": nodes[-1]["data"]["node"]["base_classes"],
+                "template": {field_name: field},
+                "flow": {"data": {"nodes": nodes, "edges": edges}},
+            },
+        },
+    }
+    return group, field_name
+
+
+def make_flow(size: int, nesting: int = 0) -> Dict[str, Any]:
+    """
+    Build a flow with size components: a fake LLM, a chain and size - 2 steps
+    arranged in about sqrt(size) parallel columns that all feed the chain.
+
+    With nesting > 0 each column is wrapped in that many levels of group nodes.
+    """
+    n_steps = max(size - 2, 1)
+    width = max(1, round(n_steps**0.5))
+    llm = make_node("FakeLLM", FAKE_LLM_CODE)
+    chain = make_node("Chain", CHAIN_CODE)
+    nodes, edges = [llm], []
+    for column in range(width):
+        steps = [make_node(f"Step-{column}-{row}", STEP_CODE) for row in range(column, n_steps, width)]
+        step_edges = [make_edge(source, target, "llm") for source, target in zip(steps, steps[1:])]
+        head, tail, field, proxy = steps[0], steps[-1], "llm", None
+        column_nodes = steps
+        for level in range(nesting):
+            head, field = make_group(f"Group-{column}-{level}", column_nodes, step_edges, head, field)
+            proxy = head["data"]["node"]["template"][field]["proxy"]
+            tail, column_nodes, step_edges = head, [head], []
+        nodes.extend(column_nodes)
+        edges.extend(step_edges)
+        edges.append(make_edge(llm, head, field, proxy))
+        edges.append(make_edge(tail, chain, "llms"))
+    nodes.append(chain)
+    return {"nodes": nodes, "edges": edges}
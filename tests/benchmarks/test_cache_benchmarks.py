@@ -0,0 +1,70 @@
+import gc
+import json
+import pickle
+import tracemalloc
+
+import pytest
+
+from langflow.graph import Graph
+from langflow.interface.types import build_langchain_types_dict, get_all_types_dict
+from langflow.services.deps import get_session_service, get_settings_service
+from langflow.services.session.utils import compute_dict_hash
+from tests.benchmarks.flows import make_flow
+
+pytest.importorskip("pytest_benchmark")
+
+
+def test_compute_dict_hash(benchmark, synthetic_flow):
+    assert len(benchmark(compute_dict_hash, synthetic_flow)) == 64
+
+
+def test_session_pickle_dumps(benchmark, synthetic_flow):
+    """Sessions are stored in the cache as pickled (graph, artifacts) tuples."""
+    session = (Graph.from_payload(synthetic_flow), {})
+    assert benchmark(pickle.dumps, session)
+
+
+def test_session_pickle_loads(benchmark, synthetic_flow):
+    pickled = pickle.dumps((Graph.from_payload(synthetic_flow), {}))
+    graph, _ = benchmark(pickle.loads, pickled)
+    assert graph.vertices
+
+
+# Number of sessions of the same flow kept alive to measure their memory
+SESSIONS = 20
+
+
+def test_session_memory(benchmark, size):
+    """Graphs of the sessions of a saved flow, each loaded from a fresh copy of its data."""
+    session_service = get_session_service()
+    raw = json.dumps(make_flow(size))
+
+    def load_session_graph():
+        data = session_service.get_shared_flow_data(f"memory-{size}", json.loads(raw))
+        return Graph.from_payload(data)
+
+    graphs = [load_session_graph()]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        graphs.extend(load_session_graph() for _ in range(SESSIONS))
+        gc.collect()
+        benchmark.extra_info["bytes_per_session"] = (tracemalloc.get_traced_memory()[0] - before) // SESSIONS
+    finally:
+        tracemalloc.stop()
+    graph = benchmark(load_session_graph)
+    assert graph.vertices[0]._data is graphs[0].vertices[0]._data
+
+
+def test_all_types_catalogue(benchmark):
+    """Builds the /all catalogue without the cache of the native components."""
+    settings_service = get_settings_service()
+    all_types = benchmark.pedantic(
+        get_all_types_dict,
+        args=(settings_service,),
+        setup=build_langchain_types_dict.cache_clear,
+        rounds=3,
+        iterations=1,
+    )
+    assert "chains" in all_types
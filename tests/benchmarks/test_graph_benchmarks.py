@@ -0,0 +1,69 @@
+import asyncio
+import copy
+
+import pytest
+
+from langflow.graph import Graph
+from langflow.graph.graph.utils import process_flow
+from langflow.interface.run import build_sorted_vertices
+from langflow.processing.process import process_graph_cached
+from langflow.services.deps import get_session_service
+from tests.benchmarks.flows import make_flow
+
+pytest.importorskip("pytest_benchmark")
+
+# Building runs the code of every component, so the 1000 node flow only gets a few rounds
+BUILD_SIZES = [10, 100, 1000]
+BUILD_ROUNDS = 3
+
+
+def test_graph_from_payload(benchmark, synthetic_flow):
+    graph = benchmark(Graph.from_payload, synthetic_flow)
+    assert graph.vertices
+
+
+def test_process_flow_ungrouping(benchmark, synthetic_flow):
+    flow = benchmark(process_flow, synthetic_flow)
+    assert not any(node["data"]["node"].get("flow") for node in flow["nodes"])
+
+
+def test_topological_sort(benchmark, size):
+    graph = Graph.from_payload(make_flow(size))
+    sorted_vertices = benchmark(graph.topological_sort)
+    assert len(sorted_vertices) == len(graph.vertices)
+
+
+@pytest.mark.parametrize("build_size", BUILD_SIZES, ids=lambda size: f"{size}_nodes")
+def test_build_sorted_vertices(benchmark, build_size):
+    flow = make_flow(build_size)
+    graph, _ = benchmark.pedantic(
+        lambda: asyncio.run(build_sorted_vertices(copy.deepcopy(flow))), rounds=BUILD_ROUNDS, iterations=1
+    )
+    assert all(vertex._built for vertex in graph.vertices)
+
+
+@pytest.mark.parametrize("build_size", BUILD_SIZES, ids=lambda size: f"{size}_nodes")
+def test_process_graph_cached_cold(benchmark, build_size):
+    """Each round misses the session cache and builds the whole graph."""
+    flow = make_flow(build_size)
+
+    def clear_sessions():
+        get_session_service().cache_service.clear()
+
+    result = benchmark.pedantic(
+        lambda: asyncio.run(process_graph_cached(flow, {"input": "hi"})),
+        setup=clear_sessions,
+        rounds=BUILD_ROUNDS,
+        iterations=1,
+    )
+    assert result.result == {"text": "Hello from the fake LLM"}
+
+
+@pytest.mark.parametrize("build_size", BUILD_SIZES, ids=lambda size: f"{size}_nodes")
+def test_process_graph_cached_warm(benchmark, build_size):
+    """Each round finds the built graph in the session cache."""
+    flow = make_flow(build_size)
+    asyncio.run(process_graph_cached(flow, {"input": "hi"}))
+
+    result = benchmark(lambda: asyncio.run(process_graph_cached(flow, {"input": "hi"})))
+    assert result.result == {"text": "Hello from the fake LLM"}
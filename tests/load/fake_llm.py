@@ -0,0 +1,106 @@
+"""
+An OpenAI compatible server that answers every completion with canned tokens.
+
+The latency before the first token, the delay between tokens and the number of
+tokens are configurable, so load tests measure Langflow and not the LLM.
+
+    python -m tests.load.fake_llm --port 8001 --latency 0.5 --token-delay 0.02
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from typing import AsyncIterator, List
+
+import orjson
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+WORDS = "The quick brown fox jumps over the lazy dog".split()
+
+
+def make_tokens(count: int) -> List[str]:
+    return [f"{WORDS[i % len(WORDS)]} " for i in range(count)]
+
+
+def sse(data) -> bytes:
+    return b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+def create_app(latency: float = 0.5, token_delay: float = 0.02, tokens: int = 20) -> FastAPI:
+    app = FastAPI(title="Fake LLM")
+    answer = make_tokens(tokens)
+
+    def usage(body: dict) -> dict:
+        prompt_tokens = len(orjson.dumps(body.get("messages") or body.get("prompt") or "")) // 4
+        return {"prompt_tokens": prompt_tokens, "completion_tokens": tokens, "total_tokens": prompt_tokens + tokens}
+
+    async def stream(chunk_for_token, last_chunk) -> AsyncIterator[bytes]:
+        await asyncio.sleep(latency)
+        for token in answer:
+            yield sse(chunk_for_token(token))
+            await asyncio.sleep(token_delay)
+        yield sse(last_chunk)
+        yield b"data: [DONE]\n\n"
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "fake", "object": "model", "owned_by": "langflow"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        base = {"id": f"chatcmpl-{uuid.uuid4().hex}", "created": int(time.time()), "model": body.get("model", "fake")}
+        if body.get("stream"):
+
+            def chunk(token, finish_reason=None):
+                delta = {"role": "assistant", "content": token} if token is not None else {}
+                choice = {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                return {**base, "object": "chat.completion.chunk", "choices": [choice]}
+
+            return StreamingResponse(stream(chunk, chunk(None, "stop")), media_type="text/event-stream")
+
+        await asyncio.sleep(latency + token_delay * tokens)
+        message = {"role": "assistant", "content": "".join(answer)}
+        return {
+            **base,
+            "object": "chat.completion",
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+            "usage": usage(body),
+        }
+
+    @app.post("/v1/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        base = {"id": f"cmpl-{uuid.uuid4().hex}", "created": int(time.time()), "model": body.get("model", "fake")}
+        if body.get("stream"):
+
+            def chunk(token, finish_reason=None):
+                choice = {"index": 0, "text": token or "", "logprobs": None, "finish_reason": finish_reason}
+                return {**base, "object": "text_completion", "choices": [choice]}
+
+            return StreamingResponse(stream(chunk, chunk(None, "stop")), media_type="text/event-stream")
+
+        await asyncio.sleep(latency + token_delay * tokens)
+        choice = {"index": 0, "text": "".join(answer), "logprobs": None, "finish_reason": "stop"}
+        return {**base, "object": "text_completion", "choices": [choice], "usage": usage(body)}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds before the first token.")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="Seconds between tokens.")
+    parser.add_argument("--tokens", type=int, default=20, help="Number of tokens of each answer.")
+    args = parser.parse_args()
+
+    app = create_app(latency=args.latency, token_delay=args.token_delay, tokens=args.tokens)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
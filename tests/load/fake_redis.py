@@ -0,0 +1,115 @@
+"""
+A Redis stand-in: serves an in-memory fakeredis database over TCP.
+
+It speaks enough of the Redis protocol for the cache service, the chat broker
+and Celery's broker and result backend, so they can be load tested without a
+Redis server.
+
+    python -m tests.load.fake_redis --port 6380
+"""
+import argparse
+import socketserver
+import threading
+
+from fakeredis import FakeServer
+from fakeredis._fakesocket import FakeSocket
+
+CRLF = b"\r\n"
+
+
+class RedisError(Exception):
+    """An error reply, with its prefix (e.g. NOSCRIPT) that clients use to pick the exception class."""
+
+    def __init__(self, value: str):
+        super().__init__(value)
+        self.value = value
+
+
+def encode(value) -> bytes:
+    """Encode a fakeredis response in the Redis protocol."""
+    if isinstance(value, RedisError):
+        return f"-{value.value}".encode() + CRLF
+    if value is None:
+        return b"$-1" + CRLF
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return b":%d" % value + CRLF
+    if isinstance(value, (list, tuple, set)):
+        return b"*%d" % len(value) + CRLF + b"".join(encode(item) for item in value)
+    if isinstance(value, float):
+        value = repr(value)
+    if isinstance(value, str):
+        value = value.encode()
+    return b"$%d" % len(value) + CRLF + bytes(value) + CRLF
+
+
+class TcpFakeSocket(FakeSocket):
+    """Writes the responses of a fakeredis connection to a TCP connection."""
+
+    def __init__(self, server: FakeServer, connection):
+        super().__init__(server, 0)
+        self._connection = connection
+        # Pub/sub messages are written from the threads of the publishers
+        self._write_lock = threading.Lock()
+        self._client_name = None
+
+    def _process_command(self, fields):
+        # fakeredis implements CLIENT in its redis-py connection, not in the socket
+        if fields and fields[0].lower() == b"client":
+            subcommand = fields[1].lower() if len(fields) > 1 else b""
+            if subcommand == b"setname" and len(fields) > 2:
+                self._client_name = fields[2]
+                self.put_response(b"OK")
+            elif subcommand == b"getname":
+                self.put_response(self._client_name)
+            else:
+                self.put_response(0 if subcommand == b"id" else b"OK")
+            return
+        super()._process_command(fields)
+
+    def _decode_error(self, error):
+        return RedisError(error.value)
+
+    def put_response(self, msg) -> None:
+        data = encode(msg)
+        with self._write_lock:
+            try:
+                self._connection.sendall(data)
+            except OSError:
+                pass
+
+
+class FakeRedisHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        fake_socket = TcpFakeSocket(self.server.fake_server, self.request)  # type: ignore
+        try:
+            while data := self.request.recv(65536):
+                fake_socket.sendall(data)
+        except (OSError, StopIteration):
+            pass
+        finally:
+            fake_socket.close()
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address):
+        super().__init__(address, FakeRedisHandler)
+        self.fake_server = FakeServer()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    args = parser.parse_args()
+
+    with FakeRedisServer((args.host, args.port)) as server:
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,538 @@
+"""
+Self-contained load test of Langflow.
+
+Starts a fake OpenAI compatible LLM, optionally a Redis stand-in (and a Celery
+worker using it as broker), and Langflow itself, then drives a mix of
+workloads against it for a fixed duration:
+
+    chat           messages over the chat websocket of a built flow
+    process        /process calls with sync=true
+    process_async  /process calls with sync=false, polling /task/{task_id}
+    build_stream   /build/init followed by /build/stream
+
+It reports p50/p99 latency and throughput of each workload and the RSS of the
+Langflow processes. Everything runs locally, so performance changes can be
+verified on a single Linux box:
+
+    python -m tests.load.harness --duration 60 --users 20 --workers 2 --redis
+    python -m tests.load.harness --mix process=3,chat=1 --llm-latency 1 --output results.json
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+import orjson
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+FLOW_PATH = REPO_ROOT / "tests" / "data" / "BasicChatwithPromptandHistory.json"
+WORKLOADS = ("chat", "process", "process_async", "build_stream")
+SUPERUSER = "loadtest"
+SUPERUSER_PASSWORD = "loadtest"
+MESSAGES = ["Hello, my name is Ada", "What is my name?", "Tell me a story", "Summarize our conversation"]
+
+
+@dataclass
+class Stats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    error_messages: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record_error(self, exc: BaseException):
+        self.errors += 1
+        self.error_messages[f"{type(exc).__name__}: {exc}"[:200]] += 1
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of values, q in [0, 100]."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in WORKLOADS:
+            raise argparse.ArgumentTypeError(f"Unknown workload {name}. Choose from {', '.join(WORKLOADS)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def assign_users(users: int, weights: Dict[str, float]) -> List[str]:
+    """Give each virtual user a workload, in proportion to the weights."""
+    total = sum(weights.values())
+    assignment: List[str] = []
+    for name, weight in weights.items():
+        assignment += [name] * max(1, round(users * weight / total))
+    return assignment
+
+
+def get_pythonpath() -> str:
+    # The fake services are run as modules of this package. The processes run in a temporary
+    # directory, so relative entries of PYTHONPATH are made absolute
+    paths = [str(REPO_ROOT)]
+    paths += [os.path.abspath(path) for path in os.environ.get("PYTHONPATH", "").split(os.pathsep) if path]
+    return os.pathsep.join(paths)
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def process_rss(pid: int) -> int:
+    """Resident set size of a process in bytes, 0 if it is gone."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def process_tree(pid: int) -> List[int]:
+    """The pid and the pids of all its descendants."""
+    children = defaultdict(list)
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                # The command name may contain spaces, the ppid comes after its closing parenthesis
+                ppid = int(stat.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children[ppid].append(int(entry))
+    pids, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        pids.append(current)
+        stack.extend(children.get(current, []))
+    return pids
+
+
+class Services:
+    """Starts and stops the processes under test."""
+
+    def __init__(self, args):
+        self.args = args
+        self.processes: List[subprocess.Popen] = []
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix="langflow-load-"))
+        self.llm_url = ""
+        self.base_url = ""
+        self.langflow: Optional[subprocess.Popen] = None
+        self.worker: Optional[subprocess.Popen] = None
+
+    def spawn(self, command: List[str], name: str, env: Optional[dict] = None) -> subprocess.Popen:
+        log_file = open(self.tmp_dir / f"{name}.log", "wb")
+        process = subprocess.Popen(
+            command,
+            env={**os.environ, **(env or {}), "PYTHONPATH": get_pythonpath()},
+            cwd=self.tmp_dir,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+        self.processes.append(process)
+        return process
+
+    def wait_until(self, ready, what: str, timeout: float = 120):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if any(process.poll() is not None for process in self.processes):
+                raise RuntimeError(f"A process exited while waiting for {what}. Logs are in {self.tmp_dir}")
+            try:
+                if ready():
+                    return
+            except Exception:
+                pass
+            time.sleep(0.5)
+        raise TimeoutError(f"Timed out waiting for {what}. Logs are in {self.tmp_dir}")
+
+    def start(self):
+        args = self.args
+        llm_port = get_free_port()
+        self.spawn(
+            [
+                sys.executable,
+                "-m",
+                "tests.load.fake_llm",
+                "--port",
+                str(llm_port),
+                "--latency",
+                str(args.llm_latency),
+                "--token-delay",
+                str(args.token_delay),
+                "--tokens",
+                str(args.tokens),
+            ],
+            "fake_llm",
+        )
+        self.llm_url = f"http://127.0.0.1:{llm_port}/v1"
+        self.wait_until(lambda: httpx.get(f"{self.llm_url}/models").status_code == 200, "the fake LLM")
+
+        env = {
+            "LANGFLOW_DATABASE_URL": f"sqlite:///{self.tmp_dir / 'langflow.db'}",
+            "LANGFLOW_CONFIG_DIR": str(self.tmp_dir),
+            "LANGFLOW_AUTO_LOGIN": "false",
+            "LANGFLOW_SUPERUSER": SUPERUSER,
+            "LANGFLOW_SUPERUSER_PASSWORD": SUPERUSER_PASSWORD,
+            # The default limits are tuned for production traffic, not for one box under test
+            "LANGFLOW_ADMISSION_CONTROL_ENABLED": str(args.admission_control).lower(),
+        }
+        if args.redis or args.celery:
+            redis_port = get_free_port()
+            self.spawn(
+                [sys.executable, "-m", "tests.load.fake_redis", "--port", str(redis_port)],
+                "fake_redis",
+            )
+            self.wait_until(lambda: socket.create_connection(("127.0.0.1", redis_port)).close() is None, "Redis")
+            env.update(
+                {
+                    "LANGFLOW_REDIS_HOST": "127.0.0.1",
+                    "LANGFLOW_REDIS_PORT": str(redis_port),
+                    "LANGFLOW_CACHE_TYPE": "redis",
+                    "LANGFLOW_CHAT_BROKER_TYPE": "redis",
+                }
+            )
+        if args.celery:
+            # The task service only uses Celery if a worker answers when Langflow starts
+            self.worker = self.spawn(
+                [
+                    sys.executable,
+                    "-m",
+                    "celery",
+                    "-A",
+                    "langflow.worker.celery_app",
+                    "worker",
+                    "--pool=threads",
+                    f"--concurrency={args.celery_concurrency}",
+                    "--loglevel=WARNING",
+                ],
+                "celery",
+                env={**env, "C_FORCE_ROOT": "true"},
+            )
+            self.wait_until(lambda: self.celery_ping(env), "the Celery worker")
+
+        port = get_free_port()
+        # Served like `langflow run` does on Linux: gunicorn with uvicorn workers
+        self.langflow = self.spawn(
+            [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                "langflow.main:create_app()",
+                "--worker-class",
+                "uvicorn.workers.UvicornWorker",
+                "--workers",
+                str(args.workers),
+                "--bind",
+                f"127.0.0.1:{port}",
+                "--timeout",
+                "300",
+                "--log-level",
+                "warning",
+            ],
+            "langflow",
+            env=env,
+        )
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.wait_until(lambda: httpx.get(f"{self.base_url}/health").status_code == 200, "Langflow", timeout=300)
+
+    def celery_ping(self, env) -> bool:
+        command = [sys.executable, "-m", "celery", "-A", "langflow.worker.celery_app", "inspect", "ping"]
+        env = {**os.environ, **env, "PYTHONPATH": get_pythonpath()}
+        return subprocess.run(command, env=env, capture_output=True, timeout=30).returncode == 0
+
+    def rss(self) -> Dict[str, int]:
+        """RSS of the Langflow processes (the master and its workers) and of the Celery worker."""
+        usage = {}
+        for name, process in (("langflow", self.langflow), ("celery", self.worker)):
+            if process is None:
+                continue
+            for pid in process_tree(process.pid):
+                usage[f"{name}:{pid}"] = process_rss(pid)
+        return usage
+
+    def stop(self):
+        for process in reversed(self.processes):
+            if process.poll() is None:
+                os.killpg(process.pid, signal.SIGTERM)
+        for process in self.processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)
+        if not self.args.keep_logs:
+            shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+class LoadTest:
+    def __init__(self, args, services: Services):
+        self.args = args
+        self.services = services
+        self.stats: Dict[str, Stats] = {name: Stats() for name in WORKLOADS}
+        self.rss_samples: List[Dict[str, int]] = []
+        self.client = httpx.AsyncClient(base_url=f"{services.base_url}/api/v1", timeout=args.timeout)
+        self.access_token = ""
+        self.api_key = ""
+        self.graph_data: dict = {}
+        self.flow_id = ""
+
+    def make_graph_data(self) -> dict:
+        flow = orjson.loads(FLOW_PATH.read_bytes())
+        graph_data = copy.deepcopy(flow.get("data", flow))
+        for node in graph_data["nodes"]:
+            template = node["data"]["node"]["template"]
+            if "openai_api_base" in template:
+                template["openai_api_base"]["value"] = self.services.llm_url
+                template["openai_api_key"]["value"] = "sk-fake"
+                # Stream the tokens to the chat websocket
+                template["streaming"]["value"] = self.args.stream_tokens
+        return graph_data
+
+    async def setup(self):
+        response = await self.client.post("login", data={"username": SUPERUSER, "password": SUPERUSER_PASSWORD})
+        response.raise_for_status()
+        self.access_token = response.json()["access_token"]
+        self.client.headers["Authorization"] = f"Bearer {self.access_token}"
+
+        self.graph_data = self.make_graph_data()
+        response = await self.client.post("flows/", json={"name": "Load test", "data": self.graph_data})
+        response.raise_for_status()
+        self.flow_id = response.json()["id"]
+
+        response = await self.client.post("api_key/", json={"name": "load test"})
+        response.raise_for_status()
+        self.api_key = response.json()["api_key"]
+
+    async def build(self, flow_id: str):
+        response = await self.client.post(f"build/init/{flow_id}", json=self.graph_data)
+        response.raise_for_status()
+        async with self.client.stream("GET", f"build/stream/{flow_id}") as stream:
+            stream.raise_for_status()
+            async for line in stream.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = orjson.loads(line[len("data:") :])
+                if "error" in data or data.get("valid") is False:
+                    raise RuntimeError(f"Build failed: {data.get('error') or data.get('params')}")
+                if data.get("end_of_stream"):
+                    return
+        raise RuntimeError("The build stream ended before end_of_stream")
+
+    async def process(self, sync: bool):
+        response = await self.client.post(
+            f"process/{self.flow_id}",
+            json={"inputs": {"text": random.choice(MESSAGES)}, "sync": sync},
+            headers={"x-api-key": self.api_key},
+        )
+        response.raise_for_status()
+        if sync:
+            return
+        task_id = response.json()["task"]["id"]
+        status = "PENDING"
+        deadline = time.monotonic() + self.args.timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.args.poll_interval)
+            response = await self.client.get(f"task/{task_id}")
+            response.raise_for_status()
+            status = response.json()["status"]
+            if status == "SUCCESS":
+                return
+            if status in ("FAILURE", "REVOKED"):
+                raise RuntimeError(f"Task ended with {status}: {response.json().get('result')}")
+        raise TimeoutError(f"Task still {status} after {self.args.timeout:.0f}s")
+
+    async def chat_user(self, deadline: float):
+        import websockets
+
+        stats = self.stats["chat"]
+        # Each chat connection needs its own built flow
+        client_id = str(uuid.uuid4())
+        await self.build(client_id)
+        ws_url = self.services.base_url.replace("http", "ws", 1)
+        url = f"{ws_url}/api/v1/chat/{client_id}?token={self.access_token}"
+        async with websockets.connect(url, max_size=None) as websocket:
+            await asyncio.wait_for(websocket.recv(), self.args.timeout)  # the chat history
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    await websocket.send(json.dumps({"inputs": {"text": random.choice(MESSAGES)}, "chatKey": "text"}))
+                    while True:
+                        message = json.loads(await asyncio.wait_for(websocket.recv(), self.args.timeout))
+                        if isinstance(message, dict) and message.get("type") == "end":
+                            break
+                    stats.latencies.append(time.perf_counter() - start)
+                except Exception as exc:
+                    stats.record_error(exc)
+                    return
+
+    async def request_user(self, workload: str, deadline: float):
+        stats = self.stats[workload]
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                if workload == "build_stream":
+                    await self.build(str(uuid.uuid4()))
+                else:
+                    await self.process(sync=workload == "process")
+                stats.latencies.append(time.perf_counter() - start)
+            except Exception as exc:
+                stats.record_error(exc)
+                # Don't hammer a failing endpoint
+                await asyncio.sleep(self.args.poll_interval)
+
+    async def user(self, workload: str, deadline: float):
+        # Spread the start of the users over the ramp up
+        await asyncio.sleep(random.uniform(0, self.args.ramp_up))
+        while time.monotonic() < deadline:
+            try:
+                if workload == "chat":
+                    await self.chat_user(deadline)
+                else:
+                    await self.request_user(workload, deadline)
+            except Exception as exc:
+                self.stats[workload].record_error(exc)
+                await asyncio.sleep(self.args.poll_interval)
+
+    async def sample_rss(self, deadline: float):
+        while time.monotonic() < deadline:
+            self.rss_samples.append(self.services.rss())
+            await asyncio.sleep(1)
+
+    async def run(self) -> dict:
+        await self.setup()
+        assignment = assign_users(self.args.users, parse_mix(self.args.mix))
+        start = time.monotonic()
+        deadline = start + self.args.duration
+        users = [asyncio.create_task(self.user(workload, deadline)) for workload in assignment]
+        sampler = asyncio.create_task(self.sample_rss(deadline))
+        # Requests still in flight at the deadline get at most one timeout to finish
+        _, pending = await asyncio.wait([*users, sampler], timeout=self.args.duration + self.args.timeout)
+        for task in pending:
+            task.cancel()
+        elapsed = time.monotonic() - start
+        await self.client.aclose()
+        return self.report(assignment, elapsed)
+
+    def report(self, assignment: List[str], elapsed: float) -> dict:
+        workloads = {}
+        for name in WORKLOADS:
+            stats = self.stats[name]
+            if name not in assignment:
+                continue
+            workloads[name] = {
+                "users": assignment.count(name),
+                "requests": len(stats.latencies),
+                "errors": stats.errors,
+                "throughput": len(stats.latencies) / elapsed,
+                "p50": percentile(stats.latencies, 50),
+                "p99": percentile(stats.latencies, 99),
+                "max": max(stats.latencies, default=None),
+                "error_messages": dict(stats.error_messages),
+            }
+        totals = [sum(sample.values()) for sample in self.rss_samples]
+        return {
+            "duration": elapsed,
+            "workers": self.args.workers,
+            "backend": "celery" if self.args.celery else "anyio",
+            "workloads": workloads,
+            "rss": {
+                "peak": max(totals, default=0),
+                "final": totals[-1] if totals else 0,
+                "processes": self.rss_samples[-1] if self.rss_samples else {},
+            },
+        }
+
+
+def print_report(report: dict):
+    def ms(value):
+        return "-" if value is None else f"{value * 1000:.0f}"
+
+    print(f"\nDuration {report['duration']:.1f}s, {report['workers']} worker(s), {report['backend']} backend\n")
+    header = f"{'workload':<15}{'users':>6}{'requests':>10}{'errors':>8}{'req/s':>8}{'p50 ms':>9}{'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, workload in report["workloads"].items():
+        print(
+            f"{name:<15}{workload['users']:>6}{workload['requests']:>10}{workload['errors']:>8}"
+            f"{workload['throughput']:>8.2f}{ms(workload['p50']):>9}{ms(workload['p99']):>9}"
+        )
+    for name, workload in report["workloads"].items():
+        for message, count in workload["error_messages"].items():
+            print(f"  {name} error x{count}: {message}")
+    rss = report["rss"]
+    print(f"\nRSS peak {rss['peak'] / 2**20:.0f} MiB, final {rss['final'] / 2**20:.0f} MiB")
+    for process, usage in rss["processes"].items():
+        print(f"  {process:<20}{usage / 2**20:>8.0f} MiB")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to run the workloads.")
+    parser.add_argument("--users", type=int, default=20, help="Number of concurrent virtual users.")
+    parser.add_argument("--ramp-up", type=float, default=5, help="Seconds over which the users start.")
+    parser.add_argument(
+        "--mix",
+        default="chat=1,process=2,process_async=1,build_stream=1",
+        help="Weights of the workloads: " + ", ".join(WORKLOADS),
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Number of Langflow worker processes.")
+    parser.add_argument("--redis", action="store_true", help="Use a Redis stand-in for the cache and chat broker.")
+    parser.add_argument("--celery", action="store_true", help="Run tasks on a Celery worker (implies --redis).")
+    parser.add_argument("--celery-concurrency", type=int, default=4)
+    parser.add_argument("--admission-control", action="store_true", help="Keep admission control enabled.")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds before the first LLM token.")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="Seconds between LLM tokens.")
+    parser.add_argument("--tokens", type=int, default=20, help="Number of tokens of each LLM answer.")
+    parser.add_argument("--stream-tokens", action="store_true", help="Stream the LLM tokens to the chat.")
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="Seconds between /task polls.")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds before a request fails.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the report as JSON to this file.")
+    parser.add_argument("--keep-logs", action="store_true", help="Keep the logs of the started processes.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    random.seed(args.seed)
+    services = Services(args)
+    # Stop the started processes when killed too, they run in their own sessions
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    try:
+        services.start()
+        report = asyncio.run(LoadTest(args, services).run())
+    finally:
+        services.stop()
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+
+from langflow.services.admission.service import AdmissionRejectedError, AdmissionService, Permit
+from langflow.services.admission.utils import admitted_streaming_response
+
+
+@pytest.mark.asyncio
+async def test_requests_over_the_limit_wait_for_a_permit():
+    service = AdmissionService(max_in_flight=1, queue_timeout=1, adaptive=False)
+    first = await service.acquire()
+    waiter = asyncio.ensure_future(service.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    assert service.waiting == 1
+
+    service.release(first)
+    second = await asyncio.wait_for(waiter, timeout=1)
+    assert service.in_flight == 1
+    service.release(second)
+    assert service.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_rejects_with_retry_after():
+    service = AdmissionService(max_in_flight=1, queue_timeout=0.05, adaptive=False)
+    await service.acquire()
+
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        await service.acquire()
+    assert exc_info.value.retry_after >= 1
+    assert service.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_right_away():
+    service = AdmissionService(max_in_flight=1, max_queue=1, queue_timeout=10, adaptive=False)
+    await service.acquire()
+    waiter = asyncio.ensure_future(service.acquire())
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(AdmissionRejectedError):
+        await asyncio.wait_for(service.acquire(), timeout=1)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert service.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_disabled_service_admits_everything():
+    service = AdmissionService(enabled=False, max_in_flight=1)
+    permits = [await service.acquire() for _ in range(5)]
+    for permit in permits:
+        service.release(permit)
+    assert service.in_flight == 0
+
+
+def test_adaptive_limit_follows_latency():
+    service = AdmissionService(max_in_flight=10, min_limit=2, target_latency=1.0, backoff_ratio=0.5)
+    service._in_flight = 2
+
+    slow = Permit()
+    slow.admitted_at -= 5
+    service.release(slow)
+    assert service.limit == 5
+
+    # Slow requests admitted before the cut don't cut again
+    stale = Permit()
+    stale.admitted_at = service._last_decrease - 5
+    service.release(stale)
+    assert service.limit == 5
+
+    service._in_flight = 10
+    for _ in range(6):
+        service.release(Permit())
+    assert service.limit == 6
+
+
+def test_process_json_is_shed_with_a_503(client, monkeypatch):
+    from langflow.services.deps import get_admission_service
+
+    async def mock_acquire():
+        raise AdmissionRejectedError("Server is overloaded, retry in 3 seconds", 3)
+
+    monkeypatch.setattr(get_admission_service(), "acquire", mock_acquire)
+
+    response = client.post("api/v1/process/json", json={"data": {}})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+
+
+@pytest.mark.asyncio
+async def test_streaming_permit_is_released_when_the_client_disconnects():
+    service = AdmissionService(max_in_flight=1, adaptive=False)
+    started = False
+
+    async def content():
+        nonlocal started
+        started = True
+        yield "data"
+
+    response = await admitted_streaming_response(service, content())
+    assert service.in_flight == 1
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        # The client is gone before the body is sent
+        await asyncio.sleep(1)
+
+    await response({"type": "http"}, receive, send)
+    assert not started
+    assert service.in_flight == 0
+
+
+
+@pytest.mark.asyncio
+async def test_streaming_hold_is_released_with_the_permit():
+    from langflow.services.task.scheduler import FairScheduler
+
+    service = AdmissionService(max_in_flight=1, adaptive=False)
+    scheduler = FairScheduler(capacity=1)
+
+    async def content():
+        yield "data"
+
+    response = await admitted_streaming_response(service, content(), hold=scheduler.slot("user-1"))
+    assert (service.in_flight, scheduler.in_use) == (1, 1)
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    await response({"type": "http"}, receive, send)
+    assert (service.in_flight, scheduler.in_use) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_permit_is_released_when_the_hold_fails():
+    service = AdmissionService(max_in_flight=1, adaptive=False)
+
+    class FailingHold:
+        async def __aenter__(self):
+            raise RuntimeError("queue is full")
+
+        async def __aexit__(self, *exc_info):
+            pass
+
+    async def content():
+        yield "data"
+
+    with pytest.raises(RuntimeError):
+        await admitted_streaming_response(service, content(), hold=FailingHold())
+    assert service.in_flight == 0
@@ -1,5 +1,12 @@
+import uuid
+from uuid import UUID
+
 import pytest
-from langflow.services.database.models.api_key import ApiKeyCreate
+from langflow.services.database.models.api_key import ApiKey, ApiKeyCreate
+from langflow.services.database.models.user import User, UserUpdate
+from langflow.services.database.models.user.crud import update_user
+from langflow.services.database.utils import session_getter
+from langflow.services.deps import get_db_service, get_write_behind_service
 
 
 @pytest.fixture
@@ -44,3 +51,64 @@ def test_delete_api_key(client, logged_in_headers, active_user, api_key):
     data = response.json()
     assert data["detail"] == "API Key deleted"
     # Optionally, add a follow-up check to ensure that the key is actually removed from the database
+
+
+def test_api_key_principal_is_cached(client, api_key, monkeypatch):
+    from langflow.services.auth import utils as auth_utils
+
+    calls = []
+    check_key = auth_utils.check_key
+
+    def counting_check_key(*args, **kwargs):
+        calls.append(args)
+        return check_key(*args, **kwargs)
+
+    monkeypatch.setattr(auth_utils, "check_key", counting_check_key)
+    headers = {"x-api-key": api_key["api_key"]}
+    flow_id = uuid.uuid4()
+    for _ in range(3):
+        # The flow does not exist, so a 404 means the API key was accepted
+        response = client.post(f"api/v1/process/{flow_id}", headers=headers, json={"inputs": {}})
+        assert response.status_code == 404, response.text
+
+    assert len(calls) == 1
+
+
+def test_deleted_api_key_is_invalidated(client, logged_in_headers, api_key):
+    headers = {"x-api-key": api_key["api_key"]}
+    flow_id = uuid.uuid4()
+    response = client.post(f"api/v1/process/{flow_id}", headers=headers, json={"inputs": {}})
+    assert response.status_code == 404
+
+    response = client.delete(f"api/v1/api_key/{api_key['id']}", headers=logged_in_headers)
+    assert response.status_code == 200
+
+    response = client.post(f"api/v1/process/{flow_id}", headers=headers, json={"inputs": {}})
+    assert response.status_code == 403
+
+
+def test_api_key_usage_is_written_behind(client, api_key):
+    headers = {"x-api-key": api_key["api_key"]}
+    flow_id = uuid.uuid4()
+    for _ in range(3):
+        client.post(f"api/v1/process/{flow_id}", headers=headers, json={"inputs": {}})
+
+    # The three uses are coalesced into a single row update
+    assert get_write_behind_service().flush(timeout=5)
+
+    with session_getter(get_db_service()) as session:
+        api_key_object = session.get(ApiKey, UUID(api_key["id"]))
+        assert api_key_object.total_uses == 3
+        assert api_key_object.last_used_at is not None
+
+
+def test_deactivated_user_jwt_is_invalidated(client, logged_in_headers, active_user):
+    response = client.get("api/v1/users/whoami", headers=logged_in_headers)
+    assert response.status_code == 200
+
+    with session_getter(get_db_service()) as session:
+        user = session.get(User, active_user.id)
+        update_user(user, UserUpdate(is_active=False), session)
+
+    response = client.get("api/v1/users/whoami", headers=logged_in_headers)
+    assert response.status_code == 401
@@ -0,0 +1,205 @@
+import asyncio
+
+import pytest
+from langflow.api.v1.schemas import ChatMessage, ChatResponse, FileResponse
+from langflow.services.chat.broker import InMemoryChatBroker, RedisChatBroker
+from langflow.services.chat.service import ChatHistory
+
+
+@pytest.fixture
+def memory_broker():
+    return InMemoryChatBroker()
+
+
+@pytest.fixture
+def redis_broker():
+    fakeredis = pytest.importorskip("fakeredis")
+    from fakeredis import aioredis
+
+    server = fakeredis.FakeServer()
+    return RedisChatBroker(
+        client=fakeredis.FakeStrictRedis(server=server),
+        async_client=aioredis.FakeRedis(server=server),
+    )
+
+
+def make_redis_broker(server):
+    import fakeredis
+    from fakeredis import aioredis
+
+    return RedisChatBroker(
+        client=fakeredis.FakeStrictRedis(server=server),
+        async_client=aioredis.FakeRedis(server=server),
+        subscribers_ttl=0.01,
+    )
+
+
+@pytest.fixture(params=["memory_broker", "redis_broker"])
+def broker(request):
+    return request.getfixturevalue(request.param)
+
+
+def test_build_record(broker):
+    assert broker.get_build("flow") is None
+    broker.set_build("flow", {"graph_data": {"nodes": [], "edges": []}, "user_id": None})
+    assert broker.get_build("flow") == {"graph_data": {"nodes": [], "edges": []}, "user_id": None}
+    broker.delete_build("flow")
+    assert broker.get_build("flow") is None
+
+
+def test_history_is_shared(broker):
+    # Two histories sharing a broker behave like two workers
+    first_worker = ChatHistory(broker)
+    second_worker = ChatHistory(broker)
+
+    first_worker.add_message("client", ChatMessage(message="hello"))
+    first_worker.add_message("client", ChatResponse(message=None, type="start", intermediate_steps=""))
+    first_worker.add_message("client", ChatResponse(message="tok", type="stream", intermediate_steps=""))
+    first_worker.add_message("client", ChatResponse(message="hi there", type="end", intermediate_steps=""))
+
+    history = second_worker.get_history("client")
+    assert [message.type for message in history] == ["human", "end"]
+    assert isinstance(history[1], ChatResponse)
+    assert history[1].message == "hi there"
+
+    second_worker.empty_history("client")
+    assert first_worker.get_history("client") == []
+
+
+def test_file_responses_are_shared(broker):
+    from PIL import Image
+
+    first_worker = ChatHistory(broker)
+    second_worker = ChatHistory(broker)
+    first_worker.add_message("client", FileResponse(data=Image.new("RGB", (2, 2)), data_type="image"))
+    first_worker.add_message("client", FileResponse(data="a,b\n1,2\n", data_type="csv"))
+
+    image, csv = second_worker.get_history("client")
+    assert isinstance(image, FileResponse) and isinstance(image.data, str)
+    assert csv.data == "a,b\n1,2\n"
+
+
+@pytest.mark.asyncio
+async def test_writes_on_the_event_loop_keep_their_order(broker):
+    history = ChatHistory(broker)
+    for index in range(5):
+        history.add_message("client", ChatMessage(message=f"message {index}"))
+    history.empty_history("client")
+    history.add_message("client", ChatMessage(message="after clearing"))
+
+    messages = await history.get_history_async("client")
+    assert [message.message for message in messages] == ["after clearing"]
+
+
+@pytest.mark.asyncio
+async def test_messages_are_only_published_for_other_workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    first_worker, second_worker = make_redis_broker(server), make_redis_broker(server)
+
+    async def listen(broker):
+        async for _ in broker.subscribe("client"):
+            pass
+
+    listener = asyncio.create_task(listen(first_worker))
+    await asyncio.sleep(0.1)
+    assert not await first_worker.has_remote_subscribers("client")
+    assert await second_worker.has_remote_subscribers("client")
+    listener.cancel()
+    await asyncio.sleep(0.1)
+    assert not await second_worker.has_remote_subscribers("client")
+    assert not await InMemoryChatBroker().has_remote_subscribers("client")
+
+
+@pytest.mark.asyncio
+async def test_publish_subscribe(broker):
+    received = []
+
+    async def listen():
+        async for message in broker.subscribe("client"):
+            received.append(message)
+            if len(received) == 2:
+                break
+
+    listener = asyncio.create_task(listen())
+    # Give the subscriber time to register
+    await asyncio.sleep(0.1)
+    await broker.publish("client", {"origin": "a", "message": {"message": "tok"}})
+    await broker.publish("other", {"origin": "a", "message": {"message": "ignored"}})
+    await broker.publish("client", {"origin": "b", "message": {"message": "tok2"}})
+    await asyncio.wait_for(listener, timeout=5)
+
+    assert [message["message"]["message"] for message in received] == ["tok", "tok2"]
+
+
+def test_history_is_capped_and_paginated(broker):
+    broker.max_messages = 5
+    history = ChatHistory(broker, max_messages=5)
+    for index in range(8):
+        history.add_message("client", ChatMessage(message=f"message {index}"))
+
+    assert history.count_messages("client") == 5
+    assert len(history.history["client"]) == 5
+    assert [message.message for message in history.get_history("client")] == [f"message {i}" for i in range(3, 8)]
+    # offset skips the most recent messages
+    page = history.get_history("client", offset=1, limit=2)
+    assert [message.message for message in page] == ["message 5", "message 6"]
+    assert history.get_history("client", offset=10, limit=2) == []
+
+
+def test_stream_messages_are_collapsed(memory_broker):
+    history = ChatHistory(memory_broker)
+    for token in ["Hel", "lo"]:
+        history.add_message("client", ChatResponse(message=token, type="stream", intermediate_steps=""))
+
+    assert history.get_history("client", filter_messages=False) == []
+    assert history.streams["client"].message == "Hello"
+
+    history.add_message("client", ChatResponse(message="Hello", type="end", intermediate_steps=""))
+    assert "client" not in history.streams
+    assert [message.type for message in history.get_history("client", filter_messages=False)] == ["end"]
+
+
+def test_persisted_history(client, memory_broker):
+    history = ChatHistory(memory_broker, max_messages=2, persist=True)
+    for index in range(3):
+        history.add_message("persisted_client", ChatMessage(message=f"message {index}"))
+
+    # A new worker without the in-memory history still finds every message
+    other_worker = ChatHistory(InMemoryChatBroker(), persist=True)
+    assert other_worker.count_messages("persisted_client") == 3
+    page = other_worker.get_history("persisted_client", offset=0, limit=2)
+    assert [message.message for message in page] == ["message 1", "message 2"]
+
+    other_worker.empty_history("persisted_client")
+    assert history.count_messages("persisted_client") == 0
+
+
+def test_chat_history_endpoint(client, logged_in_headers, flow):
+    from langflow.services.deps import get_chat_service
+
+    client_id = str(flow.id)
+    chat_history = get_chat_service().chat_history
+    for index in range(3):
+        chat_history.add_message(client_id, ChatMessage(message=f"message {index}"))
+
+    response = client.get(f"api/v1/chat/{client_id}/history?offset=1&limit=1", headers=logged_in_headers)
+    assert response.status_code == 200
+    assert response.json()["total"] == 3
+    assert [message["message"] for message in response.json()["messages"]] == ["message 1"]
+
+
+def test_chat_history_endpoint_checks_the_flow_owner(client, logged_in_headers, test_user):
+    from langflow.services.database.models.flow import Flow
+    from langflow.services.database.utils import session_getter
+    from langflow.services.deps import get_db_service
+
+    with session_getter(get_db_service()) as session:
+        other_flow = Flow(name="other flow", data={}, user_id=test_user["id"])
+        session.add(other_flow)
+        session.commit()
+        other_flow_id = str(other_flow.id)
+
+    for client_id in [other_flow_id, "not-a-flow"]:
+        response = client.get(f"api/v1/chat/{client_id}/history", headers=logged_in_headers)
+        assert response.status_code == 404
@@ -46,6 +46,21 @@ def test_lang_chain_type_creator_to_dict(
     assert "base_classes" in type_dict["test_type"]["node1"]
 
 
+def test_lang_chain_type_creator_to_dict_is_memoized(
+    client,
+    sample_lang_chain_type_creator: LangChainTypeCreator,
+    monkeypatch,
+):
+    type_dict = sample_lang_chain_type_creator.to_dict()
+
+    # The frontend nodes are not built again
+    def fail(name):
+        raise AssertionError(f"{name} built again")
+
+    monkeypatch.setattr(type(sample_lang_chain_type_creator), "frontend_node", lambda self, name: fail(name))
+    assert sample_lang_chain_type_creator.to_dict() == type_dict
+
+
 def test_agent_creator_type_to_loader_dict(sample_agent_creator: AgentCreator):
     type_to_loader_dict = sample_agent_creator.type_to_loader_dict
     assert len(type_to_loader_dict) > 0
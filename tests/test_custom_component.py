@@ -1,4 +1,6 @@
 import ast
+import asyncio
+import threading
 import types
 from uuid import uuid4
 
@@ -6,6 +8,8 @@ import pytest
 from langflow.interface.custom.base import CustomComponent
 from langflow.interface.custom.code_parser.code_parser import CodeParser, CodeSyntaxError
 from langflow.interface.custom.custom_component.component import Component, ComponentCodeNullError
+from langflow.interface.custom import template_cache
+from langflow.interface.custom.template_cache import CustomComponentTemplateCache, SupersededError
 from langflow.interface.custom.utils import build_custom_component_template
 from langflow.services.database.models.flow import Flow, FlowCreate
 
@@ -551,3 +555,55 @@ def test_build_langchain_template_custom_component_templatefield(test_component_
     frontend_node = build_custom_component_template(component, update_field="param")
     new_param_options = frontend_node["template"]["param"]["options"]
     assert param_options != new_param_options
+
+
+@pytest.fixture
+def template_builds(monkeypatch):
+    """Replaces the template build with one that waits for release to be set."""
+    builds = []
+    release = threading.Event()
+
+    def build_template(code, user_id, field):
+        builds.append((code, user_id, field))
+        release.wait(5)
+        return {"template": {"code": {"value": code}}, "field": field}
+
+    monkeypatch.setattr(template_cache, "build_template", build_template)
+    return builds, release
+
+
+@pytest.mark.asyncio
+async def test_template_cache_builds_once(client, template_builds):
+    builds, release = template_builds
+    cache = CustomComponentTemplateCache()
+    requests = [asyncio.ensure_future(cache.get_template("code", user_id="user")) for _ in range(3)]
+    await asyncio.sleep(0.1)
+    release.set()
+    templates = await asyncio.gather(*requests)
+
+    # Concurrent requests wait for the same build, then the template is cached
+    assert len(builds) == 1
+    assert all(template == templates[0] for template in templates)
+    templates[0]["template"]["code"]["value"] = "changed"
+    assert (await cache.get_template("code", user_id="user"))["template"]["code"]["value"] == "code"
+    assert len(builds) == 1
+
+    # Other users, fields and uncached requests build it again
+    await cache.get_template("code", user_id="other")
+    await cache.get_template("code", user_id="user", field="param")
+    await cache.get_template("code", user_id="user", cached=False)
+    assert len(builds) == 4
+
+
+@pytest.mark.asyncio
+async def test_template_cache_supersedes_requests_of_a_client(client, template_builds):
+    builds, release = template_builds
+    cache = CustomComponentTemplateCache()
+    first = asyncio.ensure_future(cache.get_template("first", user_id="user", client_id="node"))
+    await asyncio.sleep(0.1)
+    second = asyncio.ensure_future(cache.get_template("second", user_id="user", client_id="node"))
+
+    with pytest.raises(SupersededError):
+        await first
+    release.set()
+    assert (await second)["template"]["code"]["value"] == "second"
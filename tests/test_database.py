@@ -8,6 +8,7 @@ from langflow.services.database.models.base import orjson_dumps
 from langflow.services.database.models.flow import Flow, FlowCreate, FlowUpdate
 from langflow.services.database.utils import session_getter
 from langflow.services.deps import get_db_service
+from langflow.services.session.utils import compute_dict_hash
 from sqlmodel import Session
 
 
@@ -247,3 +248,104 @@ def test_read_empty_flows(client: TestClient, active_user, logged_in_headers):
     response = client.get("api/v1/flows/", headers=logged_in_headers)
     assert response.status_code == 200
     assert len(response.json()) == 0
+
+
+def test_read_flow_summaries(client: TestClient, json_flow: str, active_user, logged_in_headers):
+    data = orjson.loads(json_flow)["data"]
+    flow_list = FlowListCreate(
+        flows=[
+            FlowCreate(name=f"Flow {i}", description="description", data=data, folder="folder" if i % 2 else None)
+            for i in range(5)
+        ]
+    )
+    response = client.post("api/v1/flows/batch/", json=flow_list.model_dump(), headers=logged_in_headers)
+    assert response.status_code == 201
+    assert response.json()[0]["node_count"] == len(data["nodes"])
+
+    names = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("api/v1/flows/summary/", params=params, headers=logged_in_headers)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["flows"]) <= 2
+        assert all("data" not in flow for flow in page["flows"])
+        names += [flow["name"] for flow in page["flows"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    # Every flow is listed once, from the most recently updated
+    assert names == [f"Flow {i}" for i in reversed(range(5))]
+
+    response = client.get("api/v1/flows/summary/", params={"folder": "folder"}, headers=logged_in_headers)
+    assert sorted(flow["name"] for flow in response.json()["flows"]) == ["Flow 1", "Flow 3"]
+    response = client.get("api/v1/flows/summary/", params={"name": "flow 4"}, headers=logged_in_headers)
+    assert [flow["name"] for flow in response.json()["flows"]] == ["Flow 4"]
+    response = client.get("api/v1/flows/summary/", params={"is_component": True}, headers=logged_in_headers)
+    assert response.json()["flows"] == []
+
+
+def test_flow_data_hash(client: TestClient, json_flow: str, active_user, logged_in_headers):
+    data = orjson.loads(json_flow)["data"]
+    flow = FlowCreate(name="Test Flow", description="description", data=data)
+    response = client.post("api/v1/flows/", json=flow.model_dump(), headers=logged_in_headers)
+    flow_id = response.json()["id"]
+    with session_getter(get_db_service()) as session:
+        assert session.get(Flow, UUID(flow_id)).data_hash == compute_dict_hash(data)
+
+    # Moving a node doesn't change the hash, changing the flow does
+    data["nodes"][0]["position"] = {"x": 0, "y": 0}
+    response = client.patch(f"api/v1/flows/{flow_id}", json={"data": data}, headers=logged_in_headers)
+    assert response.status_code == 200
+    with session_getter(get_db_service()) as session:
+        assert session.get(Flow, UUID(flow_id)).data_hash == compute_dict_hash(orjson.loads(json_flow)["data"])
+
+    data["edges"] = []
+    client.patch(f"api/v1/flows/{flow_id}", json={"data": data}, headers=logged_in_headers)
+    with session_getter(get_db_service()) as session:
+        assert session.get(Flow, UUID(flow_id)).data_hash == compute_dict_hash(data)
+
+
+def test_read_flow_summaries_invalid_cursor(client: TestClient, active_user, logged_in_headers):
+    response = client.get("api/v1/flows/summary/", params={"cursor": "invalid"}, headers=logged_in_headers)
+    assert response.status_code == 400
+
+
+def test_export_and_import_ndjson(client: TestClient, json_flow: str, active_user, logged_in_headers):
+    data = orjson.loads(json_flow)["data"]
+    flow_list = FlowListCreate(flows=[FlowCreate(name=f"Flow {i}", data=data) for i in range(3)])
+    client.post("api/v1/flows/batch/", json=flow_list.model_dump(), headers=logged_in_headers)
+
+    response = client.get("api/v1/flows/download/", params={"file_format": "ndjson"}, headers=logged_in_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.content.splitlines()
+    assert [orjson.loads(line)["name"] for line in lines] == ["Flow 0", "Flow 1", "Flow 2"]
+
+    response = client.post(
+        "api/v1/flows/import/",
+        files={"file": ("flows.ndjson", response.content, "application/x-ndjson")},
+        headers=logged_in_headers,
+    )
+    assert response.status_code == 201
+    assert response.json() == {"imported": 3}
+    response = client.get("api/v1/flows/", headers=logged_in_headers)
+    flows = response.json()
+    assert sorted(flow["name"] for flow in flows) == ["Flow 0", "Flow 0", "Flow 1", "Flow 1", "Flow 2", "Flow 2"]
+    # Imported flows are new flows, with their metadata computed
+    assert len({flow["id"] for flow in flows}) == 6
+    assert all(flow["node_count"] == len(data["nodes"]) and flow["data"] == data for flow in flows)
+
+
+def test_import_invalid_flow(client: TestClient, active_user, logged_in_headers):
+    contents = orjson.dumps({"name": "Flow"}) + b"\n" + orjson.dumps({"description": "no name"}) + b"\n"
+    response = client.post(
+        "api/v1/flows/import/",
+        files={"file": ("flows.ndjson", contents, "application/x-ndjson")},
+        headers=logged_in_headers,
+    )
+    assert response.status_code == 422
+    assert "line 2" in response.json()["detail"]
+    # Nothing is imported
+    assert client.get("api/v1/flows/", headers=logged_in_headers).json() == []
@@ -0,0 +1,201 @@
+import json
+import pickle
+
+import pytest
+
+from langflow.services.session.utils import compute_dict_hash
+from langflow.services.task.distributed import (
+    CompiledGraphCache,
+    DistributedGraphBuilder,
+    GraphNotCachedError,
+    RemoteBuildResult,
+    build_cached_vertex,
+)
+from langflow.services.task.utils import wait_for_task_result
+
+celery = pytest.importorskip("celery")
+
+MEMORY_VERTEX_ID = "dndnode_83"
+
+
+@pytest.fixture
+def graph_data():
+    with open(pytest.BASIC_EXAMPLE_PATH, "r") as f:
+        return json.load(f)["data"]
+
+
+@pytest.fixture
+def eager_celery(monkeypatch):
+    from langflow.worker import celery_app, compiled_graph_cache
+
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(celery_app.conf, "task_eager_propagates", True)
+    compiled_graph_cache.clear()
+    yield celery_app
+    compiled_graph_cache.clear()
+
+
+def test_compiled_graph_cache(graph_data):
+    cache = CompiledGraphCache(max_graphs=1)
+    flow_hash = compute_dict_hash(graph_data)
+
+    graph = cache.get_graph(flow_hash, "build-1", graph_data)
+    # Vertices of the same build share the compiled graph
+    assert cache.get_graph(flow_hash, "build-1") is graph
+    # A new build only needs the hash
+    assert cache.get_graph(flow_hash, "build-2") is not graph
+
+    with pytest.raises(GraphNotCachedError):
+        cache.get_graph("unknown", "build-1")
+
+
+@pytest.mark.asyncio
+async def test_build_cached_vertex_returns_a_handle(graph_data):
+    cache = CompiledGraphCache()
+    flow_hash = compute_dict_hash(graph_data)
+
+    handle = await build_cached_vertex(cache, flow_hash, "build", MEMORY_VERTEX_ID, graph_data=graph_data)
+
+    assert handle["id"] == MEMORY_VERTEX_ID
+    assert handle["valid"] is True
+    assert handle["input_keys"] is None
+    # The handle can go through a JSON result backend
+    assert json.loads(json.dumps(handle)) == handle
+    # The built object stays in the worker
+    assert cache.get_graph(flow_hash, "build").get_vertex(MEMORY_VERTEX_ID)._built
+
+
+@pytest.mark.asyncio
+async def test_distributed_builder_sends_the_payload_once(graph_data, eager_celery, monkeypatch):
+    from langflow.worker import build_graph_vertex, compiled_graph_cache
+
+    sent_payloads = []
+    queues = []
+    apply_async = build_graph_vertex.apply_async
+
+    def spy_apply_async(args=None, kwargs=None, **options):
+        sent_payloads.append(kwargs.get("graph_data") is not None)
+        queues.append(options.get("queue"))
+        return apply_async(args, kwargs, **options)
+
+    monkeypatch.setattr(build_graph_vertex, "apply_async", spy_apply_async)
+    builder = DistributedGraphBuilder(build_graph_vertex, graph_data, build_id="build")
+
+    handle = await builder.build_vertex(MEMORY_VERTEX_ID, timeout=30)
+    assert handle["valid"] is True
+    assert builder.worker == handle["worker"]
+    await builder.build_vertex(MEMORY_VERTEX_ID, timeout=30)
+    assert sent_payloads == [True, False]
+    # The rest of the build goes to the worker that holds the flow
+    assert queues[0] is None
+    assert queues[1].name == f"{builder.worker}.dq2"
+
+    # A worker that does not know the flow gets the payload again
+    compiled_graph_cache.clear()
+    handle = await builder.build_vertex(MEMORY_VERTEX_ID, timeout=30)
+    assert handle["valid"] is True
+    assert sent_payloads == [True, False, False, True]
+
+
+def test_graph_not_cached_error_pickles():
+    error = pickle.loads(pickle.dumps(GraphNotCachedError("flow-hash")))
+
+    assert error.flow_hash == "flow-hash"
+
+
+class FakeResult:
+    id = "task"
+
+    def __init__(self, result):
+        self.result = result
+
+    def ready(self):
+        return True
+
+    def get(self, propagate=True):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_remote_build_result_runs_messages_in_the_worker(graph_data):
+    from langflow.api.v1.schemas import ChatMessage
+
+    calls = []
+
+    class FakeProcessTask:
+        def apply_async(self, args=None, kwargs=None, **options):
+            calls.append((kwargs["graph_data"] is not None, options["queue"].name))
+            if kwargs["graph_data"] is None and len(calls) == 2:
+                return FakeResult(GraphNotCachedError("flow-hash"))
+            return FakeResult({"result": f"echo {args[2]['input']}", "intermediate_steps": ""})
+
+    remote_build = RemoteBuildResult(FakeProcessTask(), graph_data, "flow-hash", "build", worker="worker@host")
+
+    message = ChatMessage(message={"input": "hi"})
+    result, _, _ = await remote_build.process(message, "client", "session")
+    assert result == "echo hi"
+    # A worker that lost the flow gets the payload and builds it again
+    await remote_build.process(message, "client", "session")
+    assert calls == [(False, "worker@host.dq2"), (False, "worker@host.dq2"), (True, "worker@host.dq2")]
+
+
+def test_process_built_graph_runs_a_chain_in_the_worker(eager_celery):
+    from langflow.services.session.utils import compute_dict_hash
+    from langflow.worker import build_graph_vertex, compiled_graph_cache, process_built_graph
+
+    from tests.benchmarks.flows import make_flow
+
+    graph_data = make_flow(3)
+    flow_hash = compute_dict_hash(graph_data)
+    handle = build_graph_vertex.delay(flow_hash, "build", "Chain", graph_data=graph_data).get()
+    assert handle["valid"] is True, handle["params"]
+
+    # The worker has no websocket for the client, the message runs without streaming callbacks
+    output = process_built_graph.delay(flow_hash, "build", {"input": "hi"}, "flow-1", "session").get()
+    assert output == {"result": "Hello from the fake LLM", "intermediate_steps": ""}
+    # The object built by the vertex task was reused
+    assert compiled_graph_cache.get_graph(flow_hash, "build").get_vertex("Chain")._built
+
+
+@pytest.mark.asyncio
+async def test_wait_for_task_result_times_out():
+    class PendingTask:
+        id = "pending"
+
+        def ready(self):
+            return False
+
+    with pytest.raises(TimeoutError):
+        await wait_for_task_result(PendingTask(), poll_interval=0.01, timeout=0.05)
+
+
+def test_stream_build_distributed(client, graph_data, eager_celery, monkeypatch, logged_in_headers):
+    from langflow.services.deps import get_settings_service, get_task_service
+
+    monkeypatch.setattr(get_settings_service().settings, "DISTRIBUTED_BUILD", True)
+    monkeypatch.setattr(get_task_service(), "use_celery", True)
+    flow_id = "distributed-flow"
+
+    response = client.post(f"api/v1/build/init/{flow_id}", json=graph_data, headers=logged_in_headers)
+    assert response.status_code == 201, response.text
+    response = client.get(f"api/v1/build/stream/{flow_id}")
+    assert response.status_code == 200
+
+    messages = [
+        json.loads(line[len("data: ") :]) for line in response.text.splitlines() if line.startswith("data: ")
+    ]
+    vertex_messages = {message["id"]: message for message in messages if "valid" in message}
+    assert vertex_messages[MEMORY_VERTEX_ID]["valid"] is True
+    assert messages[-1] == {"end_of_stream": True}
+
+    # The chat path uses the object built by the worker instead of rebuilding the flow
+    from langflow.services.chat.utils import get_remote_build_result
+    from langflow.services.deps import get_chat_service
+
+    build = get_chat_service().broker.get_build(flow_id)
+    assert build["remote"]["worker"]
+    remote_build = get_remote_build_result(build)
+    assert isinstance(remote_build, RemoteBuildResult)
+    assert remote_build.worker == build["remote"]["worker"]
@@ -1,3 +1,6 @@
+import asyncio
+import json
+import threading
 import time
 import uuid
 from collections import namedtuple
@@ -8,6 +11,7 @@ from langflow.interface.tools.constants import CUSTOM_TOOLS
 from langflow.processing.process import Result
 from langflow.services.auth.utils import get_password_hash
 from langflow.services.database.models.api_key.model import ApiKey
+from langflow.services.database.models.user.model import User
 from langflow.services.database.utils import session_getter
 from langflow.services.deps import get_db_service, get_settings_service
 from langflow.template.frontend_node.chains import TimeTravelGuideChainNode
@@ -134,10 +138,21 @@ def created_api_key(active_user):
     return api_key
 
 
+def create_user_api_key(username: str, api_key: str) -> str:
+    with session_getter(get_db_service()) as session:
+        user = User(username=username, password=get_password_hash("testpassword"), is_active=True)
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        hashed = get_password_hash(api_key)
+        session.add(ApiKey(name=f"{username}_key", user_id=user.id, api_key=api_key, hashed_api_key=hashed))
+        session.commit()
+    return api_key
+
+
 def test_process_flow_invalid_api_key(client, flow, monkeypatch):
     # Mock de process_graph_cached
     from langflow.api.v1 import endpoints
-    from langflow.services.database.models.api_key import crud
 
     settings_service = get_settings_service()
     settings_service.auth_settings.AUTO_LOGIN = False
@@ -145,11 +160,7 @@ def test_process_flow_invalid_api_key(client, flow, monkeypatch):
     async def mock_process_graph_cached(*args, **kwargs):
         return Result(result={}, session_id="session_id_mock")
 
-    def mock_update_total_uses(*args, **kwargs):
-        return created_api_key
-
     monkeypatch.setattr(endpoints, "process_graph_cached", mock_process_graph_cached)
-    monkeypatch.setattr(crud, "update_total_uses", mock_update_total_uses)
 
     headers = {"x-api-key": "invalid_api_key"}
 
@@ -191,10 +202,97 @@ def test_process_flow_invalid_id(client, monkeypatch, created_api_key):
     assert f"Flow {invalid_id} not found" in response.json()["detail"]
 
 
+def test_process_stream_invalid_id(client, created_api_key):
+    headers = {"x-api-key": created_api_key.api_key}
+    invalid_id = uuid.uuid4()
+    response = client.post(f"api/v1/process/{invalid_id}/stream", headers=headers, json={"inputs": {"key": "value"}})
+
+    assert response.status_code == 404
+    assert f"Flow {invalid_id} not found" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("stream_format", ["sse", "ndjson"])
+def test_process_stream(client, flow, monkeypatch, created_api_key, stream_format):
+    async def mock_process_graph_cached_stream(*args, **kwargs):
+        for token in ["Hello", " world"]:
+            yield "token", token
+        yield "result", Result(result={"text": "Hello world"}, session_id="session_id_mock")
+
+    from langflow.api.v1 import endpoints
+
+    monkeypatch.setattr(endpoints, "process_graph_cached_stream", mock_process_graph_cached_stream)
+
+    headers = {"x-api-key": created_api_key.api_key}
+    response = client.post(
+        f"api/v1/process/{flow.id}/stream",
+        headers=headers,
+        params={"stream_format": stream_format},
+        json={"inputs": {"text": "Hi"}},
+    )
+
+    assert response.status_code == 200
+    if stream_format == "ndjson":
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines() if line]
+    else:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = []
+        for block in response.text.strip().split("\n\n"):
+            event_line, data_line = block.split("\n")
+            events.append({"event": event_line[len("event: ") :], "data": json.loads(data_line[len("data: ") :])})
+
+    assert [event["event"] for event in events] == ["token", "token", "end"]
+    assert "".join(event["data"]["chunk"] for event in events[:2]) == "Hello world"
+    assert events[-1]["data"] == {"result": {"text": "Hello world"}, "session_id": "session_id_mock"}
+
+
+def test_process_stream_counts_against_the_owner_quota(client, flow, created_api_key, monkeypatch):
+    from langflow.api.v1 import endpoints
+    from langflow.services.deps import get_task_service
+    from langflow.services.task.scheduler import FairScheduler
+
+    scheduler = FairScheduler(capacity=4, owner_limit=1)
+    monkeypatch.setattr(get_task_service(), "scheduler", scheduler)
+    owner = str(created_api_key.user_id)
+    granted = {}
+
+    async def mock_process_graph_cached_stream(*args, **kwargs):
+        # The stream holds the only slot of its owner, other users still get one
+        granted["in_use"] = scheduler.in_use
+        for name, ticket_owner in [("owner", owner), ("other", "another-user")]:
+            ticket = scheduler.submit(ticket_owner)
+            granted[name] = ticket.granted
+            scheduler.release(ticket)
+        yield "result", Result(result={"text": "Hello world"}, session_id="session_id_mock")
+
+    monkeypatch.setattr(endpoints, "process_graph_cached_stream", mock_process_graph_cached_stream)
+    headers = {"x-api-key": created_api_key.api_key}
+
+    response = client.post(f"api/v1/process/{flow.id}/stream", headers=headers, json={"inputs": {}})
+    assert response.status_code == 200
+    assert granted == {"in_use": 1, "owner": False, "other": True}
+    # The slot is released when the stream ends
+    assert scheduler.in_use == 0
+
+
+def test_process_stream_is_shed_with_a_503(client, flow, created_api_key, monkeypatch):
+    from langflow.services.admission.service import AdmissionRejectedError
+    from langflow.services.deps import get_admission_service
+
+    async def mock_acquire():
+        raise AdmissionRejectedError("Server is overloaded, retry in 3 seconds", 3)
+
+    monkeypatch.setattr(get_admission_service(), "acquire", mock_acquire)
+    headers = {"x-api-key": created_api_key.api_key}
+
+    response = client.post(f"api/v1/process/{flow.id}/stream", headers=headers, json={"inputs": {}})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+
+
 def test_process_flow_without_autologin(client, flow, monkeypatch, created_api_key):
     # Mock de process_graph_cached
     from langflow.api.v1 import endpoints
-    from langflow.services.database.models.api_key import crud
 
     settings_service = get_settings_service()
     settings_service.auth_settings.AUTO_LOGIN = False
@@ -221,11 +319,7 @@ def test_process_flow_without_autologin(client, flow, monkeypatch, created_api_k
         id="task_id_mock", get=lambda: Result(result={}, session_id="session_id_mock")
     )
 
-    def mock_update_total_uses(*args, **kwargs):
-        return created_api_key
-
     monkeypatch.setattr(endpoints, "process_graph_cached", mock_process_graph_cached)
-    monkeypatch.setattr(crud, "update_total_uses", mock_update_total_uses)
     monkeypatch.setattr(endpoints, "process_graph_cached_task", mock_process_graph_cached_task)
 
     api_key = created_api_key.api_key
@@ -249,10 +343,74 @@ def test_process_flow_without_autologin(client, flow, monkeypatch, created_api_k
     assert response.json()["session_id"] == "session_id_mock", response.json()
 
 
+def test_process_async_returns_before_the_task_finishes(client, flow, monkeypatch, created_api_key):
+    from langflow.api.v1 import endpoints
+
+    release = threading.Event()
+
+    async def mock_process_graph_cached(*args, **kwargs):
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        return Result(result={"output": "done"}, session_id="session_id_mock")
+
+    monkeypatch.setattr(endpoints, "process_graph_cached", mock_process_graph_cached)
+    headers = {"x-api-key": created_api_key.api_key}
+
+    response = client.post(f"api/v1/process/{flow.id}", headers=headers, json={"inputs": {}, "sync": False})
+    assert response.status_code == 200, response.json()
+    assert response.json()["status"] == "PENDING"
+    assert response.json()["result"] is None
+    task_href = response.json()["task"]["href"]
+
+    assert client.get(task_href).json()["status"] in ("PENDING", "STARTED")
+    release.set()
+    task_status_json = poll_task_status(client, headers, task_href, sleep_time=0.05)
+    assert task_status_json == {"status": "SUCCESS", "result": {"output": "done"}}
+
+
+def test_process_async_cancel_task(client, flow, monkeypatch, created_api_key):
+    from langflow.api.v1 import endpoints
+
+    async def mock_process_graph_cached(*args, **kwargs):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(endpoints, "process_graph_cached", mock_process_graph_cached)
+    headers = {"x-api-key": created_api_key.api_key}
+
+    response = client.post(f"api/v1/process/{flow.id}", headers=headers, json={"inputs": {}, "sync": False})
+    task_href = response.json()["task"]["href"]
+
+    # Only the owner of the task can cancel it
+    assert client.delete(task_href).status_code == 403
+    other_headers = {"x-api-key": create_user_api_key("otheruser", "other_key")}
+    assert client.delete(task_href, headers=other_headers).status_code == 404
+    assert client.get(task_href).json()["status"] != "REVOKED"
+
+    response = client.delete(task_href, headers=headers)
+    assert response.status_code == 200, response.json()
+    assert client.get(task_href).json()["status"] == "REVOKED"
+    assert client.delete(task_href, headers=headers).status_code == 409
+    assert client.delete(f"api/v1/task/{uuid.uuid4().hex}", headers=headers).status_code == 404
+
+
+def test_process_async_full_queue(client, flow, monkeypatch, created_api_key):
+    from langflow.services.deps import get_task_service
+    from langflow.services.task.backends.base import TaskQueueFullError
+
+    async def mock_launch_task(*args, **kwargs):
+        raise TaskQueueFullError("Task queue is full")
+
+    monkeypatch.setattr(get_task_service(), "launch_task", mock_launch_task)
+    headers = {"x-api-key": created_api_key.api_key}
+
+    response = client.post(f"api/v1/process/{flow.id}", headers=headers, json={"inputs": {}, "sync": False})
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Task queue is full"}
+
+
 def test_process_flow_fails_autologin_off(client, flow, monkeypatch):
     # Mock de process_graph_cached
     from langflow.api.v1 import endpoints
-    from langflow.services.database.models.api_key import crud
 
     settings_service = get_settings_service()
     settings_service.auth_settings.AUTO_LOGIN = False
@@ -260,11 +418,7 @@ def test_process_flow_fails_autologin_off(client, flow, monkeypatch):
     async def mock_process_graph_cached(*args, **kwargs):
         return Result(result={}, session_id="session_id_mock")
 
-    async def mock_update_total_uses(*args, **kwargs):
-        return created_api_key
-
     monkeypatch.setattr(endpoints, "process_graph_cached", mock_process_graph_cached)
-    monkeypatch.setattr(crud, "update_total_uses", mock_update_total_uses)
 
     headers = {"x-api-key": "api_key"}
 
@@ -410,6 +564,42 @@ def test_various_prompts(client, prompt, expected_input_variables):
     assert response.json()["input_variables"] == expected_input_variables
 
 
+def test_validate_prompts(client):
+    prompts = [
+        {**PROMPT_REQUEST, "template": VALID_PROMPT},
+        {**PROMPT_REQUEST, "template": "{my var} and {1st}"},
+        {**PROMPT_REQUEST, "template": INVALID_PROMPT, "frontend_node": None},
+    ]
+    response = client.post("api/v1/validate/prompts", json={"prompts": prompts})
+    assert response.status_code == 200
+    valid, invalid, without_variables = response.json()["results"]
+    assert valid["input_variables"] == ["product"]
+    assert valid["error"] is None
+    assert "product" in valid["frontend_node"]["template"]
+    # An invalid prompt doesn't fail the others
+    assert invalid["input_variables"] == []
+    assert "my var" in invalid["error"]
+    assert without_variables["input_variables"] == []
+    assert without_variables["frontend_node"] is None
+
+
+def test_check_input_variables():
+    from langflow.api.v1.base import check_input_variables, validate_prompt
+
+    assert check_input_variables(["a", "b_c"]) == ["a", "b_c"]
+    with pytest.raises(ValueError) as exc_info:
+        check_input_variables(["my var", "a.b!c"])
+    message = str(exc_info.value)
+    assert "'my var' -> 'myvar'" in message and "'a.b!c' -> 'abc'" in message
+
+    # Both the outcome and the error are cached
+    assert validate_prompt("{x} {y}") == ["x", "y"]
+    assert validate_prompt("{x} {y}") == ["x", "y"]
+    for _ in range(2):
+        with pytest.raises(ValueError, match="my var"):
+            validate_prompt("{my var}")
+
+
 def test_basic_chat_in_process(client, added_flow, created_api_key):
     # Run the /api/v1/process/{flow_id} endpoint
     headers = {"x-api-key": created_api_key.api_key}
@@ -561,7 +751,7 @@ def test_async_task_processing_vector_store(client, added_vector_store, created_
     )
     assert response.status_code == 200, response.json()
     assert "result" in response.json()
-    assert "FAILURE" not in response.json()["result"]
+    assert response.json()["status"] != "FAILURE"
 
     # Extract the task ID from the response
     task = response.json().get("task")
@@ -11,7 +11,7 @@ from langchain.chains.base import Chain
 from langchain.llms.fake import FakeListLLM
 
 from langflow.graph import Graph
-from langflow.graph.edge.base import Edge
+from langflow.graph.edge.base import Edge, SourceHandle, TargetHandle, handles_are_compatible, match_types
 from langflow.graph.graph.utils import (
     find_last_node,
     process_flow,
@@ -24,6 +24,7 @@ from langflow.graph.graph.utils import (
 from langflow.graph.utils import UnbuiltObject
 from langflow.graph.vertex.base import Vertex
 from langflow.graph.vertex.types import FileToolVertex, LLMVertex, ToolkitVertex
+from langflow.interface.listing import lazy_load_dict
 from langflow.processing.process import get_result_and_thought
 from langflow.utils.payload import get_root_vertex
 
@@ -217,6 +218,23 @@ def test_build_nodes(basic_graph):
         assert isinstance(node, Vertex)
 
 
+def test_vertex_base_type_index():
+    """Test that vertices get their base type from the type index, which can be refreshed"""
+    node = {"id": "LLMChain-1", "data": {"type": "LLMChain", "node": {"base_classes": ["Chain"], "template": {}}}}
+    try:
+        lazy_load_dict.refresh({"chains": {"LLMChain": {}}, "tools": {"LLMChain": {}}})
+        assert lazy_load_dict.get_base_type("LLMChain") == "chains"
+        assert lazy_load_dict.get_base_type("Unknown") is None
+        # The entries added by _build_dict are kept
+        assert lazy_load_dict.get_base_type("Custom Tool") == "Custom"
+        assert Vertex(node, graph=None).base_type == "chains"
+
+        lazy_load_dict.refresh({"tools": {"LLMChain": {}}})
+        assert Vertex(node, graph=None).base_type == "tools"
+    finally:
+        lazy_load_dict.refresh()
+
+
 def test_build_edges(basic_graph):
     """Test building edges"""
     assert len(basic_graph.edges) == len(basic_graph._edges)
@@ -261,6 +279,25 @@ def test_matched_type(basic_graph):
     assert all(edge.matched_type in edge.source_types for edge in basic_graph.edges)
 
 
+def test_edge_type_compatibility():
+    assert handles_are_compatible(("BaseLLM", "BaseLanguageModel"), "BaseLanguageModel", None)
+    assert not handles_are_compatible(("BaseLLM",), "BaseLanguageModel", None)
+    assert handles_are_compatible(("Document",), "str", ("Document", "Record"))
+    # The source types only need to be part of a required type to be valid
+    assert match_types(("Chain",), ("LLMChain", "Chain")) == (True, "Chain")
+    assert match_types(("Chain",), ("LLMChain",)) == (True, None)
+    assert match_types(("Tool",), ("BaseLLM",)) == (False, None)
+
+
+def test_edge_handles():
+    source_handle = SourceHandle.from_dict({"baseClasses": ["LLMChain", "Chain"], "dataType": "LLMChain", "id": "a"})
+    assert source_handle.baseClasses == ("LLMChain", "Chain")
+    target_handle = TargetHandle.from_dict({"fieldName": "chain", "id": "b", "type": "Chain"})
+    assert target_handle.inputTypes is None
+    with pytest.raises(ValueError):
+        TargetHandle.from_dict({"fieldName": "chain", "id": "b"})
+
+
 def test_build_params(basic_graph):
     """Test building params"""
 
@@ -297,6 +334,25 @@ async def assert_agent_was_built(graph):
     assert isinstance(result, Chain)
 
 
+@pytest.mark.asyncio
+async def test_built_vertices_have_no_dict(basic_graph):
+    await basic_graph.build()
+    for vertex in basic_graph.vertices:
+        assert vertex._built
+        assert not hasattr(vertex, "__dict__"), type(vertex).__name__
+        assert not hasattr(pickle.loads(pickle.dumps(vertex)), "__dict__"), type(vertex).__name__
+
+
+def test_vertex_classes_have_no_dict():
+    # A subclass without __slots__ would give its vertices a __dict__ again
+    classes = [Vertex]
+    for cls in classes:
+        classes.extend(cls.__subclasses__())
+    assert len(classes) > 1
+    for cls in classes:
+        assert cls.__dictoffset__ == 0, cls.__name__
+
+
 @pytest.mark.asyncio
 async def test_llm_node_build(basic_graph):
     llm_node = get_node_by_type(basic_graph, LLMVertex)
@@ -356,7 +412,7 @@ async def test_get_result_and_thought(basic_graph):
     # now build again and check if FakeListLLM was used
 
     # Get the result and thought
-    result = get_result_and_thought(langchain_object, message)
+    result = await get_result_and_thought(langchain_object, message)
     assert isinstance(result, dict)
 
 
@@ -461,6 +517,17 @@ def test_process_flow_vector_store_grouped(vector_store_grouped_json_flow):
             ), f"Edge {idx}, key {key} expected to contain {value} but got {edges[idx][key]}"
 
 
+def test_process_flow_does_not_modify_the_flow(vector_store_grouped_json_flow):
+    grouped_chat_data = json.loads(vector_store_grouped_json_flow).get("data")
+    original = copy.deepcopy(grouped_chat_data)
+
+    processed_flow = process_flow(grouped_chat_data)
+    assert len(processed_flow["nodes"]) == 7
+    assert grouped_chat_data == original
+    # Processing the same flow again gives the same result
+    assert process_flow(grouped_chat_data) == processed_flow
+
+
 def test_update_template(sample_template, sample_nodes):
     # Making a deep copy to keep original sample_nodes unchanged
     nodes_copy = copy.deepcopy(sample_nodes)
@@ -0,0 +1,88 @@
+import sqlite3
+
+from langchain_core.outputs import Generation
+
+from langflow.services.llm_cache.base import InstrumentedLLMCache, LRUInMemoryCache, model_from_llm_string
+from langflow.services.llm_cache.factory import create_llm_cache, create_sqlite_cache
+from langflow.services.llm_cache.service import LLMCacheService
+from langflow.services.metrics.service import MetricsService
+from langflow.services.settings.base import Settings
+
+OPENAI_LLM_STRING = "{'model_name': 'gpt-3.5-turbo', 'temperature': 0.7, '_type': 'openai'}---[('stop', None)]"
+
+
+def generations(text):
+    return [Generation(text=text)]
+
+
+def test_model_from_llm_string():
+    assert model_from_llm_string(OPENAI_LLM_STRING) == "gpt-3.5-turbo"
+    assert model_from_llm_string('{"model": "llama2", "_type": "ollama-llm"}') == "llama2"
+    assert model_from_llm_string("{'_type': 'fake-list'}") == "fake-list"
+    assert model_from_llm_string("") == "unknown"
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUInMemoryCache(max_size=2)
+    cache.update("a", "llm", generations("1"))
+    cache.update("b", "llm", generations("2"))
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.lookup("a", "llm") == generations("1")
+    cache.update("c", "llm", generations("3"))
+
+    assert len(cache) == 2
+    assert cache.lookup("b", "llm") is None
+    assert cache.lookup("a", "llm") == generations("1")
+    assert cache.lookup("c", "llm") == generations("3")
+
+
+def test_sqlite_cache_survives_restarts(tmp_path):
+    database_path = str(tmp_path / "llm_cache.db")
+    create_sqlite_cache(database_path).update("prompt", OPENAI_LLM_STRING, generations("answer"))
+
+    # A new cache on the same file, as after a restart or in another worker
+    assert create_sqlite_cache(database_path).lookup("prompt", OPENAI_LLM_STRING) == generations("answer")
+    with sqlite3.connect(database_path) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_create_llm_cache_from_settings(tmp_path):
+    assert create_llm_cache(Settings()) is None
+    assert create_llm_cache(Settings(LLM_CACHE_TYPE="none")) is None
+
+    cache = create_llm_cache(Settings(LLM_CACHE_TYPE="memory", LLM_CACHE_MAX_SIZE=5))
+    assert isinstance(cache, LRUInMemoryCache) and cache.max_size == 5
+
+    # The legacy LANGCHAIN_CACHE setting still selects a cache
+    assert isinstance(create_llm_cache(Settings(LANGCHAIN_CACHE="InMemoryCache")), LRUInMemoryCache)
+
+    create_llm_cache(Settings(LLM_CACHE_TYPE="sqlite", CONFIG_DIR=str(tmp_path)))
+    assert (tmp_path / "llm_cache.db").exists()
+
+
+def test_lookups_are_recorded_per_model():
+    metrics_service = MetricsService()
+    cache = InstrumentedLLMCache(LRUInMemoryCache(), metrics_service)
+    cache.lookup("prompt", OPENAI_LLM_STRING)
+    cache.update("prompt", OPENAI_LLM_STRING, generations("answer"))
+    cache.lookup("prompt", OPENAI_LLM_STRING)
+    cache.lookup("prompt", "{'_type': 'fake-list'}")
+
+    rendered = metrics_service.render()
+    assert 'langflow_llm_cache_lookups_total{model="gpt-3.5-turbo",result="hit"} 1' in rendered
+    assert 'langflow_llm_cache_lookups_total{model="gpt-3.5-turbo",result="miss"} 1' in rendered
+    assert 'langflow_llm_cache_lookups_total{model="fake-list",result="miss"} 1' in rendered
+
+
+def test_service_installs_the_langchain_cache():
+    from langchain.globals import get_llm_cache, set_llm_cache
+
+    previous = get_llm_cache()
+    service = LLMCacheService(LRUInMemoryCache())
+    try:
+        service.install()
+        assert get_llm_cache() is service.cache
+        service.teardown()
+        assert get_llm_cache() is None
+    finally:
+        set_llm_cache(previous)
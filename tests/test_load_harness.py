@@ -0,0 +1,68 @@
+import argparse
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.load.fake_llm import create_app
+from tests.load.harness import assign_users, parse_mix, percentile
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 99) == 3.0
+
+
+def test_parse_mix():
+    assert parse_mix("process=3,chat=1") == {"process": 3.0, "chat": 1.0}
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_mix("unknown=1")
+
+
+def test_assign_users():
+    assignment = assign_users(8, {"process": 3.0, "chat": 1.0})
+    assert len(assignment) == 8
+    assert assignment.count("process") == 6
+    assert assignment.count("chat") == 2
+    # Every workload gets at least one user
+    assert set(assign_users(2, {"process": 100.0, "chat": 1.0})) == {"process", "chat"}
+
+
+def test_fake_llm_chat_completion():
+    client = TestClient(create_app(latency=0, token_delay=0, tokens=3))
+    messages = [{"role": "user", "content": "Hi"}]
+    response = client.post("/v1/chat/completions", json={"model": "fake", "messages": messages})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["choices"][0]["message"]["content"] == "The quick brown "
+    assert body["usage"]["completion_tokens"] == 3
+
+
+def test_fake_llm_streams_tokens():
+    client = TestClient(create_app(latency=0, token_delay=0, tokens=3))
+    response = client.post("/v1/completions", json={"model": "fake", "prompt": "Hi", "stream": True})
+    events = [line[len("data: ") :] for line in response.text.splitlines() if line.startswith("data: ")]
+    # One event per token, the finish reason and the end of the stream
+    assert len(events) == 5
+    assert events[-1] == "[DONE]"
+
+
+def test_fake_redis_round_trip():
+    redis = pytest.importorskip("redis")
+    from tests.load.fake_redis import FakeRedisServer
+
+    with FakeRedisServer(("127.0.0.1", 0)) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            client = redis.Redis(host="127.0.0.1", port=server.server_address[1])
+            client.set("key", "value")
+            assert client.get("key") == b"value"
+            assert client.rpush("queue", "a", "b") == 2
+            assert client.blpop(["queue"], timeout=1) == (b"queue", b"a")
+            client.close()
+        finally:
+            server.shutdown()
@@ -0,0 +1,141 @@
+import pytest
+from langchain.llms.fake import FakeListLLM
+
+from langflow.graph.vertex.types import LLMVertex
+from langflow.services.auth.utils import get_password_hash
+from langflow.services.database.models.user.model import User
+from langflow.services.database.utils import session_getter
+from langflow.services.deps import get_db_service, get_metrics_service, get_session_service, get_settings_service
+from langflow.services.metrics.service import MetricsService
+
+
+@pytest.fixture
+def superuser_headers(client):
+    with session_getter(get_db_service()) as session:
+        user = User(
+            username="metricsadmin",
+            password=get_password_hash("testpassword"),
+            is_active=True,
+            is_superuser=True,
+        )
+        session.add(user)
+        session.commit()
+    response = client.post("/api/v1/login", data={"username": "metricsadmin", "password": "testpassword"})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_render_prometheus_format():
+    metrics_service = MetricsService()
+    counter = metrics_service.counter("test_requests_total", "Number of requests.", ["path"])
+    counter.inc(path="/a")
+    counter.inc(2, path='/b"')
+    histogram = metrics_service.histogram("test_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    histogram.observe(0.5)
+
+    rendered = metrics_service.render()
+
+    assert "# TYPE test_requests_total counter" in rendered
+    assert 'test_requests_total{path="/a"} 1.0' in rendered
+    assert 'test_requests_total{path="/b\\""} 2.0' in rendered
+    assert "# TYPE test_latency_seconds histogram" in rendered
+    assert 'test_latency_seconds_bucket{le="0.1"} 0.0' in rendered
+    assert 'test_latency_seconds_bucket{le="1.0"} 1.0' in rendered
+    assert 'test_latency_seconds_bucket{le="+Inf"} 1.0' in rendered
+    assert "test_latency_seconds_sum 0.5" in rendered
+    assert "test_latency_seconds_count 1.0" in rendered
+
+    with pytest.raises(ValueError):
+        counter.inc(other="label")
+    with pytest.raises(ValueError):
+        metrics_service.gauge("test_requests_total", "Already a counter.")
+
+
+@pytest.mark.asyncio
+async def test_vertex_build_records_metrics(basic_graph):
+    metrics_service = get_metrics_service()
+    llm_node = next(vertex for vertex in basic_graph.vertices if isinstance(vertex, LLMVertex))
+    llm_node._built_object = FakeListLLM(responses=["Hello"])
+    llm_node._built = True
+    root_vertex_types = {vertex.vertex_type for vertex in basic_graph.vertices if vertex is not llm_node}
+    counts_before = {
+        vertex_type: metrics_service.vertex_build_seconds.get_count(vertex_type=vertex_type)
+        for vertex_type in root_vertex_types
+    }
+    hits_before = metrics_service.vertex_cache_hits.get(vertex_type=llm_node.vertex_type)
+
+    await basic_graph.build()
+
+    build_metrics = basic_graph.get_build_metrics()
+    built_vertices = [vertex for vertex in basic_graph.vertices if vertex is not llm_node]
+    assert {vertex.id for vertex in built_vertices} <= set(build_metrics)
+    for vertex in built_vertices:
+        metrics = build_metrics[vertex.id]
+        assert metrics["wall_time"] >= metrics["dependencies_time"] >= 0
+        assert metrics["wall_time"] >= metrics["instantiate_time"] >= 0
+        assert metrics_service.vertex_build_seconds.get_count(vertex_type=vertex.vertex_type) > counts_before[
+            vertex.vertex_type
+        ]
+    # Dependents reading the LLM during the build are not cache hits
+    assert metrics_service.vertex_cache_hits.get(vertex_type=llm_node.vertex_type) == hits_before
+
+
+@pytest.mark.asyncio
+async def test_reused_session_records_cache_hits(basic_graph):
+    metrics_service = get_metrics_service()
+    session_service = get_session_service()
+    vertex = basic_graph.vertices[0]
+    vertex._built_object = object()
+    vertex._built = True
+    hits_before = metrics_service.vertex_cache_hits.get(vertex_type=vertex.vertex_type)
+    session_service.update_session("reused_session", (basic_graph, {}))
+
+    for _ in range(2):
+        graph, _ = await session_service.load_session("reused_session")
+
+    assert graph is basic_graph
+    assert vertex.build_metrics["cache_hits"] == 2
+    assert metrics_service.vertex_cache_hits.get(vertex_type=vertex.vertex_type) == hits_before + 2
+
+
+def test_metrics_endpoint(client, superuser_headers):
+    response = client.get("api/v1/metrics")
+    assert response.status_code == 403
+
+    response = client.get("api/v1/metrics", headers=superuser_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE langflow_vertex_build_seconds histogram" in response.text
+
+
+def test_profile_request(client, monkeypatch, superuser_headers):
+    monkeypatch.setattr(get_settings_service().settings, "PROFILING_ENABLED", True)
+
+    response = client.get("/health", headers={"X-Langflow-Profile": "cprofile"})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Langflow-Profile-Id"]
+
+    response = client.get("api/v1/monitor/profiles", headers=superuser_headers)
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == profile_id
+    assert response.json()[0]["path"] == "/health"
+
+    response = client.get(f"api/v1/monitor/profiles/{profile_id}", headers=superuser_headers)
+    assert response.status_code == 200
+    assert "function calls" in response.text
+
+    response = client.get("/health", headers={"X-Langflow-Profile": "unknown"})
+    assert response.status_code == 400
+
+
+def test_profile_request_disabled(client):
+    response = client.get("/health", headers={"X-Langflow-Profile": "cprofile"})
+
+    assert response.status_code == 200
+    assert "X-Langflow-Profile-Id" not in response.headers
+
+
+def test_profiles_require_superuser(client, logged_in_headers):
+    response = client.get("api/v1/monitor/profiles", headers=logged_in_headers)
+
+    assert response.status_code == 400
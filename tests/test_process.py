@@ -1,5 +1,10 @@
+import copy
+
 import pytest
-from langflow.processing.process import process_tweaks
+from langchain.chains import LLMChain
+from langchain.prompts import PromptTemplate
+from langchain_community.llms.fake import FakeListLLM, FakeStreamingListLLM
+from langflow.processing.process import process_tweaks, stream_result
 from langflow.services.deps import get_session_service
 
 
@@ -237,3 +242,65 @@ async def test_load_langchain_object_without_session_id(client, basic_graph_data
     graph2, artifacts2 = await session_service.load_session(session_id1, basic_graph_data)
 
     assert graph1 == graph2
+
+
+def test_sessions_share_flow_data(basic_graph_data):
+    session_service = get_session_service()
+    shared = session_service.get_shared_flow_data("shared-hash", basic_graph_data)
+    assert shared is basic_graph_data
+    # Another copy of the same flow gets the data of the first one
+    assert session_service.get_shared_flow_data("shared-hash", copy.deepcopy(basic_graph_data)) is basic_graph_data
+    assert session_service.get_shared_flow_data("other-hash", copy.deepcopy(basic_graph_data)) is not basic_graph_data
+
+
+@pytest.mark.asyncio
+async def test_stream_result_runnable():
+    runnable = PromptTemplate.from_template("{text}") | FakeStreamingListLLM(responses=["Hello"])
+    events = [event async for event in stream_result(runnable, {"text": "Hi"})]
+
+    assert events[:-1] == [("token", char) for char in "Hello"]
+    assert events[-1] == ("result", "Hello")
+
+
+@pytest.mark.asyncio
+async def test_stream_result_chain():
+    chain = LLMChain(llm=FakeListLLM(responses=["Hello"]), prompt=PromptTemplate.from_template("{text}"))
+    events = [event async for event in stream_result(chain, {"text": "Hi"})]
+
+    assert events[-1] == ("result", {"text": "Hello"})
+
+
+@pytest.mark.asyncio
+async def test_run_in_thread_pool_does_not_block_event_loop():
+    import asyncio
+    import threading
+    import time
+
+    from langflow.utils.concurrency import run_in_thread_pool
+
+    def blocking_call(value):
+        time.sleep(0.2)
+        return value, threading.current_thread().name
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_in_thread_pool(blocking_call, i) for i in range(4)))
+    elapsed = time.perf_counter() - start
+
+    assert [value for value, _ in results] == [0, 1, 2, 3]
+    assert all(name.startswith("langflow-process") for _, name in results)
+    # The calls ran concurrently instead of one after the other
+    assert elapsed < 0.6
+
+
+@pytest.mark.asyncio
+async def test_get_result_and_thought_uses_acall(monkeypatch):
+    from langflow.processing.process import get_result_and_thought
+
+    def sync_call(self, *args, **kwargs):
+        raise AssertionError("The sync __call__ should not be used")
+
+    monkeypatch.setattr(LLMChain, "__call__", sync_call)
+    chain = LLMChain(llm=FakeListLLM(responses=["Hello"]), prompt=PromptTemplate.from_template("{text}"))
+    result = await get_result_and_thought(chain, {"text": "Hi"})
+
+    assert result == {"text": "Hello"}
@@ -0,0 +1,165 @@
+import json
+
+import pytest
+
+from langflow.processing.process import Result
+from langflow.services.cache.service import InMemoryCache
+from langflow.services.database.models.flow import Flow
+from langflow.services.database.utils import session_getter
+from langflow.services.deps import get_db_service
+from langflow.services.result_cache.service import ResultCacheService, has_memory
+from langflow.services.session.utils import compute_dict_hash
+
+
+@pytest.fixture
+def graph_data(json_flow):
+    return json.loads(json_flow)["data"]
+
+
+@pytest.fixture
+def stateless_graph_data(graph_data):
+    memory_ids = {node["id"] for node in graph_data["nodes"] if "Memory" in node["data"]["type"]}
+    return {
+        **graph_data,
+        "nodes": [node for node in graph_data["nodes"] if node["id"] not in memory_ids],
+        "edges": [
+            edge
+            for edge in graph_data["edges"]
+            if edge["source"] not in memory_ids and edge["target"] not in memory_ids
+        ],
+    }
+
+
+@pytest.fixture
+def result_cache_service(monkeypatch):
+    from langflow.api.v1 import endpoints
+
+    service = ResultCacheService(cache=InMemoryCache(max_size=10), enabled=True)
+    monkeypatch.setattr(endpoints, "get_result_cache_service", lambda: service)
+    return service
+
+
+@pytest.fixture
+def process_calls(monkeypatch):
+    from langflow.api.v1 import endpoints
+
+    calls = []
+
+    async def mock_process_graph_cached(data_graph, inputs, clear_cache, session_id, data_hash=None):
+        calls.append(inputs)
+        return Result(result={"output": f"run {len(calls)}"}, session_id="session_id_mock")
+
+    monkeypatch.setattr(endpoints, "process_graph_cached", mock_process_graph_cached)
+    return calls
+
+
+@pytest.fixture
+def api_key_headers(client, logged_in_headers):
+    response = client.post("api/v1/api_key", json={"name": "result_cache"}, headers=logged_in_headers)
+    return {"x-api-key": response.json()["api_key"]}
+
+
+def add_flow(graph_data, user_id, **kwargs):
+    flow = Flow(name="stateless_flow", data=graph_data, user_id=user_id, **kwargs)
+    with session_getter(get_db_service()) as session:
+        session.add(flow)
+        session.commit()
+        session.refresh(flow)
+    return flow
+
+
+def test_key_ignores_key_order(graph_data):
+    service = ResultCacheService(cache=InMemoryCache(), enabled=True)
+
+    key = service.build_key(graph_data, {"a": 1, "b": 2}, {"node": {"x": 1}})
+    assert key == service.build_key(graph_data, {"b": 2, "a": 1}, {"node": {"x": 1}})
+    assert key != service.build_key(graph_data, {"a": 1, "b": 3}, {"node": {"x": 1}})
+    assert key != service.build_key(graph_data, {"a": 1, "b": 2}, {"node": {"x": 2}})
+
+
+def test_key_is_scoped_to_the_flow(graph_data):
+    service = ResultCacheService(cache=InMemoryCache(), enabled=True)
+
+    key = service.build_key(graph_data, {"a": 1}, flow_id="flow-1")
+    assert key == service.build_key(graph_data, {"a": 1}, flow_id="flow-1")
+    assert key != service.build_key(graph_data, {"a": 1}, flow_id="flow-2")
+
+
+def test_key_uses_the_stored_hash(graph_data):
+    service = ResultCacheService(cache=InMemoryCache(), enabled=True)
+
+    key = service.build_key(graph_data, {"a": 1})
+    assert key == service.build_key(graph_data, {"a": 1}, data_hash=compute_dict_hash(graph_data))
+    # Hashing the graph leaves its nodes untouched
+    assert all("position" in node for node in graph_data["nodes"])
+
+
+def test_flows_with_memory_are_not_cacheable(graph_data, stateless_graph_data):
+    service = ResultCacheService(cache=InMemoryCache(), enabled=True)
+
+    assert has_memory(graph_data)
+    assert not service.is_cacheable(graph_data)
+    assert service.is_cacheable(stateless_graph_data)
+    assert not service.is_cacheable(stateless_graph_data, session_id="session")
+    assert not ResultCacheService(enabled=False).is_cacheable(stateless_graph_data)
+
+
+def test_identical_process_calls_are_memoized(
+    client, stateless_graph_data, active_user, api_key_headers, result_cache_service, process_calls
+):
+    flow = add_flow(stateless_graph_data, active_user.id)
+    headers = api_key_headers
+
+    session_ids = []
+    for _ in range(2):
+        response = client.post(f"api/v1/process/{flow.id}", headers=headers, json={"inputs": {"question": "hi"}})
+        assert response.status_code == 200, response.json()
+        assert response.json()["result"] == {"output": "run 1"}
+        session_ids.append(response.json()["session_id"])
+    assert len(process_calls) == 1
+    # A hit builds no session and does not hand out the session of the run that filled the cache
+    assert session_ids == ["session_id_mock", None]
+
+    # The session id returned by a hit can be sent back
+    response = client.post(
+        f"api/v1/process/{flow.id}",
+        headers=headers,
+        json={"inputs": {"question": "hi"}, "session_id": session_ids[-1]},
+    )
+    assert response.status_code == 200, response.json()
+    assert response.json()["result"] == {"output": "run 1"}
+
+    response = client.post(f"api/v1/process/{flow.id}", headers=headers, json={"inputs": {"question": "bye"}})
+    assert response.json()["result"] == {"output": "run 2"}
+
+    # clear_cache runs the flow again and refreshes the entry
+    response = client.post(
+        f"api/v1/process/{flow.id}", headers=headers, json={"inputs": {"question": "hi"}, "clear_cache": True}
+    )
+    assert response.json()["result"] == {"output": "run 3"}
+    response = client.post(f"api/v1/process/{flow.id}", headers=headers, json={"inputs": {"question": "hi"}})
+    assert response.json()["result"] == {"output": "run 3"}
+
+
+def test_identical_flows_do_not_share_results(
+    client, stateless_graph_data, active_user, api_key_headers, result_cache_service, process_calls
+):
+    flows = [add_flow(stateless_graph_data, active_user.id) for _ in range(2)]
+
+    for flow in flows:
+        response = client.post(
+            f"api/v1/process/{flow.id}", headers=api_key_headers, json={"inputs": {"question": "hi"}}
+        )
+        assert response.status_code == 200, response.json()
+    assert len(process_calls) == 2
+
+
+def test_flows_can_opt_out(
+    client, stateless_graph_data, active_user, api_key_headers, result_cache_service, process_calls
+):
+    flow = add_flow(stateless_graph_data, active_user.id, cache_results=False)
+    headers = api_key_headers
+
+    for _ in range(2):
+        client.post(f"api/v1/process/{flow.id}", headers=headers, json={"inputs": {"question": "hi"}})
+    assert len(process_calls) == 2
@@ -0,0 +1,284 @@
+import asyncio
+import time
+
+import pytest
+
+from langflow.services.task.backends.anyio import AnyIOBackend
+from langflow.services.task.backends.base import TaskQueueFullError
+from langflow.services.task.scheduler import BATCH, INTERACTIVE, FairScheduler
+
+
+async def wait_until_ready(task, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not task.ready():
+        assert time.monotonic() < deadline, f"Task still {task.status}"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_launch_task_returns_before_the_task_finishes():
+    backend = AnyIOBackend(FairScheduler(capacity=2))
+    release = asyncio.Event()
+
+    async def task_func(value):
+        await release.wait()
+        return value * 2
+
+    task_id, task = await backend.launch_task(task_func, 21)
+    assert task.status == "PENDING"
+    assert not task.ready()
+    assert backend.get_task(task_id) is task
+
+    release.set()
+    await wait_until_ready(task)
+    assert task.status == "SUCCESS"
+    assert task.result == 42
+    backend.teardown()
+
+
+@pytest.mark.asyncio
+async def test_task_ids_are_unique():
+    backend = AnyIOBackend(FairScheduler(capacity=1))
+
+    async def task_func():
+        return None
+
+    task_ids = {(await backend.launch_task(task_func))[0] for _ in range(20)}
+    assert len(task_ids) == 20
+    backend.teardown()
+
+
+@pytest.mark.asyncio
+async def test_failed_task_keeps_the_exception():
+    backend = AnyIOBackend(FairScheduler(capacity=1))
+
+    async def task_func():
+        raise ValueError("boom")
+
+    _, task = await backend.launch_task(task_func)
+    await wait_until_ready(task)
+    assert task.status == "FAILURE"
+    assert isinstance(task.result, ValueError)
+    assert "task_func" in task.traceback
+    backend.teardown()
+
+
+@pytest.mark.asyncio
+async def test_sync_functions_run_in_the_thread_pool():
+    backend = AnyIOBackend(FairScheduler(capacity=1))
+
+    _, task = await backend.launch_task(sum, [1, 2, 3])
+    await wait_until_ready(task)
+    assert task.result == 6
+    backend.teardown()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_new_tasks():
+    backend = AnyIOBackend(FairScheduler(capacity=1, max_waiting=1))
+    release = asyncio.Event()
+
+    async def task_func():
+        await release.wait()
+
+    _, running = await backend.launch_task(task_func)
+    # Let the first task take the only slot
+    await asyncio.sleep(0.05)
+    assert running.status == "STARTED"
+    await backend.launch_task(task_func)
+
+    with pytest.raises(TaskQueueFullError):
+        await backend.launch_task(task_func)
+
+    release.set()
+    backend.teardown()
+
+
+@pytest.mark.asyncio
+async def test_cancel_running_and_pending_tasks():
+    backend = AnyIOBackend(FairScheduler(capacity=1))
+    release = asyncio.Event()
+
+    async def task_func():
+        await release.wait()
+        return "done"
+
+    running_id, running = await backend.launch_task(task_func)
+    await asyncio.sleep(0.05)
+    pending_id, pending = await backend.launch_task(task_func)
+
+    assert backend.cancel_task(pending_id)
+    assert pending.status == "REVOKED"
+    assert backend.cancel_task(running_id)
+    await wait_until_ready(running)
+    assert running.status == "REVOKED"
+
+    # The worker is still alive after the cancellation
+    release.set()
+    _, task = await backend.launch_task(task_func)
+    await wait_until_ready(task)
+    assert task.result == "done"
+    assert not backend.cancel_task(running_id)
+    backend.teardown()
+
+
+@pytest.mark.asyncio
+async def test_finished_results_expire():
+    backend = AnyIOBackend(FairScheduler(capacity=1), result_ttl=0.1)
+
+    async def task_func():
+        return "done"
+
+    task_id, task = await backend.launch_task(task_func)
+    await wait_until_ready(task)
+    assert backend.get_task(task_id) is task
+
+    await asyncio.sleep(0.15)
+    assert backend.get_task(task_id) is None
+    backend.teardown()
+
+
+def grant_order(scheduler, tickets):
+    """Release granted tickets one by one and return the order in which the waiting ones got a slot."""
+    order = []
+    pending = list(tickets)
+    while pending:
+        granted = [ticket for ticket in pending if ticket.granted]
+        assert granted, "No ticket was granted"
+        for ticket in granted:
+            order.append((ticket.owner, ticket.priority))
+            pending.remove(ticket)
+            scheduler.release(ticket)
+    return order
+
+
+def test_owners_share_slots_evenly():
+    scheduler = FairScheduler(capacity=1)
+    blocker = scheduler.submit("blocker")
+    # A user queues a batch of runs before another one shows up
+    tickets = [scheduler.submit("heavy") for _ in range(4)]
+    tickets += [scheduler.submit("light") for _ in range(2)]
+    scheduler.release(blocker)
+
+    owners = [owner for owner, _ in grant_order(scheduler, tickets)]
+    assert owners == ["heavy", "light", "heavy", "light", "heavy", "heavy"]
+
+
+def test_interactive_class_gets_more_slots():
+    scheduler = FairScheduler(capacity=1, weights={INTERACTIVE: 2, BATCH: 1})
+    blocker = scheduler.submit("blocker")
+    tickets = [scheduler.submit("user-1", BATCH) for _ in range(3)]
+    tickets += [scheduler.submit("user-2", INTERACTIVE) for _ in range(4)]
+    scheduler.release(blocker)
+
+    priorities = [priority for _, priority in grant_order(scheduler, tickets)]
+    assert priorities[:6] == [BATCH, INTERACTIVE, INTERACTIVE, BATCH, INTERACTIVE, INTERACTIVE]
+
+
+def test_owner_limit():
+    scheduler = FairScheduler(capacity=4, owner_limit=2)
+    tickets = [scheduler.submit("user-1") for _ in range(3)]
+    other = scheduler.submit("user-2")
+
+    assert [ticket.granted for ticket in tickets] == [True, True, False]
+    assert other.granted
+    assert scheduler.in_use == 3
+
+    scheduler.release(tickets[0])
+    assert tickets[2].granted
+
+
+@pytest.mark.parametrize("auto_login, owner_limit", [(True, 0), (False, 2)])
+def test_owner_limit_is_ignored_with_auto_login(monkeypatch, auto_login, owner_limit):
+    from langflow.services.deps import get_settings_service
+    from langflow.services.task.service import TaskService
+
+    settings_service = get_settings_service()
+    monkeypatch.setattr(settings_service.auth_settings, "AUTO_LOGIN", auto_login)
+    monkeypatch.setattr(settings_service.settings, "TASK_OWNER_CONCURRENCY", 2)
+
+    assert TaskService(settings_service).scheduler.owner_limit == owner_limit
+
+
+@pytest.mark.parametrize("task_concurrency, capacity", [(0, 64), (8, 8)])
+def test_scheduler_capacity_defaults_to_the_admission_limit(monkeypatch, task_concurrency, capacity):
+    from langflow.services.deps import get_settings_service
+    from langflow.services.task.service import TaskService
+
+    settings_service = get_settings_service()
+    monkeypatch.setattr(settings_service.settings, "TASK_CONCURRENCY", task_concurrency)
+    monkeypatch.setattr(settings_service.settings, "ADMISSION_MAX_IN_FLIGHT", 64)
+
+    assert TaskService(settings_service).scheduler.capacity == capacity
+
+
+@pytest.mark.asyncio
+async def test_cancelled_wait_withdraws_the_ticket():
+    scheduler = FairScheduler(capacity=1)
+    running = await scheduler.acquire("user-1")
+    waiter = asyncio.ensure_future(scheduler.acquire("user-2"))
+    await asyncio.sleep(0)
+    assert scheduler.waiting_count() == 1
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.waiting_count() == 0
+    scheduler.release(running)
+    assert scheduler.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_is_recorded_per_class():
+    from langflow.services.metrics.service import MetricsService
+
+    metrics_service = MetricsService()
+    scheduler = FairScheduler(capacity=1, metrics_service=metrics_service)
+    async with scheduler.slot("user-1", INTERACTIVE):
+        pass
+    async with scheduler.slot("user-1", BATCH):
+        pass
+
+    assert metrics_service.task_queue_wait_seconds.get_count(priority=INTERACTIVE) == 1
+    assert metrics_service.task_queue_wait_seconds.get_count(priority=BATCH) == 1
+    assert 'langflow_task_queue_depth{priority="batch"} 0' in metrics_service.render()
+
+
+@pytest.mark.asyncio
+async def test_celery_backend_sends_tasks_when_the_scheduler_allows():
+    pytest.importorskip("celery")
+    from langflow.services.task.backends.celery import CeleryBackend
+
+    class FakeTask:
+        def __init__(self):
+            self.sent = []
+            self.finished = set()
+
+        def apply_async(self, args, kwargs, task_id):
+            self.sent.append(task_id)
+            return FakeResult(self, task_id)
+
+    class FakeResult:
+        def __init__(self, task, task_id):
+            self.task = task
+            self.id = task_id
+
+        def ready(self):
+            return self.id in self.task.finished
+
+        def get(self, propagate=True):
+            return None
+
+    task_func = FakeTask()
+    backend = CeleryBackend(FairScheduler(capacity=1))
+    first_id, first = await backend.launch_task(task_func, "input", owner="user-1")
+    second_id, _ = await backend.launch_task(task_func, "input", owner="user-1")
+    assert first.id == first_id
+
+    await asyncio.sleep(0.05)
+    assert task_func.sent == [first_id]
+
+    task_func.finished.add(first_id)
+    await asyncio.sleep(0.3)
+    assert task_func.sent == [first_id, second_id]
+    backend.teardown()
@@ -8,6 +8,7 @@ from langflow.utils.constants import CHAT_OPENAI_MODELS, OPENAI_MODELS
 from langflow.utils.util import (
     build_template_from_class,
     build_template_from_function,
+    clear_template_cache,
     format_dict,
     get_base_classes,
     get_default_factory,
@@ -94,6 +95,29 @@ def test_build_template_from_class():
         build_template_from_class("InvalidClass", type_to_cls_dict)
 
 
+def test_build_template_from_class_is_cached(monkeypatch):
+    from langflow.utils import util
+
+    clear_template_cache()
+    calls = []
+    parse = util.parse
+    monkeypatch.setattr(util, "parse", lambda docstring: calls.append(docstring) or parse(docstring))
+    type_to_cls_dict: Dict[str, type] = {"parent": Parent, "child": Child}
+
+    result = build_template_from_class("Child", type_to_cls_dict)
+    # The creators change the templates they get, which must not change the cached one
+    result["template"].pop("_type")
+    result["base_classes"].append("Tool")
+
+    cached = build_template_from_class("Child", type_to_cls_dict)
+    assert len(calls) == 1
+    assert cached["template"]["_type"] == "child"
+    assert "Tool" not in cached["base_classes"]
+    # Another way of building the template of the same class is not cached with it
+    assert "Callable" in build_template_from_class("Child", type_to_cls_dict, add_function=True)["base_classes"]
+    assert len(calls) == 2
+
+
 # Test format_dict
 def test_format_dict():
     # Test 1: Optional type removal
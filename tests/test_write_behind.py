@@ -0,0 +1,165 @@
+import threading
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
+from sqlmodel import create_engine
+
+from langflow.services.deps import get_write_behind_service
+from langflow.services.write_behind.service import WriteBehindService, merge_counters
+
+
+@pytest.fixture
+def write_behind_service():
+    service = WriteBehindService(create_engine("sqlite://"), workers=2, flush_interval=60)
+    yield service
+    service.teardown()
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.batches = []
+        self.threads = set()
+
+    def __call__(self, session, rows):
+        self.batches.append(dict(rows))
+        self.threads.add(threading.current_thread().name)
+
+
+def test_writes_to_the_same_row_are_coalesced(write_behind_service):
+    handler = RecordingHandler()
+    now = datetime.now(timezone.utc)
+    for _ in range(5):
+        write_behind_service.submit(handler, "row-1", (1, now), merge=merge_counters)
+    write_behind_service.submit(handler, "row-2", (1, now), merge=merge_counters)
+
+    assert write_behind_service.flush(timeout=5)
+
+    rows = {key: value for batch in handler.batches for key, value in batch.items()}
+    assert rows == {"row-1": (5, now), "row-2": (1, now)}
+    assert all(name.startswith("langflow-write-behind") for name in handler.threads)
+
+
+def test_last_value_wins_without_merge(write_behind_service):
+    handler = RecordingHandler()
+    for value in range(3):
+        write_behind_service.submit(handler, "row", value)
+
+    assert write_behind_service.flush(timeout=5)
+    assert handler.batches == [{"row": 2}]
+
+
+def test_teardown_drains_pending_writes():
+    service = WriteBehindService(create_engine("sqlite://"), workers=1, flush_interval=60)
+    handler = RecordingHandler()
+    service.submit(handler, "row", 1)
+
+    service.teardown()
+
+    assert handler.batches == [{"row": 1}]
+    # Writes submitted after the teardown are dropped
+    assert service.submit(handler, "row", 2) is False
+
+
+def test_full_queue_drops_writes():
+    service = WriteBehindService(create_engine("sqlite://"), workers=1, max_queue_size=1)
+    blocker = threading.Event()
+
+    def blocking_handler(session, rows):
+        blocker.wait(5)
+
+    try:
+        # The worker blocks writing the first batch, so the queue fills up
+        service.submit(blocking_handler, "row-1", 1)
+        service.flush(timeout=0.1)
+        assert service.submit(blocking_handler, "row-2", 1) is True
+        assert service.submit(blocking_handler, "row-3", 1) is False
+    finally:
+        blocker.set()
+        service.teardown()
+
+
+def test_failed_batch_does_not_stop_the_worker(write_behind_service):
+    def failing_handler(session, rows):
+        raise RuntimeError("database is locked")
+
+    handler = RecordingHandler()
+    write_behind_service.submit(failing_handler, "row", 1)
+    assert write_behind_service.flush(timeout=5)
+
+    write_behind_service.submit(handler, "row", 1)
+    assert write_behind_service.flush(timeout=5)
+    assert handler.batches == [{"row": 1}]
+
+
+def test_failing_handler_does_not_drop_the_rows_of_other_handlers():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE counters (key TEXT PRIMARY KEY, value INTEGER)"))
+
+    def write_counters(session, rows):
+        for key, value in rows.items():
+            session.execute(text("INSERT INTO counters VALUES (:key, :value)"), {"key": key, "value": value})
+
+    def failing_handler(session, rows):
+        write_counters(session, rows)
+        raise RuntimeError("user was deleted")
+
+    service = WriteBehindService(engine, workers=1, flush_interval=60, max_retries=0)
+    try:
+        service.submit(write_counters, "api-key-1", 1)
+        service.submit(write_counters, "api-key-2", 2)
+        service.submit(failing_handler, "user-1", 3)
+        assert service.flush(timeout=5)
+    finally:
+        service.teardown()
+
+    with engine.connect() as connection:
+        rows = dict(connection.execute(text("SELECT key, value FROM counters")).fetchall())
+    # The failing handler's transaction was rolled back on its own
+    assert rows == {"api-key-1": 1, "api-key-2": 2}
+
+
+def test_failed_rows_are_retried_with_the_next_batch():
+    written = {}
+    attempts = {"flaky": 0, "bad": 0}
+
+    def handler(session, rows):
+        for key in attempts:
+            if key in rows:
+                attempts[key] += 1
+        # flaky fails with the first batch, both in it and alone, bad always fails
+        if "bad" in rows or ("flaky" in rows and attempts["flaky"] <= 2):
+            raise RuntimeError("database is locked")
+        written.update(rows)
+
+    service = WriteBehindService(create_engine("sqlite://"), workers=1, flush_interval=60, max_retries=2)
+    try:
+        for key in ("good", "flaky", "bad"):
+            service.submit(handler, key, 1)
+        assert service.flush(timeout=5)
+        # One bad row does not drop the rest of the batch
+        assert written == {"good": 1}
+
+        for _ in range(3):
+            assert service.flush(timeout=5)
+    finally:
+        service.teardown()
+
+    assert written == {"good": 1, "flaky": 1}
+    # Tried with the first batch and alone, then with the retried rows and alone, then alone before it was dropped
+    assert attempts["bad"] == 5
+
+
+def test_login_updates_last_login_at(client, active_user):
+    from langflow.services.database.models.user import User
+    from langflow.services.database.utils import session_getter
+    from langflow.services.deps import get_db_service
+
+    response = client.post("/api/v1/login", data={"username": active_user.username, "password": "testpassword"})
+    assert response.status_code == 200
+    assert get_write_behind_service().flush(timeout=5)
+
+    with session_getter(get_db_service()) as session:
+        assert session.get(User, active_user.id).last_login_at is not None